@@ -1 +1,8 @@
-from .beam import Beam, DistributedLoadH, DistributedLoadV, PointLoadH, PointLoadV, PointTorque, x
+from .beam import (Beam, BeamSolution, DistributedLoadH, DistributedLoadV, FixedSupport, PinnedSupport, PointLoadH,
+                   PointLoadV, PointTorque, RollingSupport, x)
+from .evaluator import PiecewisePolynomial
+from .sections import SectionCatalog
+from .cache import SolutionCache
+from .store import ResultStore
+from .svg import beam_to_svg
+from .uncertainty import StreamingStatistics
@@ -13,16 +13,25 @@ Example
 """
 
 from collections import namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
 from contextlib import contextmanager
-import matplotlib.pyplot as plt
-from matplotlib.patches import Arc, Polygon, Rectangle, RegularPolygon, Wedge
-from matplotlib.collections import PatchCollection
+import multiprocessing
+import multiprocessing.connection
 import numpy as np
 import os
-from sympy import integrate, lambdify, Piecewise, sympify
+import time
+from sympy import Add, Float, integrate, lambdify, Max, Min, Piecewise, Poly, Rational, sympify
 from sympy.abc import x
 
-# plt.rc('text', usetex=True)  # This makes the plot text prettier... but SLOWER
+from .continuous import solver_for_layout
+from .evaluator import PiecewisePolynomial
+
+# Matplotlib is imported inside the plotting methods, so that the numerical
+# features (and the SVG renderer) can be used without importing it at all.
+# Figures are created without pyplot (i.e. without any global state) by default,
+# so that beams can be plotted concurrently from several threads. With
+# pyplot=True they are managed by pyplot instead, e.g. to be shown by
+# plt.show() or displayed in notebooks.
 
 
 class PointLoadV(namedtuple("PointLoadV", "force, coord")):
@@ -35,6 +44,8 @@ class PointLoadV(namedtuple("PointLoadV", "force, coord")):
     PointLoadV(force=-30, coord=3)
     """
 
+    __slots__ = ()
+
 
 class PointLoadH(namedtuple("PointLoadH", "force, coord")):
     """Horizontal point load described by a tuple of floats: (force, coord).
@@ -46,6 +57,8 @@ class PointLoadH(namedtuple("PointLoadH", "force, coord")):
     PointLoadH(force=10, coord=9)
     """
 
+    __slots__ = ()
+
 
 class DistributedLoadV(namedtuple("DistributedLoadV", "expr, span")):
     """Distributed vertical load, described by its functional form and application interval.
@@ -56,6 +69,8 @@ class DistributedLoadV(namedtuple("DistributedLoadV", "expr, span")):
     
     """
 
+    __slots__ = ()
+
 
 class DistributedLoadH(namedtuple("DistributedLoadH", "expr, span")):
     """Distributed horizontal load, described by its functional form and application interval.
@@ -66,6 +81,8 @@ class DistributedLoadH(namedtuple("DistributedLoadH", "expr, span")):
     
     """
 
+    __slots__ = ()
+
 
 class PointTorque(namedtuple("PointTorque", "torque, coord")):
     """Point clockwise torque, described by a tuple of floats: (torque, coord).
@@ -76,6 +93,250 @@ class PointTorque(namedtuple("PointTorque", "torque, coord")):
     
     """
 
+    __slots__ = ()
+
+
+class PinnedSupport(namedtuple("PinnedSupport", "coord")):
+    """Pinned support (prevents horizontal and vertical displacement) at a given x-coordinate.
+
+    Examples
+    --------
+    >>> support = PinnedSupport(2)  # pinned support at x=2 m
+    >>> support
+    PinnedSupport(coord=2)
+    """
+
+    __slots__ = ()
+
+
+class RollingSupport(namedtuple("RollingSupport", "coord")):
+    """Rolling support (prevents vertical displacement) at a given x-coordinate.
+
+    Examples
+    --------
+    >>> support = RollingSupport(7)  # rolling support at x=7 m
+    
+    """
+
+    __slots__ = ()
+
+
+class FixedSupport(namedtuple("FixedSupport", "coord")):
+    """Fixed support (prevents displacement and rotation) at a given x-coordinate.
+
+    Examples
+    --------
+    >>> wall = FixedSupport(0)  # clamped left end
+    
+    """
+
+    __slots__ = ()
+
+
+# Symbolic contribution of a single load to the beam diagrams (None when not
+# applicable), plus its force and moment (about x=0) resultants.
+_LoadTerms = namedtuple("_LoadTerms", "distributed, normal, shear, moment, force_x, force_y, moment_z")
+_QUANTITIES = ("load", "normal", "shear", "moment")
+_TERM_FIELDS = {"load": "distributed", "normal": "normal", "shear": "shear", "moment": "moment"}
+_NUMERIC_FIT_DEGREE = 12
+_NUMERIC_TOLERANCE = 1e-10
+_NUMERIC_MAX_PIECES = 64
+
+IntegrationRecord = namedtuple("IntegrationRecord", "load, method, seconds, residual")
+IntegrationRecord.__doc__ = """How the terms of a load were obtained: method is 'symbolic' or 'numeric'. For
+numeric terms, residual is the largest deviation of the polynomial fit from the load (zero otherwise)."""
+
+
+def _symbolic_attribute(name):
+    """Read-only attribute holding symbolic expressions, which are built on first access."""
+    def getter(self):
+        if self._symbolic is None:
+            self._build_symbolic()
+        return self._symbolic[name]
+    return property(getter)
+
+
+class BeamSolution:
+    """
+    Immutable, hashable snapshot of a solved beam, as returned by `Beam.solve`.
+
+    Two snapshots compare equal when they describe the same beam definition
+    (span, supports and loads). They can be safely shared between threads, and
+    used as dictionary keys or set members.
+
+    Attributes
+    ----------
+    span : (float, float)
+        x-coordinates of both beam ends.
+    supports : tuple
+        Supports of the beam, as in `Beam.supports`.
+    loads : tuple
+        Loads applied on the beam.
+    reactions : tuple
+        (F_x, F_y, clockwise torque) at each support, as in
+        `Beam.get_support_reactions`.
+    breakpoints : tuple
+        Sorted x-coordinates where the diagrams are not smooth.
+
+    """
+
+    __slots__ = ("span", "supports", "loads", "reactions", "breakpoints", "_key", "_beam", "_evaluators")
+
+    def __init__(self, beam):
+        for name, value in [("span", (beam._x0, beam._x1)), ("supports", beam.supports),
+                            ("loads", tuple(beam._loads)), ("reactions", tuple(beam._support_reactions)),
+                            ("breakpoints", tuple(beam._breakpoints)), ("_key", beam._definition_key()),
+                            ("_beam", beam._variant()), ("_evaluators", dict(beam._evaluators))]:
+            object.__setattr__(self, name, value)
+        for evaluator in self._evaluators.values():
+            evaluator.breakpoints.flags.writeable = False
+            evaluator.coefficients.flags.writeable = False
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BeamSolution objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("BeamSolution objects are immutable.")
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, BeamSolution) and self._key == other._key
+
+    def __repr__(self):
+        return "BeamSolution(span={0}, supports={1}, loads={2})".format(self.span, self.supports, self.loads)
+
+    def get_diagram(self, quantity: str):
+        """Returns the symbolic expression (a flat sympy.Piecewise) of a diagram.
+
+        Parameters
+        ----------
+        quantity : {'load', 'normal', 'shear', 'moment'}
+            Diagram to be returned, as in `Beam.get_evaluator`.
+
+        """
+        return self._beam._diagrams[quantity]
+
+    def get_evaluator(self, quantity: str):
+        """Returns the compiled numerical evaluator of a diagram, as in `Beam.get_evaluator`."""
+        return self._evaluators[quantity]
+
+    def get_normal_force(self, x_coords):
+        """Returns the normal force at the given x-coordinate(s)."""
+        return self._evaluators["normal"](x_coords)
+
+    def get_shear_force(self, x_coords):
+        """Returns the shear force at the given x-coordinate(s)."""
+        return self._evaluators["shear"](x_coords)
+
+    def get_bending_moment(self, x_coords):
+        """Returns the bending moment at the given x-coordinate(s)."""
+        return self._evaluators["moment"](x_coords)
+
+
+def _active_expression(expr, x_coord):
+    """Replace every sympy.Piecewise in `expr` by its branch active at `x_coord`."""
+    if isinstance(expr, Piecewise):
+        for branch, condition in expr.args:
+            if condition.subs(x, x_coord) == True:
+                return _active_expression(branch, x_coord)
+    if isinstance(expr, (Min, Max)):
+        values = [arg.subs(x, x_coord) for arg in expr.args]
+        pick = min if isinstance(expr, Min) else max
+        return _active_expression(expr.args[values.index(pick(values))], x_coord)
+    if not expr.args:
+        return expr
+    return expr.func(*(_active_expression(arg, x_coord) for arg in expr.args))
+
+
+def _minmax_per_bucket(y_vec, n_buckets):
+    """Indices of the minimum and maximum of `y_vec` within each of `n_buckets`
+    groups of consecutive samples."""
+    size = -(-len(y_vec) // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:len(y_vec)] = y_vec
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    buckets = buckets[valid]
+    return np.concatenate([offsets + np.nanargmin(buckets, axis=1), offsets + np.nanargmax(buckets, axis=1)])
+
+
+def _new_figure(figsize, pyplot: bool = False):
+    """Creates a matplotlib Figure attached to an Agg canvas, bypassing pyplot (unless `pyplot`)."""
+    if pyplot:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _support_outlines(support, xspan, yspan, beam_bottom, beam_top):
+    """Polygon outlines (x-coordinates, y-coordinates) of the glyph of a support."""
+    xc = support.coord
+    if isinstance(support, PinnedSupport):
+        return [(xc + 0.01*xspan*np.array((-1, -1, 0, 1, 1)),
+                 beam_bottom + 0.05*np.array((-1.5, -1, 0, -1, -1.5))*yspan)]
+    if isinstance(support, RollingSupport):
+        return [(xc + 0.01*xspan*np.array((-1, 0, 1)),
+                 beam_bottom + 0.05*np.array((-1, 0, -1))*yspan),
+                (xc + 0.01*xspan*np.array((-1, -1, 1, 1)),
+                 beam_bottom + 0.05*np.array((-1.5, -1.25, -1.25, -1.5))*yspan)]
+    return [(xc + 0.005*xspan*np.array((-1, -1, 1, 1)),
+             np.array((beam_bottom, beam_top, beam_top, beam_bottom)) + 0.05*np.array((-1.5, 1.5, 1.5, -1.5))*yspan)]
+
+
+def _arrow_glyphs(coords, tips, tails, head_length, head_width):
+    """Shafts (n, 2, 2) and heads (n, 3, 2) of vertical arrows, as (x, y) vertices.
+
+    The arrows are located at the x-coordinates `coords` and point from
+    `tails` to `tips` (all arrays of shape (n,)). Swap the last axis to get
+    horizontal arrows.
+    """
+    base = tips + np.sign(tails - tips) * head_length
+    shafts = np.stack([np.stack([coords, tails], -1), np.stack([coords, base], -1)], 1)
+    heads = np.stack([np.stack([coords - head_width, base], -1), np.stack([coords, tips], -1),
+                      np.stack([coords + head_width, base], -1)], 1)
+    return shafts, heads
+
+
+def _torque_glyph(load, y_mid, rx, ry, n_vertices=17):
+    """Half-ellipse (clockwise when the torque is positive) and arrow head around a point torque."""
+    clockwise = load.torque >= 0
+    angles = np.radians(np.linspace(90, -90 if clockwise else 270, n_vertices))
+    arc = np.stack([load.coord + rx * np.cos(angles), y_mid + ry * np.sin(angles)], -1)
+    tip_dx = -0.7 * rx if clockwise else 0.7 * rx
+    head = [(load.coord, y_mid - 0.65 * ry), (load.coord + tip_dx, y_mid - ry), (load.coord, y_mid - 1.35 * ry)]
+    return arc, head
+
+
+def _aggregate_point_loads(forces, coords, n_groups, x0, x1):
+    """Resultants of dense point loads, to be drawn as a few summarized arrows.
+
+    The beam is divided into `n_groups` equal intervals, and the loads of each
+    sign within each interval are replaced by their resultant, located at the
+    centroid of their absolute values.
+
+    Returns
+    -------
+    forces, coords, lo, hi : numpy.ndarray
+        Resultant force and location of every group, and the extent of the
+        loads it gathers.
+    """
+    groups = np.clip(((coords - x0) / (x1 - x0) * n_groups).astype(int), 0, n_groups - 1) * 2 + (forces > 0)
+    _, inverse = np.unique(groups, return_inverse=True)
+    weights, counts = np.bincount(inverse, np.abs(forces)), np.bincount(inverse)
+    centroids = np.where(weights > 0, np.bincount(inverse, np.abs(forces) * coords) / np.where(weights > 0, weights, 1),
+                         np.bincount(inverse, coords) / counts)
+    lo, hi = np.full(len(counts), np.inf), np.full(len(counts), -np.inf)
+    np.minimum.at(lo, inverse, coords)
+    np.maximum.at(hi, inverse, coords)
+    return np.bincount(inverse, forces), centroids, lo, hi
+
 
 class Beam:
     """
@@ -88,14 +349,18 @@ class Beam:
 
     Notes
     -----
-    * The Beam class currently supports only statically determined beams with
-      (exactly) one pinned and one roller support.
+    * By default, the beam rests on (exactly) one pinned and one roller support.
+      Further PinnedSupport, RollingSupport and FixedSupport objects can be
+      added through the method `add_supports`, in which case the (statically
+      indeterminate) reactions are computed with the stiffness method, assuming
+      a constant cross-section.
     * The default units package units for length, force and bending moment 
       (torque) are respectively (m, kN, kN·m)
 
     """
     
-    def __init__(self, span: float=10):
+    def __init__(self, span: float=10, cache=None, processes=None, slim: bool=False, time_budget: float=None,
+                 load_time_budget: float=None):
         """Initializes a Beam object of a given length.
 
         Parameters
@@ -103,19 +368,83 @@ class Beam:
         span : float or int
             Length of the beam span. Must be positive, and the pinned and rolling
             supports can only be placed within this span. The default value is 10.
+        cache : `~beambending.cache.SolutionCache`, optional
+            Persistent cache of solved beams. When provided, beams already found
+            in the cache are answered without any symbolic integration (their
+            symbolic expressions are only rebuilt if accessed). Beams with loads
+            integrated numerically (see `time_budget`) are not stored.
+        processes : int or concurrent.futures.Executor, optional
+            When given, the symbolic integration of the distributed loads
+            (which is independent for every load) runs on a pool of this many
+            worker processes, or on the given executor, which can then be
+            reused by many beams. The pool is started when first needed, and
+            shared with the variants of the beam (see `with_loads`). Point
+            loads and support reactions, which are quick to integrate, are
+            always integrated in this process. By default every load is
+            integrated in this process.
+        slim : bool
+            When True, the beam only keeps its reactions, breakpoints and the
+            packed coefficient arrays of its diagrams once solved. The symbolic
+            expressions are discarded and rebuilt on demand (e.g. when plotting
+            symbolic diagrams), which reduces the memory footprint of large
+            collections of solved beams. The default value is False.
+        time_budget, load_time_budget : float, optional
+            Wall-clock budgets, in seconds, for the symbolic integration of all
+            the distributed loads of the beam and of each of them. When any of
+            them is given, every distributed load is integrated in a worker
+            process (up to `processes` of them at once), which is terminated
+            once the budget runs out. Worker processes are reused by later
+            loads and beams, and their start-up is not charged to the budgets.
+            The load is then integrated numerically instead, from a piecewise
+            polynomial fit of its expression (exact for polynomial loads of
+            degree up to 12), refined until it matches the load to about 1e-10
+            times its largest magnitude. The path taken by each load is
+            reported by `get_integration_log`. By default the integration time
+            is unbounded. Loads that cannot be fitted (e.g. not finite within
+            their span) raise a ValueError when added.
+
+        Raises
+        ------
+        ValueError
+            If a time budget is combined with an executor as `processes`, as
+            the tasks of an executor cannot be abandoned once started.
 
         """
+        if isinstance(processes, Executor) and (time_budget is not None or load_time_budget is not None):
+            raise ValueError("Time budgets require processes to be None or an int, not an executor.")
         self._x0 = 0
         self._x1 = span
         self._pinned_support = 2
         self._rolling_support = 8
+        self._supports = []
+        self._term_cache = {}
+        self._segment_cache = {}
+        self._polynomial_cache = {}
+        self._numeric_breakpoints = {}
+        self._solution = None
+
+        self._cache = cache
+        self._processes = processes
+        self._executor = _LazyProcessPool(processes) if isinstance(processes, int) else processes
+        self._slim = slim
+        self._time_budget = time_budget
+        self._load_time_budget = load_time_budget
+        self._integration_log = {}
 
         self._loads = []
-        self._distributed_forces_x = []
-        self._distributed_forces_y = []
-        self._normal_forces = []
-        self._shear_forces = []
-        self._bending_moments = []
+        self._support_reactions = []
+        self._breakpoints = [self._x0, self._x1]
+        self._symbolic = None
+        self._evaluators = {}
+        self._update_loads()
+
+    _distributed_forces_x = _symbolic_attribute("distributed_forces_x")
+    _distributed_forces_y = _symbolic_attribute("distributed_forces_y")
+    _normal_forces = _symbolic_attribute("normal_forces")
+    _shear_forces = _symbolic_attribute("shear_forces")
+    _bending_moments = _symbolic_attribute("bending_moments")
+    _segments = _symbolic_attribute("segments")
+    _diagrams = _symbolic_attribute("diagrams")
 
     @property
     def length(self):
@@ -132,12 +461,13 @@ class Beam:
     @property
     def pinned_support(self):
         """float or int: x-coordinate of the beam's pinned support. Must be 
-        within the beam span."""
+        within the beam span. Set it to None to remove this support (only
+        meaningful when other supports are added with `add_supports`)."""
         return self._pinned_support
 
     @pinned_support.setter
     def pinned_support(self, x_coord: float):
-        if self._x0 <= x_coord <= self._x1:
+        if x_coord is None or self._x0 <= x_coord <= self._x1:
             self._pinned_support = x_coord
         else:
             raise ValueError("The pinned support must be located within the beam span.")
@@ -145,16 +475,54 @@ class Beam:
     @property
     def rolling_support(self):
         """float or int: x-coordinate of the beam's rolling support. Must be 
-        within the beam span."""
+        within the beam span. Set it to None to remove this support (only
+        meaningful when other supports are added with `add_supports`)."""
         return self._rolling_support
 
     @rolling_support.setter
     def rolling_support(self, x_coord: float):
-        if self._x0 <= x_coord <= self._x1:
+        if x_coord is None or self._x0 <= x_coord <= self._x1:
             self._rolling_support = x_coord
         else:
             raise ValueError("The rolling support must be located within the beam span.")
 
+    @property
+    def supports(self):
+        """tuple: All the supports of the beam, starting with the pinned and
+        rolling supports (when defined), followed by those added with
+        `add_supports`."""
+        supports = []
+        if self._pinned_support is not None:
+            supports.append(PinnedSupport(self._pinned_support))
+        if self._rolling_support is not None:
+            supports.append(RollingSupport(self._rolling_support))
+        return tuple(supports + self._supports)
+
+    def add_supports(self, supports: list):
+        """Add an arbitrary list of supports to the beam.
+
+        With more supports than the default pinned and rolling ones, the beam
+        becomes statically indeterminate (e.g. a continuous beam over several
+        spans, or a clamped beam). Its reactions are then found with the
+        stiffness method, factorizing the stiffness matrix once per support
+        layout and reusing it for every set of loads.
+
+        Parameters
+        ----------
+        supports : iterable
+            An iterable containing PinnedSupport, RollingSupport or
+            FixedSupport objects, located within the Beam span.
+
+        """
+        supported_types = (PinnedSupport, RollingSupport, FixedSupport)
+        for support in supports:
+            if not isinstance(support, supported_types):
+                raise TypeError("The provided supports must be one of the supported types: {0}".format(supported_types))
+            if not self._x0 <= support.coord <= self._x1:
+                raise ValueError("The supports must be located within the beam span.")
+            self._supports.append(support)
+        self._update_loads()
+
     def add_loads(self, loads: list):
         """Apply an arbitrary list of (point- or distributed) loads to the beam.
 
@@ -174,6 +542,83 @@ class Beam:
                 raise TypeError("The provided loads must be one of the supported types: {0}".format(supported_load_types))
         self._update_loads()
 
+    def solve(self):
+        """Returns an immutable snapshot of the solved beam.
+
+        Returns
+        -------
+        solution : `BeamSolution`
+            Hashable object holding the reactions, the symbolic diagrams and
+            their compiled evaluators. Later changes to this Beam object do not
+            affect it.
+
+        """
+        if self._solution is None:
+            self._solution = BeamSolution(self)
+        return self._solution
+
+    def with_loads(self, loads: list):
+        """Returns a new beam with the same supports and loads as this one, plus `loads`.
+
+        The symbolic work already done for the loads of this beam is shared
+        with the new one, so only the new loads (and the reactions) have to be
+        integrated. This beam is not modified.
+
+        Parameters
+        ----------
+        loads : iterable
+            Additional loads, as in `add_loads`.
+
+        Returns
+        -------
+        Beam
+
+        """
+        variant = self._variant()
+        variant.add_loads(loads)
+        return variant
+
+    def with_supports(self, supports: list):
+        """Returns a new beam with the same loads as this one, but with different supports.
+
+        The symbolic work already done for the loads of this beam is shared
+        with the new one, so only the reactions have to be integrated again.
+        This beam is not modified.
+
+        Parameters
+        ----------
+        supports : iterable
+            PinnedSupport, RollingSupport and FixedSupport objects replacing
+            all the supports of this beam. The first pinned and rolling supports
+            become the `pinned_support` and `rolling_support` of the new beam.
+
+        Returns
+        -------
+        Beam
+
+        """
+        supports = list(supports)
+        variant = self._variant()
+        variant._pinned_support = variant._rolling_support = None
+        variant._supports = []
+        for support_type, attr in ((PinnedSupport, "_pinned_support"), (RollingSupport, "_rolling_support")):
+            first = next((s for s in supports if isinstance(s, support_type)), None)
+            if first is not None:
+                if not self._x0 <= first.coord <= self._x1:
+                    raise ValueError("The supports must be located within the beam span.")
+                setattr(variant, attr, first.coord)
+                supports.remove(first)
+        variant.add_supports(supports)
+        return variant
+
+    def _variant(self):
+        """Shallow copy sharing the per-load symbolic terms, but not the load or support lists."""
+        variant = Beam.__new__(Beam)
+        variant.__dict__.update(self.__dict__)
+        variant._loads = list(self._loads)
+        variant._supports = list(self._supports)
+        return variant
+
     def get_reaction_forces(self):
         """
         Calculates the reaction forces at the supports, given the applied loads.
@@ -188,24 +633,302 @@ class Beam:
             reaction force components for pinned (x,y) and rolling (y) supports 
             respectively.
 
+        Raises
+        ------
+        ValueError
+            If the beam does not rest on exactly one pinned and one rolling
+            support. Use `get_support_reactions` in that case.
+
         """
-        x0, x1 = self._x0, self._x1
+        if not self._is_statically_determinate():
+            raise ValueError("The beam must have exactly one pinned and one rolling support. "
+                             "Use get_support_reactions() for other support layouts.")
+        if self._solved_layout == (self._x0, self._x1, self.supports):
+            (f_ax, f_ay, _), (_, f_by, _) = self._support_reactions  # no need to integrate again
+        else:  # the supports were moved since the loads were last updated
+            f_ax, f_ay, f_by = self._determinate_reactions()
+        return f_ax + 0.0, f_ay + 0.0, f_by + 0.0  # "+ 0.0" turns -0.0 into 0.0
+
+    def _determinate_reactions(self):
+        """Solves the equilibrium of a beam on one pinned and one rolling support."""
         xA, xB = self._pinned_support, self._rolling_support
-        F_Rx = sum(integrate(load, (x, x0, x1)) for load in self._distributed_forces_x) + \
-               sum(f.force for f in self._point_loads_x())
-        F_Ry = sum(integrate(load, (x, x0, x1)) for load in self._distributed_forces_y) + \
-               sum(f.force for f in self._point_loads_y())
-        M_R = sum(integrate(load * x, (x, x0, x1)) for load in self._distributed_forces_y) + \
-              sum(f.force * f.coord for f in self._point_loads_y()) + \
-              sum(-1 * f.torque for f in self._point_torques())
+        terms = [self._load_terms(load) for load in self._loads]
+        F_Rx = sum(t.force_x for t in terms)
+        F_Ry = sum(t.force_y for t in terms)
+        M_R = sum(t.moment_z for t in terms)
         A = np.array([[-1, 0, 0],
                       [0, -1, -xA],
                       [0, -1, -xB]]).T
-        b = np.array([F_Rx, F_Ry, M_R])
-        F_Ax, F_Ay, F_By = np.linalg.inv(A).dot(b)
-        return F_Ax, F_Ay, F_By
+        b = np.array([F_Rx, F_Ry, M_R], dtype=float)
+        F_Ax, F_Ay, F_By = np.linalg.solve(A, b)
+        return float(F_Ax), float(F_Ay), float(F_By)
+
+    def get_support_reactions(self):
+        """
+        Returns the reactions at every support of the beam, given the applied loads.
+
+        Returns
+        -------
+        reactions : list of (float, float, float)
+            Horizontal force, vertical force and clockwise torque exerted on the
+            beam by each support, in the same order as `supports`. Components
+            not restrained by a support are zero.
+
+        """
+        return list(self._support_reactions)
 
-    def plot(self):
+    def get_integration_log(self):
+        """Returns how the terms of every load of the beam were integrated.
+
+        Returns
+        -------
+        log : list of `IntegrationRecord`
+            Named tuples (load, method, seconds, residual), in the same order
+            as the loads, where method is 'symbolic' or 'numeric' (when the time
+            budget ran out), seconds is the wall-clock time spent on the load,
+            including the abandoned symbolic attempt, and residual is the
+            largest deviation of the numeric fit from the load (zero for
+            symbolic terms). Loads whose terms were
+            never integrated by this beam (e.g. when answered by a
+            `~beambending.cache.SolutionCache`) are omitted.
+
+        """
+        log = []
+        for load in self._loads:
+            try:
+                record = self._integration_log.get(self._term_key(load))
+            except TypeError:
+                record = None
+            if record is not None:
+                log.append(record._replace(load=load))
+        return log
+
+    def get_evaluator(self, quantity: str):
+        """Returns a fast numerical evaluator for one of the beam diagrams.
+
+        Parameters
+        ----------
+        quantity : {'load', 'normal', 'shear', 'moment'}
+            Diagram to be evaluated: distributed vertical load, normal force,
+            shear force or bending moment, with the sign convention of the plots.
+
+        Returns
+        -------
+        evaluator : `~beambending.evaluator.PiecewisePolynomial`
+            Picklable callable mapping x-coordinates to diagram values.
+
+        """
+        try:
+            return self._evaluators[quantity]
+        except KeyError:
+            raise ValueError("The quantity must be one of {0}".format(tuple(self._evaluators)))
+
+    def get_normal_force(self, x_coords):
+        """Returns the normal force at the given x-coordinate(s)."""
+        return self._evaluators["normal"](x_coords)
+
+    def get_shear_force(self, x_coords):
+        """Returns the shear force at the given x-coordinate(s)."""
+        return self._evaluators["shear"](x_coords)
+
+    def get_bending_moment(self, x_coords):
+        """Returns the bending moment at the given x-coordinate(s)."""
+        return self._evaluators["moment"](x_coords)
+
+    def get_diagram_data(self, quantity: str, n_points: int = 1000, oversampling: int = 10):
+        """Returns display-ready samples of one of the beam diagrams.
+
+        The diagram is sampled densely and then decimated, keeping the minimum
+        and maximum of every bucket of consecutive samples. The exact global
+        extrema, the beam ends and both one-sided limits at every breakpoint
+        (i.e. every jump caused by a point load) are always kept.
+
+        Parameters
+        ----------
+        quantity : {'load', 'normal', 'shear', 'moment'}
+            Diagram to be sampled, as in `get_evaluator`.
+        n_points : int
+            Approximate number of points to be returned. The result may hold a
+            few more, since breakpoints and extrema are never discarded. The
+            default value is 1000.
+        oversampling : int
+            Number of dense samples evaluated per returned point. The default
+            value is 10.
+
+        Returns
+        -------
+        x_vec, y_vec : (numpy.ndarray, numpy.ndarray)
+            Sorted x-coordinates and the corresponding diagram values.
+
+        """
+        func = self.get_evaluator(quantity)
+        x_vec, y_vec = func.sample(n_points * oversampling)
+        for x_ext, y_ext in func.extrema():
+            if x_ext not in func.breakpoints:
+                pos = np.searchsorted(x_vec, x_ext)
+                x_vec, y_vec = np.insert(x_vec, pos, x_ext), np.insert(y_vec, pos, y_ext)
+        keep = np.isin(x_vec, func.breakpoints)
+        keep[[y_vec.argmax(), y_vec.argmin()]] = True
+        n_buckets = max(1, (n_points - np.count_nonzero(keep)) // 2)
+        keep[_minmax_per_bucket(y_vec, n_buckets)] = True
+        return x_vec[keep], y_vec[keep]
+
+    def iter_diagram_data(self, n_points: int, chunk_size: int = 2**16):
+        """Generator of the normal force, shear force and bending moment, in chunks.
+
+        The diagrams are sampled on `n_points` evenly spaced points between
+        both beam ends, which may be far more than fit in memory, since only
+        one chunk is held at a time. Chunks never straddle a breakpoint: every
+        interior breakpoint ends a chunk with the left-sided limits of the
+        diagrams and starts the next one with the right-sided limits (replacing
+        the evenly spaced point that may fall on it), so every chunk is
+        evaluated with a single expression per diagram.
+
+        Parameters
+        ----------
+        n_points : int
+            Number of evenly spaced points, at least 2.
+        chunk_size : int
+            Maximum number of points per chunk. The default value is 65536.
+
+        Yields
+        ------
+        x_vec, normal, shear, moment : tuple of numpy.ndarray
+            Sorted x-coordinates of the chunk and the diagram values there.
+
+        Examples
+        --------
+        >>> beam = Beam(9)
+        >>> beam.add_loads([PointLoadV(-20, 3)])
+        >>> for x_vec, normal, shear, moment in beam.iter_diagram_data(10, chunk_size=3):
+        ...     print(x_vec)
+        [0. 1. 2.]
+        [2. 3.]
+        [3. 4. 5.]
+        [6. 7. 8.]
+        [8. 9.]
+
+        Every chunk can be written straight to a file, e.g. as rows of float64:
+
+        >>> import tempfile
+        >>> with tempfile.TemporaryFile() as f:
+        ...     for chunk in beam.iter_diagram_data(10**5):
+        ...         np.column_stack(chunk).tofile(f)
+        ...     print(f.tell() // (4 * 8))  # rows of 4 values of 8 bytes
+        100003
+
+        """
+        if n_points < 2:
+            raise ValueError("At least 2 points are needed.")
+        evaluators = [self._evaluators[name] for name in ("normal", "shear", "moment")]
+        bounds = np.asarray(self._breakpoints, dtype=float)
+        x0, step = bounds[0], (bounds[-1] - bounds[0]) / (n_points - 1)
+
+        def first_index_above(x_coord):
+            """Index of the first evenly spaced point strictly greater than `x_coord`."""
+            k = max(0, int((x_coord - x0) // step))
+            while k > 0 and x0 + (k - 1) * step > x_coord:
+                k -= 1
+            while x0 + k * step <= x_coord:
+                k += 1
+            return k
+
+        for i, (left, right) in enumerate(zip(bounds[:-1], bounds[1:])):
+            k_first = first_index_above(left)
+            k_end = min(first_index_above(right), n_points - 1)  # the right beam end is sampled as `right`
+            while k_end > k_first and x0 + (k_end - 1) * step >= right:
+                k_end -= 1
+            n_segment = k_end - k_first + 2  # both bounds of the interval and the points strictly within
+            for start in range(0, n_segment, chunk_size):
+                positions = np.arange(start, min(start + chunk_size, n_segment))
+                x_vec = x0 + (k_first - 1 + positions) * step
+                x_vec[positions == 0] = left
+                x_vec[positions == n_segment - 1] = right
+                yield (x_vec,) + tuple(evaluator.evaluate_segment(i, x_vec) for evaluator in evaluators)
+
+    def monte_carlo(self, distributions: dict, n_samples: int, chunk_size: int = 4096, n_points: int = 201,
+                    thresholds: dict = None, seed=None):
+        """Statistics of the reactions and peak bending moments under random loads.
+
+        The samples are evaluated in vectorized chunks of `chunk_size`, using
+        the linearity of the reactions and diagrams in the load magnitudes,
+        and accumulated into streaming statistics, so that memory usage does
+        not depend on `n_samples`.
+
+        Parameters
+        ----------
+        distributions : dict
+            Maps the index of a load (in the order the loads were added) to a
+            dict of samplers for its fields, e.g. ``{0: {"force": sampler,
+            "coord": sampler}}``. A sampler is a function ``sampler(rng, n)``
+            returning `n` samples drawn with the numpy Generator `rng`. The
+            ``expr`` sampler of a distributed load returns factors that scale
+            its expression; the span of distributed loads cannot be sampled.
+            Loads without samplers keep their nominal values.
+        n_samples : int
+            Total number of samples.
+        chunk_size : int
+            Number of samples evaluated at once. The default value is 4096.
+        n_points : int
+            Number of evenly spaced sections where the bending moment is
+            evaluated, in addition to every breakpoint and sampled load
+            position. The default value is 201.
+        thresholds : dict, optional
+            Maps result names to the values whose exceedance probability is
+            counted exactly.
+        seed : int or numpy.random.Generator, optional
+            Seed of the random number generator.
+
+        Returns
+        -------
+        dict
+            `~beambending.uncertainty.StreamingStatistics` objects for the keys
+            'reactions' (support reactions as in `get_support_reactions`),
+            'moment_max' and 'moment_min' (largest and smallest bending
+            moment along the beam) and 'moment_peak' (largest absolute value).
+
+        """
+        from .uncertainty import monte_carlo  # imported here to avoid a circular import
+        return monte_carlo(self, distributions, n_samples, chunk_size, n_points, thresholds, seed)
+
+    def jacobian(self, x_coords=(), side: str = "right"):
+        """Exact derivatives of the reactions, section forces and extreme bending moments.
+
+        The derivatives with respect to the force (or torque) and coordinate
+        of every point load, the scale and span bounds of every distributed
+        load, and the coordinates of the pinned and rolling supports are all
+        computed at once from the solved beam, without solving it again. See
+        `~beambending.sensitivity` for details.
+
+        Parameters
+        ----------
+        x_coords : array-like, optional
+            x-coordinates of the sections where the derivatives of the normal
+            force, shear force and bending moment are computed.
+        side : {'right', 'left'}
+            Whether loads located exactly at a section are included ('right',
+            the default) or not.
+
+        Returns
+        -------
+        dict
+            Arrays of derivatives with one column per parameter, for the keys
+            'reactions' (of `get_reaction_forces`, shape (3, n_parameters)),
+            'normal', 'shear' and 'moment' (shape (len(x_coords),
+            n_parameters)), and 'moment_max' and 'moment_min'. The key
+            'parameters' holds the (load index, field) label of every column.
+
+        Raises
+        ------
+        ValueError
+            If the beam does not rest on exactly one pinned and one rolling
+            support.
+
+        """
+        from .sensitivity import jacobian  # imported here to avoid a circular import
+        return jacobian(self, x_coords, side)
+
+    def plot(self, max_arrows: int = None, pyplot: bool = False):
         """Generates a single figure with 4 plots corresponding respectively to:
 
         - a schematic of the loaded beam
@@ -215,18 +938,36 @@ class Beam:
 
         These plots can be generated separately with dedicated functions.
 
+        Parameters
+        ----------
+        max_arrows : int, optional
+            Aggregation of dense point loads in the schematic, as in
+            `plot_beam_diagram`.
+        pyplot : bool
+            When True, the figure is created with pyplot, so that it is shown
+            by ``plt.show()`` and displayed by notebooks. By default it is not
+            registered with pyplot (see the note below).
+
         Returns
         -------
         figure : `~matplotlib.figure.Figure`
             Returns a handle to a figure with the 3 subplots: Beam schematic, 
             shear force diagram, and bending moment diagram.
 
+        Notes
+        -----
+        By default the figure is drawn on an Agg canvas, without touching
+        pyplot's global state, so that several beams can be plotted
+        concurrently. Such a figure can be saved with ``fig.savefig``, but it
+        is not shown by ``plt.show()`` nor displayed automatically in
+        notebooks: pass ``pyplot=True`` for that.
+
         """
-        fig = plt.figure(figsize=(6, 10))
+        fig = _new_figure(figsize=(6, 10), pyplot=pyplot)
         fig.subplots_adjust(hspace=0.4)
 
         ax1 = fig.add_subplot(4, 1, 1)
-        self.plot_beam_diagram(ax1)
+        self.plot_beam_diagram(ax1, max_arrows)
 
         ax2 = fig.add_subplot(4, 1, 2)
         self.plot_normal_force(ax2)
@@ -239,61 +980,87 @@ class Beam:
 
         return fig
 
-    def plot_beam_diagram(self, ax=None):
+    def plot_beam_diagram(self, ax=None, max_arrows: int = None, pyplot: bool = False):
         """Returns a schematic of the beam and all the loads applied on it.
+
+        The arrows of all the point loads and torques are drawn as two artist
+        collections, so that beams with many loads are drawn quickly.
+
+        Parameters
+        ----------
+        ax : `~matplotlib.axes.Axes`, optional
+            Axes where the schematic is drawn. By default, a new figure is created.
+        max_arrows : int, optional
+            When there are more vertical (or horizontal) point loads than this,
+            the beam is divided into `max_arrows` equal intervals, and the loads
+            of each sign within an interval are drawn as a single arrow at
+            their resultant, with a bar spanning the loads it gathers. By
+            default every point load is drawn.
+        pyplot : bool
+            When `ax` is not given, whether the new figure is created with
+            pyplot, as in `plot`.
+
         """
         plot01_params = {'ylabel': "Beam loads", 'yunits': r'kN / m',
                          # 'xlabel':"Beam axis", 'xunits':"m",
                          'color': "g",
                          'inverted': True}
         if ax is None:
-            ax = plt.figure(figsize=(6, 2.5)).add_subplot(1,1,1)
+            ax = _new_figure(figsize=(6, 2.5), pyplot=pyplot).add_subplot(1,1,1)
         ax.set_title("Loaded beam diagram")
-        self._plot_analytical(ax, sum(self._distributed_forces_y), **plot01_params)
-        self._draw_beam_schematic(ax)
+        self._plot_analytical(ax, self._evaluators["load"], **plot01_params)
+        self._draw_beam_schematic(ax, max_arrows)
         return ax.get_figure()
 
-    def plot_normal_force(self, ax=None):
+    def plot_normal_force(self, ax=None, pyplot: bool = False):
         """Returns a plot of the normal force as a function of the x-coordinate.
+
+        A new figure is created unless `ax` is given, with pyplot if `pyplot`
+        is True (as in `plot`).
         """
         plot02_params = {'ylabel': "Normal force", 'yunits': r'kN',
                          # 'xlabel':"Beam axis", 'xunits':"m",
                          'color': "b"}
         if ax is None:
-            ax = plt.figure(figsize=(6, 2.5)).add_subplot(1,1,1)
-        self._plot_analytical(ax, sum(self._normal_forces), **plot02_params)
+            ax = _new_figure(figsize=(6, 2.5), pyplot=pyplot).add_subplot(1,1,1)
+        self._plot_analytical(ax, self._evaluators["normal"], **plot02_params)
         return ax.get_figure()
 
-    def plot_shear_force(self, ax=None):
+    def plot_shear_force(self, ax=None, pyplot: bool = False):
         """Returns a plot of the shear force as a function of the x-coordinate.
+
+        A new figure is created unless `ax` is given, with pyplot if `pyplot`
+        is True (as in `plot`).
         """
         plot03_params = {'ylabel': "Shear force", 'yunits': r'kN',
                          # 'xlabel':"Beam axis", 'xunits':"m",
                          'color': "r"}
         if ax is None:
-            ax = plt.figure(figsize=(6, 2.5)).add_subplot(1,1,1)
-        self._plot_analytical(ax, -1* sum(self._shear_forces), **plot03_params)
+            ax = _new_figure(figsize=(6, 2.5), pyplot=pyplot).add_subplot(1,1,1)
+        self._plot_analytical(ax, self._evaluators["shear"], **plot03_params)
         return ax.get_figure()
 
-    def plot_bending_moment(self, ax=None):
+    def plot_bending_moment(self, ax=None, pyplot: bool = False):
         """Returns a plot of the bending moment as a function of the x-coordinate.
+
+        A new figure is created unless `ax` is given, with pyplot if `pyplot`
+        is True (as in `plot`).
         """
         plot04_params = {'ylabel': "Bending moment", 'yunits': r'kN·m',
                          'xlabel': "Beam axis", 'xunits': "m",
                          'color': "y"}
         if ax is None:
-            ax = plt.figure(figsize=(6, 2.5)).add_subplot(1,1,1)
-        self._plot_analytical(ax, -1* sum(self._bending_moments), **plot04_params)
+            ax = _new_figure(figsize=(6, 2.5), pyplot=pyplot).add_subplot(1,1,1)
+        self._plot_analytical(ax, self._evaluators["moment"], **plot04_params)
         return ax.get_figure()
 
-    def _plot_analytical(self, ax: plt.axes, sym_func, title: str = "", maxmin_hline: bool = True, xunits: str = "",
+    def _plot_analytical(self, ax: "matplotlib.axes.Axes", func, title: str = "", maxmin_hline: bool = True, xunits: str = "",
                         yunits: str = "", xlabel: str = "", ylabel: str = "", color=None, inverted=False):
         """
-        Auxiliary function for plotting a sympy.Piecewise analytical function.
+        Auxiliary function for plotting a piecewise analytical function.
 
         :param ax: a matplotlib.Axes object where the data is to be plotted.
-        :param x_vec: array-like, support where the provided symbolic function will be plotted
-        :param sym_func: symbolic function using the variable x
+        :param func: vectorized callable, typically a PiecewisePolynomial evaluator
         :param title: title to show above the plot, optional
         :param maxmin_hline: when set to False, the extreme values of the function are not displayed
         :param xunits: str, physical unit to be used for the x-axis. Example: "m"
@@ -304,16 +1071,17 @@ class Beam:
         :return: a matplotlib.Axes object representing the plotted data.
 
         """
+        from matplotlib.patches import Polygon
+
         x_vec = np.linspace(self._x0, self._x1, int(min(self.length * 1000 + 1, 1e4)))
-        y_lam = lambdify(x, sym_func, "numpy")
-        y_vec = np.array([y_lam(t) for t in x_vec])
+        y_vec = func(x_vec)
 
         if inverted:
             y_vec *= -1
 
         if color:
-            a, b = x_vec[0], x_vec[-1]
-            verts = [(a, 0)] + list(zip(x_vec, y_vec)) + [(b, 0)]
+            verts = np.column_stack([np.concatenate([x_vec[:1], x_vec, x_vec[-1:]]),
+                                     np.concatenate([[0], y_vec, [0]])])
             poly = Polygon(verts, facecolor=color, edgecolor='0.5', alpha=0.4)
             ax.add_patch(poly)
 
@@ -323,14 +1091,14 @@ class Beam:
             if abs(max(y_vec)) > tol:
                 ax.axhline(y=max(y_vec), linestyle='--', color="g", alpha=0.5)
                 max_idx = y_vec.argmax()
-                plt.annotate('${:0.1f}'.format(y_vec[max_idx]*(1-2*inverted)).rstrip('0').rstrip('.') + " $ {}".format(yunits),
+                ax.annotate('${:0.1f}'.format(y_vec[max_idx]*(1-2*inverted)).rstrip('0').rstrip('.') + " $ {}".format(yunits),
                             xy=(x_vec[max_idx], y_vec[max_idx]), xytext=(8, 0), xycoords=('data', 'data'),
                             textcoords='offset points', size=12)
 
             if abs(min(y_vec)) > tol:
                 ax.axhline(y=min(y_vec), linestyle='--', color="g", alpha=0.5)
                 min_idx = y_vec.argmin()
-                plt.annotate('${:0.1f}'.format(y_vec[min_idx]*(1-2*inverted)).rstrip('0').rstrip('.') + " $ {}".format(yunits),
+                ax.annotate('${:0.1f}'.format(y_vec[min_idx]*(1-2*inverted)).rstrip('0').rstrip('.') + " $ {}".format(yunits),
                             xy=(x_vec[min_idx], y_vec[min_idx]), xytext=(8, 0), xycoords=('data', 'data'),
                             textcoords='offset points', size=12)
 
@@ -350,9 +1118,14 @@ class Beam:
 
         return ax
 
-    def _draw_beam_schematic(self, ax):
+    def _draw_beam_schematic(self, ax, max_arrows: int = None):
         """Auxiliary function for plotting the beam object and its applied loads.
+
+        With `max_arrows`, denser point loads are aggregated as in `_aggregate_point_loads`.
         """
+        from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+        from matplotlib.patches import Polygon, Rectangle
+
         # Adjust y-axis
         ymin, ymax = -5, 5
         ylim = (min(ax.get_ylim()[0], ymin), max(ax.get_ylim()[1], ymax))
@@ -373,65 +1146,41 @@ class Beam:
         ax.add_patch(beam_body)
 
         # Markers at beam supports
-        pinned_support = Polygon(np.array([self.pinned_support + 0.01*xspan*np.array((-1, -1, 0, 1, 1)), 
-                                           beam_bottom + 0.05*np.array((-1.5, -1,0,-1, -1.5))*yspan]).T)
-        rolling_support = [Polygon(np.array([self.rolling_support + 0.01*xspan*np.array((-1, 0, 1)), 
-                                            beam_bottom + 0.05*np.array((-1,0,-1))*yspan]).T),
-                           Polygon(np.array([self.rolling_support + 0.01*xspan*np.array((-1, -1, 1, 1)), 
-                                            beam_bottom + 0.05*np.array((-1.5,-1.25, -1.25, -1.5))*yspan]).T)]
-
-        supports = PatchCollection([pinned_support, *rolling_support], facecolor="black")
+        outlines = [outline for support in self.supports
+                    for outline in _support_outlines(support, xspan, yspan, beam_bottom, beam_top)]
+        supports = PatchCollection([Polygon(np.array(outline).T) for outline in outlines], facecolor="black")
         ax.add_collection(supports)
 
-        # Draw arrows at point loads
-        arrowprops = dict(arrowstyle="simple", color="darkgreen", shrinkA=0.1, mutation_scale=18)
-        for load in self._point_loads_y():
-            x0 = x1 = load[1]
-            if load[0] < 0:
-                y0, y1 = beam_top, beam_top + 0.17 * yspan
-            else:
-                y0, y1 = beam_bottom, beam_bottom - 0.17 * yspan
-            ax.annotate("",
-                        xy=(x0, y0), xycoords='data',
-                        xytext=(x1, y1), textcoords='data',
-                        arrowprops=arrowprops
-                        )
-
-        for load in self._point_loads_x():
-            x0 = load[1]
-            y0 = y1 = (beam_top + beam_bottom) / 2.0
-            if load[0] < 0:
-                x1 = x0 + xspan * 0.05
-            else:
-                x1 = x0 - xspan * 0.05
-            ax.annotate("",
-                        xy=(x0, y0), xycoords='data',
-                        xytext=(x1, y1), textcoords='data',
-                        arrowprops=arrowprops
-                        )
-        
-        # Draw a round arrow at point torques
+        # Arrows at point loads and round arrows at point torques, batched into
+        # two collections (shafts and heads) whatever the number of loads
+        y_mid = (beam_top + beam_bottom) / 2.0
+        shafts, heads = [], []
+        forces, coords = (np.array([load[i] for load in self._point_loads_y()], dtype=float).reshape(-1) for i in (0, 1))
+        if max_arrows is not None and len(forces) > max_arrows:
+            forces, coords, lo, hi = _aggregate_point_loads(forces, coords, max_arrows, beam_left, beam_right)
+            grouped = lo < hi
+            bar_y = np.where(forces[grouped] < 0, beam_top + 0.17 * yspan, beam_bottom - 0.17 * yspan)
+            shafts.extend(np.stack([np.stack([lo[grouped], bar_y], -1), np.stack([hi[grouped], bar_y], -1)], 1))
+        tips = np.where(forces < 0, beam_top, beam_bottom)
+        tails = np.where(forces < 0, beam_top + 0.17 * yspan, beam_bottom - 0.17 * yspan)
+        for glyphs, new_glyphs in zip((shafts, heads), _arrow_glyphs(coords, tips, tails, 0.05 * yspan, 0.008 * xspan)):
+            glyphs.extend(new_glyphs)
+
+        forces, coords = (np.array([load[i] for load in self._point_loads_x()], dtype=float).reshape(-1) for i in (0, 1))
+        if max_arrows is not None and len(forces) > max_arrows:
+            forces, coords, _, _ = _aggregate_point_loads(forces, coords, max_arrows, beam_left, beam_right)
+        tails = coords + np.where(forces < 0, 1, -1) * xspan * 0.05
+        for glyphs, new_glyphs in zip((shafts, heads), _arrow_glyphs(np.full(len(coords), y_mid), coords, tails,
+                                                                    0.015 * xspan, 0.03 * yspan)):
+            glyphs.extend(new_glyphs[..., ::-1])  # horizontal arrows: swap the x and y columns
+
         for load in self._point_torques():
-            xc = load[1]
-            yc = (beam_top + beam_bottom) / 2.0
-            width = yspan * 0.17
-            height = xspan * 0.05
-            arc_len= 180
-
-            if load[0] < 0:
-                start_angle = 90
-                endX = xc + (height/2)*np.cos(np.radians(arc_len + start_angle))
-                endY = yc + (width/2)*np.sin(np.radians(arc_len + start_angle))
-            else:
-                start_angle = 270
-                endX = xc + (height/2)*np.cos(np.radians(start_angle))
-                endY = yc + (width/2)*np.sin(np.radians(start_angle))
+            arc, head = _torque_glyph(load, y_mid, xspan * 0.025, yspan * 0.085)
+            shafts.append(arc)
+            heads.append(head)
 
-            orientation = start_angle + arc_len
-            arc = Arc([xc, yc], width, height, angle=start_angle, theta2=arc_len, capstyle='round', linestyle='-', lw=2.5, color="darkgreen")
-            arrow_head = RegularPolygon((endX, endY), 3, height * 0.35, np.radians(orientation), color="darkgreen")
-            ax.add_patch(arc)
-            ax.add_patch(arrow_head)
+        ax.add_collection(LineCollection(shafts, colors="darkgreen", linewidths=2.5, capstyle="round"))
+        ax.add_collection(PolyCollection(heads, facecolors="darkgreen", edgecolors="none"))
 
         ax.axes.get_yaxis().set_visible(False)
         ax.spines['right'].set_visible(False)
@@ -440,27 +1189,423 @@ class Beam:
         # ax.tick_params(left="off")
 
     def _update_loads(self):
-        x0 = self._x0
-
-        self._distributed_forces_x = [self._create_distributed_force(f) for f in self._distributed_loads_x()]
-        self._distributed_forces_y = [self._create_distributed_force(f) for f in self._distributed_loads_y()]
+        self._solution = None
+        self._symbolic = None
+        self._breakpoints = self._get_breakpoints()
+        self._solved_layout = (self._x0, self._x1, self.supports)
+        key = self._cache.key(self) if self._cache is not None and self._loads else None
+        cached = self._cache.get(key) if key is not None else None
+        if cached is not None:
+            self._support_reactions, self._evaluators = cached
+            # including the bounds of the pieces of numerically integrated loads, if any
+            self._breakpoints = sorted(set(self._breakpoints).union(self._evaluators["moment"].breakpoints.tolist()))
+            return
+
+        self._prefetch_load_terms()
+        self._breakpoints = self._get_breakpoints()  # including the pieces of numerically integrated loads
+        self._support_reactions = self._solve_support_reactions()
+        if not self._loads:  # unloaded beam: every diagram is zero, no need to integrate anything
+            zeros = np.zeros((len(self._breakpoints) - 1, 1))
+            self._evaluators = {name: PiecewisePolynomial(self._breakpoints, zeros) for name in _QUANTITIES}
+            return
+        reactions = [(f, self._load_terms(f, cache=False)) for f in self._reaction_loads()]
+        self._evaluators = {"load": self._summed_polynomial("load", self._distributed_loads_y()),
+                            **{name: self._summed_polynomial(name, self._loads, reactions)
+                               for name in _QUANTITIES[1:]}}
+        if self._slim:
+            self._term_cache = {}
+            self._segment_cache = {}
+            self._polynomial_cache = {}
+        if key is not None and all(record.method == "symbolic" for record in self.get_integration_log()):
+            # numeric fits are only approximations, not to be served to beams without a time budget
+            self._cache.put(key, self._support_reactions, self._evaluators)
+
+    def _build_symbolic(self):
+        """Builds the symbolic expressions of the loads and diagrams, given the support reactions."""
+        reactions = self._reaction_loads()
+        reaction_terms = [self._load_terms(f, cache=False) for f in reactions]
+        terms = [self._load_terms(f) for f in self._loads] + reaction_terms
+        symbolic = {
+            "distributed_forces_x": [self._load_terms(f).distributed for f in self._distributed_loads_x()],
+            "distributed_forces_y": [self._load_terms(f).distributed for f in self._distributed_loads_y()],
+            "normal_forces": [t.normal for t in terms if t.normal is not None],
+            "shear_forces": [t.shear for t in terms if t.shear is not None],
+            "bending_moments": [t.moment for t in terms if t.moment is not None],
+        }
+        symbolic["segments"] = {
+            "load": self._summed_segments("load", self._distributed_loads_y()),
+            **{name: self._summed_segments(name, self._loads, zip(reactions, reaction_terms))
+               for name in _QUANTITIES[1:]},
+        }
+        symbolic["diagrams"] = {name: self._consolidate(segments) for name, segments in symbolic["segments"].items()}
+        self._symbolic = symbolic
+
+    def _load_terms(self, load, cache: bool = True):
+        """Symbolic contribution of a single load (or support reaction) to the diagrams.
+
+        The result only depends on the load itself, so (when `cache` is True)
+        it is cached and shared with the variants created by `with_loads` and
+        `with_supports`.
+        """
+        key = self._term_key(load)
+        try:
+            terms = self._term_cache.get(key) if cache else None
+        except TypeError:  # unhashable load, e.g. with a numpy array as span
+            terms, cache = None, False
+        if terms is not None:
+            return terms
+        start = time.perf_counter()
+        x0, x1 = self._x0, self._x1
+        record = self._integration_log.get(key) if cache else None
+        if record is not None and record.method == "numeric":  # e.g. dropped by a slim beam
+            terms = self._numeric_load_terms(load)[0]
+            self._term_cache[key] = terms
+            return terms
+        if isinstance(load, DistributedLoadH):
+            distributed = self._create_distributed_force(load)
+            terms = _LoadTerms(distributed, -1*integrate(distributed, (x, x0, x)), None, None,
+                               integrate(distributed, (x, x0, x1)), 0, 0)
+        elif isinstance(load, DistributedLoadV):
+            distributed = self._create_distributed_force(load)
+            shear = integrate(distributed, (x, x0, x))
+            terms = _LoadTerms(distributed, None, shear, integrate(shear, (x, x0, x)),
+                               0, integrate(distributed, (x, x0, x1)), integrate(distributed * x, (x, x0, x1)))
+        elif isinstance(load, PointLoadH):
+            terms = _LoadTerms(None, -1*self._effort_from_pointload(load), None, None, load.force, 0, 0)
+        elif isinstance(load, PointLoadV):
+            shear = self._effort_from_pointload(load)
+            origin = Max(load.coord, x0)  # the integral of the shear force from x0, in closed form
+            moment = Piecewise((0, x < origin), (load.force * (x - origin), True))
+            terms = _LoadTerms(None, None, shear, moment, 0, load.force, load.force * load.coord)
+        else:
+            terms = _LoadTerms(None, None, None, self._effort_from_pointload(load), 0, 0, -1 * load.torque)
+        if cache:
+            self._term_cache[key] = terms
+            self._integration_log[key] = IntegrationRecord(load, "symbolic", time.perf_counter() - start, 0.0)
+        return terms
+
+    def _numeric_load_terms(self, load):
+        """Terms of a distributed load integrated from a piecewise polynomial fit of its expression.
+
+        The part of the span within the beam is bisected until the polynomial
+        fitted on each piece (least squares at Chebyshev nodes) matches the
+        load on a separate grid of check points, to `_NUMERIC_TOLERANCE` times
+        the largest magnitude of the load. The pieces are then integrated
+        exactly. Their coefficients are converted to exact rationals, so that
+        expanding the terms around other origins (as `_load_segments` does)
+        loses no accuracy.
+
+        :return: (terms, bounds, residual), where bounds are the x-coordinates
+        of the pieces and residual is the largest deviation of the fit from the
+        load at the check points.
+        :raises ValueError: if the load is not finite at some sample, or the
+        fit does not converge within `_NUMERIC_MAX_PIECES` pieces.
+        """
+        distributed = self._create_distributed_force(load)
+        a, b = max(load.span[0], self._x0), min(load.span[1], self._x1)
+        func = lambdify(x, sympify(load.expr), "numpy")
+
+        def sample(t, origin):
+            with np.errstate(divide="ignore", invalid="ignore"):  # reported below
+                values = np.broadcast_to(np.asarray(func(origin + t), dtype=float), t.shape)
+            if not np.all(np.isfinite(values)):
+                raise ValueError("The distributed load {0} is not finite within its span.".format(load))
+            return values
+
+        n_samples = 4 * _NUMERIC_FIT_DEGREE
+        nodes = (1 - np.cos(np.pi * (np.arange(n_samples) + 0.5) / n_samples)) / 2  # on [0, 1]
+        checks = np.linspace(0, 1, 2 * n_samples + 1)
+        pieces, pending, scale, residual = [], [(a, b)] if b > a else [], 0.0, 0.0
+        while pending:
+            left, right = pending.pop()
+            values, exact = sample(nodes * (right - left), left), sample(checks * (right - left), left)
+            fit = np.polynomial.Polynomial.fit(nodes * (right - left), values, _NUMERIC_FIT_DEGREE).convert().coef
+            deviation = np.abs(np.polynomial.polynomial.polyval(checks * (right - left), fit) - exact).max()
+            scale = max(scale, np.abs(values).max(), np.abs(exact).max())
+            if deviation <= _NUMERIC_TOLERANCE * scale:
+                pieces.append((left, right, fit))
+                residual = max(residual, deviation)
+            elif len(pieces) + len(pending) + 2 > _NUMERIC_MAX_PIECES:
+                raise ValueError("The polynomial fit of the distributed load {0} did not converge within {1} "
+                                 "pieces.".format(load, _NUMERIC_MAX_PIECES))
+            else:
+                middle = (left + right) / 2
+                pending += [(middle, right), (left, middle)]  # the left half is fitted first
+        pieces.sort(key=lambda piece: piece[0])
+
+        # Cumulative integrals: force (S) and moment (M) of the pieces to the left
+        shear_branches, moment_branches = [(0, x < Rational(a))], [(0, x < Rational(a))]
+        force = moment = moment_z = Rational(0)
+        for left, right, fit in pieces:
+            origin, length = Rational(left), Rational(right) - Rational(left)
+            coefficients = [Rational(float(c)) for c in fit]
+            first = [Rational(0)] + [c / (k + 1) for k, c in enumerate(coefficients)]  # vanishing at origin
+            second = [Rational(0)] + [c / (k + 1) for k, c in enumerate(first)]
+            piece_force, piece_moment = (sum(c * length**k for k, c in enumerate(p)) for p in (first, second))
+            shear_branches.append((force + _polynomial(first, origin), x <= origin + length))
+            moment_branches.append((moment + force * (x - origin) + _polynomial(second, origin), x <= origin + length))
+            moment_z += origin * piece_force + length * piece_force - piece_moment
+            moment += force * length + piece_moment
+            force += piece_force
+        end = Rational(b) if b > a else Rational(a)
+        integral = Piecewise(*shear_branches, (force, True))
+        bounds = [pieces[0][0]] + [right for _, right, _ in pieces] if pieces else []
+        if isinstance(load, DistributedLoadH):
+            return _LoadTerms(distributed, -1*integral, None, None, force, 0, 0), bounds, residual
+        moment_term = Piecewise(*moment_branches, (moment + force * (x - end), True))
+        return _LoadTerms(distributed, None, integral, moment_term, 0, force, moment_z), bounds, residual
+
+    def _prefetch_load_terms(self):
+        """Integrates the loads missing from the term cache, within the time budget or on the process pool."""
+        missing = []
+        for load in self._loads:
+            try:
+                if self._term_key(load) not in self._term_cache and load not in missing:
+                    missing.append(load)
+            except TypeError:  # unhashable load, integrated (and never cached) when needed
+                pass
+        if self._time_budget is not None or self._load_time_budget is not None:
+            self._budgeted_load_terms(missing)
+        elif self._executor is not None:
+            # point loads are integrated (quickly) in this process when needed
+            missing = [load for load in missing if isinstance(load, (DistributedLoadH, DistributedLoadV))]
+            if len(missing) > 1:
+                args = ([self._x0] * len(missing), [self._x1] * len(missing), missing)
+                for load, (terms, seconds) in zip(missing, self._executor.map(_integrate_load, *args)):
+                    self._term_cache[self._term_key(load)] = terms
+                    self._integration_log[self._term_key(load)] = IntegrationRecord(load, "symbolic", seconds, 0.0)
+
+    def _budgeted_load_terms(self, loads):
+        """Integrates the distributed loads on `_BudgetWorker` processes (as many at once as
+        `processes`, or one), falling back to `_numeric_load_terms` for those not finished within
+        the time budget."""
+        pending = [load for load in loads if isinstance(load, (DistributedLoadH, DistributedLoadV))]
+        pending.reverse()  # point loads are integrated (quickly) in this process when needed
+        n_workers = self._processes if isinstance(self._processes, int) else 1
+        load_budget = np.inf if self._load_time_budget is None else self._load_time_budget
+        deadline = np.inf if self._time_budget is None else time.perf_counter() + self._time_budget
+        running = {}  # connection: (worker, load, start, deadline of the load)
+        try:
+            while pending or running:
+                while pending and len(running) < n_workers:
+                    load = pending.pop()
+                    start = time.perf_counter()
+                    if min(deadline - start, load_budget) <= 0:
+                        self._store_budgeted_terms(load, None, start)
+                        continue
+                    worker = _BudgetWorker.acquire()
+                    deadline += time.perf_counter() - start  # the start-up of a worker is not charged
+                    start = time.perf_counter()
+                    worker.connection.send((self._x0, self._x1, load))
+                    running[worker.connection] = (worker, load, start, min(deadline, start + load_budget))
+                if not running:
+                    continue
+                timeout = min(load_deadline for _, _, _, load_deadline in running.values()) - time.perf_counter()
+                ready = multiprocessing.connection.wait(list(running), None if timeout == np.inf else max(timeout, 0))
+                for connection in list(running):
+                    worker, load, start, load_deadline = running[connection]
+                    if connection in ready:
+                        del running[connection]
+                        try:
+                            success, result = connection.recv()
+                        except EOFError:  # the worker died without sending anything
+                            worker.terminate()
+                            success, result = True, None
+                        else:
+                            worker.release()
+                        if not success:
+                            raise result
+                        self._store_budgeted_terms(load, result, start)
+                    elif time.perf_counter() >= load_deadline:
+                        del running[connection]
+                        worker.terminate()  # so that no abandoned work keeps running in the background
+                        self._store_budgeted_terms(load, None, start)
+        finally:
+            for worker, _, _, _ in running.values():
+                worker.terminate()
+
+    def _store_budgeted_terms(self, load, terms, start):
+        """Caches the symbolic terms of a load, or its numeric terms if they are None."""
+        key, method, residual = self._term_key(load), "symbolic", 0.0
+        if terms is None:
+            terms, bounds, residual = self._numeric_load_terms(load)
+            method = "numeric"
+            self._numeric_breakpoints[key] = bounds
+        self._term_cache[key] = terms
+        self._integration_log[key] = IntegrationRecord(load, method, time.perf_counter() - start, residual)
+
+    def _definition_key(self):
+        """Hashable description of the beam (span, supports and loads), with normalized values."""
+        return (_normalized((self._x0, self._x1)),
+                tuple((type(s).__name__, _normalized(s.coord)) for s in self.supports),
+                tuple((type(f).__name__, _normalized(tuple(f))) for f in self._loads))
+
+    def _term_key(self, load):
+        """Key of a load in the term cache. The terms also depend on the beam ends."""
+        return (_normalized((self._x0, self._x1)), type(load).__name__, _normalized(tuple(load)))
+
+    def _is_statically_determinate(self):
+        return not self._supports and None not in (self._pinned_support, self._rolling_support)
+
+    def _solve_support_reactions(self):
+        """Reactions (F_x, F_y, clockwise torque) at each of the beam supports."""
+        if self._is_statically_determinate():
+            f_ax, f_ay, f_by = self._determinate_reactions()
+            return [(f_ax + 0.0, f_ay + 0.0, 0.0), (0.0, f_by + 0.0, 0.0)]
+        solver = solver_for_layout(self._x0, self._x1, self.supports)
+        distributed = [self._summed_polynomial("load", loads)
+                       for loads in (self._distributed_loads_x(), self._distributed_loads_y())]
+        reactions = solver.solve(
+            point_loads_x=([f.force for f in self._point_loads_x()], [f.coord for f in self._point_loads_x()]),
+            point_loads_y=([f.force for f in self._point_loads_y()], [f.coord for f in self._point_loads_y()]),
+            point_torques=([f.torque for f in self._point_torques()], [f.coord for f in self._point_torques()]),
+            distributed_x=distributed[0], distributed_y=distributed[1])
+        return [tuple(float(r) for r in reaction) for reaction in reactions]
+
+    def _reaction_loads(self):
+        """The support reactions, expressed as point loads acting on the beam."""
+        loads = []
+        for support, (f_x, f_y, torque) in zip(self.supports, self._support_reactions):
+            if isinstance(support, (PinnedSupport, FixedSupport)):
+                loads.append(PointLoadH(f_x, support.coord))
+            loads.append(PointLoadV(f_y, support.coord))
+            if isinstance(support, FixedSupport):
+                loads.append(PointTorque(torque, support.coord))
+        return loads
+
+    def _get_breakpoints(self):
+        """Sorted x-coordinates where any load, support or beam end is located.
+
+        Between two consecutive breakpoints every diagram of the beam is a
+        single smooth expression.
+        """
+        coords = {self._x0, self._x1}
+        coords.update(support.coord for support in self.supports)
+        for load in self._loads:
+            coords.update(self._load_coords(load))
+        return sorted(c for c in coords if self._x0 <= c <= self._x1)
+
+    def _load_coords(self, load):
+        """x-coordinates where the contribution of a single load to the diagrams is not smooth."""
+        if isinstance(load, (DistributedLoadH, DistributedLoadV)):
+            return list(load.span) + list(self._numeric_breakpoints.get(self._term_key(load), ()))
+        return [load.coord]
+
+    def _load_segments(self, load, name: str, terms: _LoadTerms = None):
+        """
+        Split the contribution of a single load to a diagram into one expression per interval.
+
+        :param load: load (or support reaction) acting on the beam.
+        :param name: diagram, as in `get_evaluator`.
+        :param terms: terms of the load, as returned by `_load_terms`. When they
+        are not provided, the result is cached and shared with the variants of
+        the beam, as the terms themselves.
+        :return: None if the load does not contribute to the diagram. Otherwise,
+        a tuple (bounds, pieces), where bounds is the sorted array of the beam
+        ends and load coordinates within the beam, and pieces is a list with one
+        simplified expression (free of Piecewise, Min and Max, and with the sign
+        convention of the diagram) for each interval between consecutive bounds.
+        """
+        cache = terms is None
+        if cache:
+            key = (self._term_key(load), name)
+            if key in self._segment_cache:
+                return self._segment_cache[key]
+            terms = self._load_terms(load)
+        term = getattr(terms, _TERM_FIELDS[name])
+        segments = None
+        if term is not None:
+            bounds = sorted({self._x0, self._x1}.union(c for c in self._load_coords(load) if self._x0 < c < self._x1))
+            sign = -1 if name in ("shear", "moment") else 1
+            segments = (np.array(bounds, dtype=float),
+                        [(sign * _active_expression(term, Rational(a + b) / 2)).expand()
+                         for a, b in zip(bounds[:-1], bounds[1:])])
+        if cache:
+            self._segment_cache[key] = segments
+        return segments
+
+    def _summed_segments(self, name: str, loads, reactions=()):
+        """
+        Sum the contributions of several loads to a diagram, as split by `_load_segments`.
+
+        :param name: diagram, as in `get_evaluator`.
+        :param loads: loads whose contributions are cached.
+        :param reactions: (load, terms) pairs of the support reactions, which
+        are not cached.
+        :return: list with one expression for each interval between
+        consecutive breakpoints of the beam.
+        """
+        contributions = [self._load_segments(f, name) for f in loads]
+        contributions += [self._load_segments(f, name, terms) for f, terms in reactions]
+        contributions = [c for c in contributions if c is not None]
+        if any(self._term_key(f) in self._numeric_breakpoints for f in loads):
+            # Numeric terms are high-degree polynomials with exact coefficients: adding floats (e.g. the
+            # reactions) to them would round their expanded coefficients, and lose accuracy far from x=0
+            contributions = [(own_bounds, [p.xreplace({f: Rational(f) for f in p.atoms(Float)}) for p in pieces])
+                             for own_bounds, pieces in contributions]
+        bounds = self._breakpoints
+        segments = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            mid = (a + b) / 2
+            segments.append(Add(*[pieces[np.searchsorted(own_bounds, mid) - 1] for own_bounds, pieces in contributions]))
+        return segments
+
+    def _load_polynomial(self, load, name: str, terms: _LoadTerms = None):
+        """
+        Numerical form of `_load_segments`, cached in the same way.
 
-        f_ax, f_ay, f_by = self.get_reaction_forces()
-        pinned_support_load_x = PointLoadH(f_ax, self._pinned_support)
-        pinned_support_load_y = PointLoadV(f_ay, self._pinned_support)
-        rolling_support_load = PointLoadV(f_by, self._rolling_support)
+        :return: None if the load does not contribute to the diagram, or a
+        `PiecewisePolynomial` over the bounds of the load otherwise.
+        """
+        cache = terms is None
+        if cache:
+            key = (self._term_key(load), name)
+            if key in self._polynomial_cache:
+                return self._polynomial_cache[key]
+        segments = self._load_segments(load, name, terms)
+        polynomial = None if segments is None else PiecewisePolynomial.from_segments(*segments)
+        if cache:
+            self._polynomial_cache[key] = polynomial
+        return polynomial
+
+    def _summed_polynomial(self, name: str, loads, reactions=()):
+        """
+        Numerical counterpart of `_summed_segments`, used for the evaluators.
 
-        self._normal_forces = [-1*integrate(load, (x, x0, x)) for load in self._distributed_forces_x]
-        self._normal_forces.extend(-1*self._effort_from_pointload(f) for f in self._point_loads_x())
-        self._normal_forces.append(-1*self._effort_from_pointload(pinned_support_load_x))
+        The coefficients of every contribution (see `_load_polynomial`) are
+        re-expanded around the breakpoints of the beam and added with numpy.
+        Only the intervals where a contribution is not a polynomial are summed
+        symbolically.
 
-        self._shear_forces = [integrate(load, (x, x0, x)) for load in self._distributed_forces_y]
-        self._shear_forces.extend(self._effort_from_pointload(f) for f in self._point_loads_y())
-        self._shear_forces.append(self._effort_from_pointload(pinned_support_load_y))
-        self._shear_forces.append(self._effort_from_pointload(rolling_support_load))
+        :return: `PiecewisePolynomial` over the breakpoints of the beam.
+        """
+        contributions = [self._load_polynomial(f, name) for f in loads]
+        contributions += [self._load_polynomial(f, name, terms) for f, terms in reactions]
+        contributions = [c for c in contributions if c is not None]
+        breakpoints = np.array(self._breakpoints, dtype=float)
+        lefts, middles = breakpoints[:-1], (breakpoints[:-1] + breakpoints[1:]) / 2
+        degree = max([c.coefficients.shape[1] - 1 for c in contributions], default=0)
+        coefficients = np.zeros((len(lefts), degree + 1))
+        expressions = {}
+        for contribution in contributions:
+            index = contribution.segment_index(middles)
+            coefficients += _shifted(contribution.coefficients[index], lefts - contribution.breakpoints[index], degree)
+            for i in np.flatnonzero(np.isin(index, list(contribution.expressions))):
+                expressions.setdefault(i, []).append(contribution.expressions[index[i]])
+        for i, terms in expressions.items():
+            expressions[i] = Add(*terms, _polynomial(coefficients[i][::-1].tolist(), Rational(lefts[i])))
+            coefficients[i] = 0
+        return PiecewisePolynomial(breakpoints, coefficients, expressions)
+
+    def _consolidate(self, segments):
+        """
+        Create a single flat sympy.Piecewise out of per-interval expressions.
 
-        self._bending_moments = [integrate(load, (x, x0, x)) for load in self._shear_forces]
-        self._bending_moments.extend(self._effort_from_pointload(f) for f in self._point_torques())
+        :param segments: list of expressions, as returned by `_summed_segments`.
+        :return: sympy.Piecewise object, right-continuous at every breakpoint.
+        """
+        bounds = self._breakpoints[1:-1]
+        return Piecewise(*[(expr, x < b) for expr, b in zip(segments, bounds)], (segments[-1], True))
 
     def _create_distributed_force(self, load: DistributedLoadH or DistributedLoadV, shift: bool=True):
         """
@@ -518,3 +1663,126 @@ class Beam:
         for f in self._loads:
             if isinstance(f, PointTorque):
                 yield f
+
+
+def _normalized(value):
+    """Canonical hashable form of a load field: sequences become tuples, and numbers become floats.
+
+    Equal loads written differently (e.g. ``PointLoadV(-20, 3)`` and
+    ``PointLoadV(-20.0, 3.0)``, or spans given as lists or tuples) then have
+    equal normalized forms.
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_normalized(v) for v in value)
+    value = sympify(value)
+    return float(value) if value.is_number else value
+
+
+def _polynomial(coefficients, origin):
+    """Expanded sympy polynomial sum(c_k * (x - origin)**k), from the coefficients in increasing order."""
+    return Poly(coefficients[::-1], x).shift(-origin).as_expr()
+
+
+def _shifted(coefficients, delta, degree: int):
+    """Coefficients of p(t + delta) for every row p of coefficients (highest power first, as in
+    `PiecewisePolynomial`), padded to the given degree."""
+    result = np.zeros((len(coefficients), degree + 1))
+    result[:, degree + 1 - coefficients.shape[1]:] = coefficients
+    for i in range(degree):  # Taylor shift by repeated synthetic division
+        for j in range(1, degree + 1 - i):
+            result[:, j] += delta * result[:, j - 1]
+    return result
+
+
+def _integrate_load(x0, x1, load):
+    """Symbolic terms of a single load and the time spent on them, computed in a worker process."""
+    start = time.perf_counter()
+    beam = Beam(x1 - x0)
+    beam._x0, beam._x1 = x0, x1
+    return beam._load_terms(load, cache=False), time.perf_counter() - start
+
+
+def _budget_worker_loop(connection):
+    """Entry point of a `_BudgetWorker` process: integrates loads until told to exit."""
+    connection.send("ready")  # this module (and sympy) is imported by now
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:  # the parent process is gone
+            break
+        if task is None:
+            break
+        try:
+            connection.send((True, _integrate_load(*task)[0]))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class _BudgetWorker:
+    """Long-lived worker process integrating loads under a time budget.
+
+    Workers are started with the `_BUDGET_START_METHOD` context and kept in
+    `_idle_budget_workers` between loads (and between beams), so that their
+    start-up is only paid once, and never charged to the budget of a load. A
+    worker is only terminated (and later replaced) when a load runs out of
+    time.
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context(_BUDGET_START_METHOD)
+        self.start_method = context.get_start_method()
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_budget_worker_loop, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        if self.connection.recv() != "ready":
+            raise RuntimeError("Unexpected message from a budget worker process.")
+
+    @classmethod
+    def acquire(cls):
+        """An idle worker of the current start method, or a new one once it is ready."""
+        method = multiprocessing.get_context(_BUDGET_START_METHOD).get_start_method()
+        idle = _idle_budget_workers.setdefault(method, [])
+        while idle:
+            worker = idle.pop()
+            if worker.process.is_alive():
+                return worker
+        return cls()
+
+    def release(self):
+        """Returns the worker to the idle pool."""
+        _idle_budget_workers.setdefault(self.start_method, []).append(self)
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class _LazyProcessPool:
+    """Process pool of a beam, started on first use and shared with its variants.
+
+    The pool is shut down (without waiting) once the beam and all its variants
+    are gone.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.pool = None
+
+    def map(self, fn, *iterables):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.processes)
+        return self.pool.map(fn, *iterables)
+
+    def __getstate__(self):
+        return {"processes": self.processes, "pool": None}
+
+    def __del__(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+
+
+_BUDGET_START_METHOD = None  # start method of the budget workers (None: the multiprocessing default)
+_idle_budget_workers = {}  # idle `_BudgetWorker` objects, by start method
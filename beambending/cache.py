@@ -0,0 +1,196 @@
+"""Persistent, size-bounded on-disk cache of solved beams.
+
+A SolutionCache stores the reactions and the flat per-segment representation
+of every solved beam in its own ``.npz`` file, named after a canonical hash of
+the beam definition (span, supports and normalized loads). Beams created with
+``Beam(span, cache=...)`` look themselves up before doing any symbolic
+integration, so a restarted process answers known beams straight from disk.
+
+Entries are written to a temporary file and atomically renamed, and readers
+treat missing or unreadable entries as cache misses, so several processes can
+share the same directory without locks. When the directory grows beyond
+``max_bytes``, the least recently used entries are evicted.
+
+Example
+-------
+>>> import tempfile
+>>> from beambending import Beam, PointLoadV
+>>> cache = SolutionCache(tempfile.mkdtemp())
+>>> beam = Beam(10, cache=cache)
+>>> beam.add_loads([PointLoadV(-10, 5)])
+>>> warm = Beam(10, cache=cache)
+>>> warm.add_loads([PointLoadV(-10, 5)])
+>>> warm.get_support_reactions() == beam.get_support_reactions()
+True
+
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+import sympy
+from sympy import srepr, sympify
+
+from .beam import _QUANTITIES
+from .evaluator import PiecewisePolynomial
+
+_SUFFIX = ".npz"
+
+
+class SolutionCache:
+    """
+    Directory of solved beams, shared by all the processes that open it.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where the entries are stored. It is created if needed.
+    max_bytes : int
+        Approximate upper bound for the total size of the entries. The default
+        value is 256 MiB.
+
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(beam):
+        """Canonical hash of the definition (span, supports and loads) of a beam."""
+        (x0, x1), supports, loads = beam._definition_key()
+        canonical = [[_canonical(x0), _canonical(x1)],
+                     [[name, _canonical(coord)] for name, coord in supports],
+                     [[name, [_canonical(v) for v in values]] for name, values in loads]]
+        return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+
+    def get(self, key: str):
+        """Returns the cached (reactions, evaluators) of a beam, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                reactions = [tuple(r) for r in data["reactions"].tolist()]
+                evaluators = {}
+                for name in _QUANTITIES:
+                    expressions = json.loads(str(data[name + "_expressions"]))
+                    evaluators[name] = PiecewisePolynomial(
+                        data["breakpoints"], data[name + "_coefficients"],
+                        {int(i): _from_srepr(expr) for i, expr in expressions.items()})
+            os.utime(path)  # mark as recently used
+        except Exception:  # missing, partially written or tampered entry
+            return None
+        return reactions, evaluators
+
+    def put(self, key: str, reactions, evaluators):
+        """Stores the reactions and evaluators of a solved beam, then evicts old entries if needed."""
+        arrays = {"reactions": np.array(reactions, dtype=float).reshape(-1, 3),
+                  "breakpoints": evaluators["moment"].breakpoints}
+        for name in _QUANTITIES:
+            arrays[name + "_coefficients"] = evaluators[name].coefficients
+            arrays[name + "_expressions"] = np.array(json.dumps(
+                {str(i): srepr(expr) for i, expr in evaluators[name].expressions.items()}))
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        for entry in self._entries():
+            _remove(entry.path)
+
+    def _entries(self):
+        return [e for e in os.scandir(self.directory) if e.name.endswith(_SUFFIX)]
+
+    def _evict(self):
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+
+def _canonical(value):
+    """JSON-compatible canonical form of a number, expression or sequence of them."""
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    value = sympify(value)
+    if value.is_number:
+        return repr(float(value))
+    return srepr(value)
+
+
+_LITERAL_CONSTRUCTORS = {"Symbol": sympy.Symbol, "Integer": sympy.Integer, "Float": sympy.Float,
+                         "Rational": sympy.Rational}
+_KEYWORDS = {"Symbol": bool, "Float": int}  # assumptions, and precision
+_OPERATORS = {name: getattr(sympy, name) for name in (
+    "Add", "Mul", "Pow", "exp", "log", "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan", "atan2",
+    "acot", "sinh", "cosh", "tanh", "coth", "asinh", "acosh", "atanh", "Abs", "sign", "Heaviside", "Min", "Max",
+    "floor", "ceiling")}
+_SINGLETONS = {name: getattr(sympy, name) for name in ("pi", "E", "I", "oo", "zoo", "nan", "EulerGamma")}
+
+
+def _from_srepr(text):
+    """Expression from its `srepr`, without evaluating arbitrary code (unlike `sympify`).
+
+    Only numbers and symbols (``Symbol``, ``Integer``, ``Float`` and
+    ``Rational`` with literal arguments), a few constants (such as ``pi``),
+    negations and ``Add``, ``Mul``, ``Pow`` and the elementary functions of
+    those are accepted. String literals are only accepted as the first argument
+    of ``Symbol``, ``Integer`` and ``Float``, as other constructors would parse
+    them with `sympify`. Raises ValueError for anything else, e.g. a tampered
+    entry.
+    """
+    def literal(node, types):
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = literal(node.operand, (int, float))
+            return -value
+        if isinstance(node, ast.Constant) and type(node.value) in types:
+            return node.value
+        raise ValueError("Unexpected literal in a cached expression: {}".format(ast.dump(node)))
+
+    def build(node):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            name = node.func.id
+            if name in _LITERAL_CONSTRUCTORS:
+                args = [literal(arg, (str, int, float) if i == 0 and name != "Rational" else (int,))
+                        for i, arg in enumerate(node.args)]
+                if any(kw.arg is None or _KEYWORDS.get(name) is None for kw in node.keywords):
+                    raise ValueError("Unexpected keyword in a cached expression: {}".format(ast.dump(node)))
+                kwargs = {kw.arg: literal(kw.value, (_KEYWORDS[name],)) for kw in node.keywords}
+                return _LITERAL_CONSTRUCTORS[name](*args, **kwargs)
+            if name in _OPERATORS and not node.keywords:
+                return _OPERATORS[name](*(build(arg) for arg in node.args))
+        elif isinstance(node, ast.Name) and node.id in _SINGLETONS:
+            return _SINGLETONS[node.id]
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Name):
+            return -build(node.operand)
+        raise ValueError("Unexpected element in a cached expression: {}".format(ast.dump(node)))
+    return build(ast.parse(text, mode="eval").body)
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:  # already evicted by another process
+        pass
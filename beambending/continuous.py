@@ -0,0 +1,359 @@
+"""Stiffness-method solver for beams resting on an arbitrary set of supports.
+
+The beam is split into Euler-Bernoulli elements between consecutive nodes (the
+beam ends and the supports). Loads anywhere along an element enter the system
+through their consistent (work-equivalent) nodal loads, so the node layout,
+and therefore the stiffness matrix, depends only on the supports. The
+banded stiffness matrix is factorized once per support layout and the
+factorization is reused for every load case.
+
+A constant bending stiffness EI (and axial stiffness EA) is assumed. The
+reaction forces of a beam with uniform cross-section do not depend on their
+actual values, so unit stiffnesses are used throughout.
+
+Example
+-------
+>>> from beambending import FixedSupport, PinnedSupport, RollingSupport
+>>> solver = solver_for_layout(0, 10, (PinnedSupport(0), RollingSupport(5), RollingSupport(10)))
+>>> reactions = solver.solve(point_loads_y=([-16], [2.5]))
+>>> reactions[:, 1].round(6).tolist()
+[6.5, 11.0, -1.5]
+
+"""
+
+from functools import lru_cache
+import numpy as np
+
+_GAUSS_POINTS, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(8)
+_QUADRATURE_TOLERANCE = 1e-13  # relative to the largest element load
+_MAX_BISECTIONS = 40
+
+
+def solver_for_layout(x0, x1, supports):
+    """Returns the (cached) solver for a beam span and support layout.
+
+    Parameters
+    ----------
+    x0, x1 : float
+        x-coordinates of the beam ends.
+    supports : iterable
+        PinnedSupport, RollingSupport and FixedSupport objects.
+
+    Returns
+    -------
+    ContinuousBeamSolver
+        Solver object, shared by all beams with the same span and supports.
+
+    """
+    key = tuple((type(s).__name__, float(s.coord)) for s in supports)
+    return _cached_solver(float(x0), float(x1), key)
+
+
+@lru_cache(maxsize=256)
+def _cached_solver(x0, x1, support_key):
+    return ContinuousBeamSolver(x0, x1, support_key)
+
+
+class ContinuousBeamSolver:
+    """
+    Factorized stiffness system of a beam on a given set of supports.
+
+    Parameters
+    ----------
+    x0, x1 : float
+        x-coordinates of the beam ends.
+    support_key : tuple
+        Tuple of (support type name, coordinate) pairs, where the type name
+        is one of 'PinnedSupport', 'RollingSupport' or 'FixedSupport'.
+
+    """
+
+    # Displacement components restrained by each support type: (u, v, theta)
+    RESTRAINTS = {"PinnedSupport": (True, True, False),
+                  "RollingSupport": (False, True, False),
+                  "FixedSupport": (True, True, True)}
+
+    def __init__(self, x0, x1, support_key):
+        self.support_key = support_key
+        self.nodes = np.array(sorted({x0, x1, *(coord for _, coord in support_key)}))
+        self.lengths = np.diff(self.nodes)
+        n_nodes = len(self.nodes)
+
+        restrained = np.zeros((n_nodes, 3), dtype=bool)
+        for name, coord in support_key:
+            restrained[np.searchsorted(self.nodes, coord)] |= self.RESTRAINTS[name]
+        # Bending DOFs are numbered (v_0, theta_0, v_1, theta_1, ...), axial ones (u_0, u_1, ...)
+        self._free_bending = np.flatnonzero(~restrained[:, 1:].ravel())
+        self._free_axial = np.flatnonzero(~restrained[:, 0])
+
+        # Stiffness matrices in lower band storage (see `_free_band`), assembled element by element
+        elements = np.arange(len(self.lengths))
+        k_element = _bending_stiffness(self.lengths)
+        k_bending = np.zeros((4, 2 * n_nodes))
+        for row in range(4):
+            for col in range(row + 1):
+                k_bending[row - col, 2 * elements + col] += k_element[:, row, col]
+        k_axial = np.zeros((2, n_nodes))
+        k_axial[0, :-1] += 1 / self.lengths
+        k_axial[0, 1:] += 1 / self.lengths
+        k_axial[1, :-1] = -1 / self.lengths
+        self._k_bending, self._k_axial = k_bending, k_axial
+        try:
+            self._chol_bending = _cholesky_banded(_free_band(k_bending, self._free_bending))
+            self._chol_axial = _cholesky_banded(_free_band(k_axial, self._free_axial))
+        except np.linalg.LinAlgError:
+            raise ValueError("The supports do not prevent the beam from moving as a rigid body.")
+
+    def solve(self, point_loads_x=((), ()), point_loads_y=((), ()), point_torques=((), ()),
+              distributed_x=None, distributed_y=None):
+        """Computes the reactions at every support for one or several load cases.
+
+        Parameters
+        ----------
+        point_loads_x, point_loads_y : (array-like, array-like)
+            Forces and x-coordinates of the horizontal and vertical point loads.
+            The forces may be 2-D arrays of shape (n_loads, n_cases) to solve
+            several load cases with the same load positions at once.
+        point_torques : (array-like, array-like)
+            Clockwise torques and x-coordinates of the point torques.
+        distributed_x, distributed_y : callable, optional
+            Vectorized functions returning the horizontal and vertical
+            distributed loads at the given x-coordinates. They must be smooth
+            between consecutive breakpoints, which are read from their
+            ``breakpoints`` attribute when available.
+
+        Returns
+        -------
+        reactions : numpy.ndarray
+            Array of shape (n_supports, 3) (or (n_supports, 3, n_cases)) with
+            the horizontal force, vertical force and clockwise torque acting on
+            the beam at each support, in the order of the support layout.
+
+        """
+        forces, coords = point_torques
+        f_axial = [self._point_vector(*point_loads_x, _axial_shape_functions, 1)]
+        f_bending = [self._point_vector(*point_loads_y, _hermite_shape_functions, 2),
+                     self._point_vector(-np.asarray(forces, dtype=float), coords, _hermite_shape_derivatives, 2)]
+        if distributed_x is not None:
+            f_axial.append(self._distributed_vector(distributed_x, _axial_shape_functions, 1))
+        if distributed_y is not None:
+            f_bending.append(self._distributed_vector(distributed_y, _hermite_shape_functions, 2))
+        return self._reactions(_sum_load_vectors(f_axial), _sum_load_vectors(f_bending))
+
+    def unit_reactions(self, coords, direction: str = "y"):
+        """Reactions caused by unit point loads placed at each of the given x-coordinates.
+
+        Every coordinate is solved as a separate load case, so this evaluates
+        the influence lines of all the support reactions at once.
+
+        Parameters
+        ----------
+        coords : array-like
+            x-coordinates of the unit loads.
+        direction : {'x', 'y', 'torque'}
+            Unit horizontal force, unit vertical force or unit clockwise torque.
+
+        Returns
+        -------
+        reactions : numpy.ndarray
+            Array of shape (n_supports, 3, len(coords)), see `solve`.
+
+        """
+        coords = np.atleast_1d(np.asarray(coords, dtype=float))
+        f_axial = np.zeros((len(self.nodes), len(coords)))
+        f_bending = np.zeros((2 * len(self.nodes), len(coords)))
+        if direction == "x":
+            f_axial = self._point_matrix(coords, _axial_shape_functions, 1)
+        elif direction == "y":
+            f_bending = self._point_matrix(coords, _hermite_shape_functions, 2)
+        elif direction == "torque":
+            f_bending = -self._point_matrix(coords, _hermite_shape_derivatives, 2)
+        else:
+            raise ValueError("Unknown direction '{}'. Use 'x', 'y' or 'torque'.".format(direction))
+        return self._reactions(f_axial, f_bending)
+
+    def _reactions(self, f_axial, f_bending):
+        """Support reactions for the given nodal load vectors (one column per load case)."""
+        n_nodes = len(self.nodes)
+        d_axial = np.zeros_like(f_axial)
+        d_axial[self._free_axial] = _solve_banded(self._chol_axial, f_axial[self._free_axial])
+        d_bending = np.zeros_like(f_bending)
+        d_bending[self._free_bending] = _solve_banded(self._chol_bending, f_bending[self._free_bending])
+
+        r_axial = _banded_matvec(self._k_axial, d_axial) - f_axial
+        r_bending = (_banded_matvec(self._k_bending, d_bending) - f_bending).reshape((n_nodes, 2) + f_bending.shape[1:])
+        components = [r_axial, r_bending[:, 0], -r_bending[:, 1]]
+        if any(c.ndim > 1 for c in components):
+            components = np.broadcast_arrays(*(c if c.ndim > 1 else c[:, None] for c in components))
+        node_reactions = np.stack(components, axis=1)
+
+        reactions = np.zeros((len(self.support_key),) + node_reactions.shape[1:])
+        assigned = np.zeros((n_nodes, 3), dtype=bool)
+        for i, (name, coord) in enumerate(self.support_key):
+            node = np.searchsorted(self.nodes, coord)
+            mask = np.array(self.RESTRAINTS[name]) & ~assigned[node]
+            reactions[i][mask] = node_reactions[node][mask]
+            assigned[node] |= mask
+        return reactions
+
+    def _point_vector(self, forces, coords, shape_functions, dofs_per_node):
+        """Consistent nodal load vector of a set of point loads."""
+        forces = np.asarray(forces, dtype=float)
+        coords = np.asarray(coords, dtype=float)
+        n_cases = forces.shape[1:]
+        vector = np.zeros((dofs_per_node * len(self.nodes),) + n_cases)
+        if coords.size == 0:
+            return vector
+        element = np.clip(np.searchsorted(self.nodes, coords, side="right") - 1, 0, len(self.lengths) - 1)
+        length = self.lengths[element]
+        values = shape_functions((coords - self.nodes[element]) / length, length)
+        dofs = dofs_per_node * element[:, None] + np.arange(values.shape[1])
+        np.add.at(vector, dofs.ravel(), (values[..., None] * forces.reshape(forces.shape[:1] + (1, -1))
+                                         ).reshape((-1,) + n_cases))
+        return vector
+
+    def _point_matrix(self, coords, shape_functions, dofs_per_node):
+        """Consistent nodal load vectors of unit point loads, one column per coordinate."""
+        element = np.clip(np.searchsorted(self.nodes, coords, side="right") - 1, 0, len(self.lengths) - 1)
+        length = self.lengths[element]
+        values = shape_functions((coords - self.nodes[element]) / length, length)
+        dofs = dofs_per_node * element[:, None] + np.arange(values.shape[1])
+        matrix = np.zeros((dofs_per_node * len(self.nodes), len(coords)))
+        matrix[dofs, np.arange(len(coords))[:, None]] = values
+        return matrix
+
+    def _distributed_vector(self, load, shape_functions, dofs_per_node):
+        """Consistent nodal load vector of a distributed load, by Gauss quadrature.
+
+        Polynomial intervals of a `PiecewisePolynomial` load are integrated
+        exactly by a rule of sufficient order. Any other interval is bisected
+        until the rule converges.
+        """
+        bounds = np.union1d(self.nodes, getattr(load, "breakpoints", self.nodes))
+        bounds = bounds[(bounds >= self.nodes[0]) & (bounds <= self.nodes[-1])]
+        a, b = bounds[:-1], bounds[1:]
+        vector = np.zeros(dofs_per_node * len(self.nodes))
+        if hasattr(load, "expressions"):
+            degree = load.coefficients.shape[1] - 1
+            smooth = ~np.isin(load.segment_index((a + b) / 2), list(load.expressions))
+            points, weights = np.polynomial.legendre.leggauss(max(len(_GAUSS_POINTS), (degree + 5) // 2))
+            self._add_element_loads(vector, self._gauss_loads(load, a[smooth], b[smooth], points, weights,
+                                                              shape_functions), dofs_per_node)
+            a, b = a[~smooth], b[~smooth]
+
+        coarse = self._gauss_loads(load, a, b, _GAUSS_POINTS, _GAUSS_WEIGHTS, shape_functions)
+        scale = np.abs(coarse[1]).max(initial=0.0)
+        for _ in range(_MAX_BISECTIONS):
+            if not len(a):
+                return vector
+            m = (a + b) / 2
+            (element, left), (_, right) = (self._gauss_loads(load, lo, hi, _GAUSS_POINTS, _GAUSS_WEIGHTS,
+                                                             shape_functions) for lo, hi in ((a, m), (m, b)))
+            fine = left + right
+            done = np.abs(fine - coarse[1]).max(axis=1) <= _QUADRATURE_TOLERANCE * max(scale, 1e-300)
+            self._add_element_loads(vector, (element[done], fine[done]), dofs_per_node)
+            a, b = np.concatenate([a[~done], m[~done]]), np.concatenate([m[~done], b[~done]])
+            coarse = (np.concatenate([element[~done]] * 2), np.concatenate([left[~done], right[~done]]))
+        raise ValueError("The quadrature of a distributed load does not converge (is it singular?).")
+
+    def _gauss_loads(self, load, a, b, points, weights, shape_functions):
+        """Element index and consistent element load vector of the load over each interval [a, b]
+        (lying within a single element), by Gauss quadrature."""
+        element = np.clip(np.searchsorted(self.nodes, (a + b) / 2, side="right") - 1, 0, len(self.lengths) - 1)
+        x_gauss = ((a + b) / 2)[:, None] + ((b - a) / 2)[:, None] * points
+        length = self.lengths[element][:, None]
+        values = shape_functions((x_gauss - self.nodes[element][:, None]) / length, length)
+        q = np.asarray(load(x_gauss), dtype=float) * ((b - a) / 2)[:, None] * weights
+        return element, np.einsum("ip,ipk->ik", q, values)
+
+    @staticmethod
+    def _add_element_loads(vector, element_loads, dofs_per_node):
+        element, values = element_loads
+        np.add.at(vector, dofs_per_node * element[:, None] + np.arange(values.shape[1]), values)
+
+
+def _sum_load_vectors(vectors):
+    """Sum of load vectors, some of which may hold several load cases as columns."""
+    if any(v.ndim > 1 for v in vectors):
+        vectors = [v if v.ndim > 1 else v[:, None] for v in vectors]
+    return sum(vectors)
+
+
+def _bending_stiffness(length):
+    """Element stiffness matrices, of shape (4, 4) (or (len(length), 4, 4))."""
+    length = np.asarray(length, dtype=float)[..., None, None]
+    powers = np.array([[0, 1, 0, 1], [1, 2, 1, 2], [0, 1, 0, 1], [1, 2, 1, 2]])
+    return np.array([[12, 6, -12, 6],
+                     [6, 4, -6, 2],
+                     [-12, -6, 12, -6],
+                     [6, 2, -6, 4]]) * length ** powers / length ** 3
+
+
+def _axial_shape_functions(s, length):
+    return np.stack([1 - s, s], axis=-1)
+
+
+def _hermite_shape_functions(s, length):
+    return np.stack([1 - 3 * s ** 2 + 2 * s ** 3, length * (s - 2 * s ** 2 + s ** 3),
+                     3 * s ** 2 - 2 * s ** 3, length * (s ** 3 - s ** 2)], axis=-1)
+
+
+def _hermite_shape_derivatives(s, length):
+    return np.stack([(6 * s ** 2 - 6 * s) / length, 1 - 4 * s + 3 * s ** 2,
+                     (6 * s - 6 * s ** 2) / length, 3 * s ** 2 - 2 * s], axis=-1)
+
+
+def _free_band(band, free):
+    """Lower band storage of the submatrix of the free DOFs, given the band of the full matrix.
+
+    Lower band storage holds band[k, j] = matrix[j + k, j]. Removing rows and
+    columns does not widen the band.
+    """
+    p, n = band.shape[0] - 1, len(free)
+    sub = np.zeros((p + 1, n))
+    for k in range(min(p + 1, n)):
+        offset = free[k:] - free[:n - k]
+        inside = offset <= p
+        sub[k, :n - k][inside] = band[offset[inside], free[:n - k][inside]]
+    return sub
+
+
+def _banded_matvec(band, vector):
+    """Product of a symmetric matrix in lower band storage with a vector (or one column per case)."""
+    n = band.shape[1]
+    band = band.reshape(band.shape + (1,) * (np.ndim(vector) - 1))
+    result = band[0] * vector
+    for k in range(1, min(len(band), n)):
+        result[k:] += band[k, :n - k] * vector[:-k]
+        result[:-k] += band[k, :n - k] * vector[k:]
+    return result
+
+
+def _cholesky_banded(band):
+    """Cholesky factor of a symmetric positive definite matrix in lower band storage."""
+    p, n = band.shape[0] - 1, band.shape[1]
+    chol = band.copy()
+    for j in range(n):
+        for k in range(max(0, j - p), j):
+            for i in range(j, min(n, k + p + 1)):
+                chol[i - j, j] -= chol[i - k, k] * chol[j - k, k]
+        if chol[0, j] <= 1e-12 * max(1.0, abs(band[0, j])):
+            raise np.linalg.LinAlgError("Matrix is not positive definite.")
+        chol[0, j] = np.sqrt(chol[0, j])
+        chol[1:, j] /= chol[0, j]
+    return chol
+
+
+def _solve_banded(chol, rhs):
+    """Solves L L^T y = rhs, given the banded Cholesky factor L."""
+    p, n = chol.shape[0] - 1, chol.shape[1]
+    y = np.array(rhs, dtype=float)
+    for j in range(n):
+        y[j] /= chol[0, j]
+        for k in range(1, min(p + 1, n - j)):
+            y[j + k] -= chol[k, j] * y[j]
+    for j in reversed(range(n)):
+        for k in range(1, min(p + 1, n - j)):
+            y[j] -= chol[k, j] * y[j + k]
+        y[j] /= chol[0, j]
+    return y
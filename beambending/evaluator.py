@@ -0,0 +1,191 @@
+"""Fast numerical evaluation of the piecewise functions describing a beam.
+
+The normal force, shear force and bending moment diagrams of a Beam are smooth
+between consecutive breakpoints (beam ends, supports and load application
+points). A PiecewisePolynomial stores one coefficient array per interval, so
+evaluating a diagram costs a binary search plus one Horner evaluation per point,
+regardless of how many loads the beam carries.
+
+Example
+-------
+>>> f = PiecewisePolynomial([0, 2, 5], [[1, 0], [-2, 3]])  # 1*t, then -2*t + 3
+>>> f([1, 2, 4]).tolist()
+[1.0, 3.0, -1.0]
+
+"""
+
+import numpy as np
+from sympy import lambdify, Poly, PolynomialError, Rational, sympify
+from sympy.abc import x
+
+
+class PiecewisePolynomial:
+    """
+    Picklable evaluator of a function defined by one expression per interval.
+
+    Each interval ``[breakpoints[i], breakpoints[i+1])`` holds a polynomial in
+    the local coordinate ``t = x - breakpoints[i]``, with coefficients stored
+    highest power first in ``coefficients[i]``. Intervals whose expression is
+    not a polynomial are kept as sympy expressions in ``expressions`` and
+    evaluated through a lambdified function (with common-subexpression
+    elimination), compiled lazily on first use.
+
+    Parameters
+    ----------
+    breakpoints : array-like
+        Sorted interval bounds, including both ends of the beam.
+    coefficients : array-like
+        Array of shape (n_intervals, degree + 1).
+    expressions : dict, optional
+        Mapping from interval index to a sympy expression in ``x`` for the
+        intervals that are not polynomial.
+
+    """
+
+    def __init__(self, breakpoints, coefficients, expressions=None):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.atleast_2d(np.asarray(coefficients, dtype=float))
+        self.expressions = dict(expressions or {})
+        self._compiled = {}
+
+    @classmethod
+    def from_segments(cls, breakpoints, segments):
+        """Build an evaluator out of one sympy expression per interval.
+
+        Parameters
+        ----------
+        breakpoints : list
+            Sorted interval bounds, including both ends of the beam.
+        segments : list
+            Expressions in ``x``, one per interval between breakpoints.
+
+        Returns
+        -------
+        PiecewisePolynomial
+
+        """
+        rows, expressions = [], {}
+        for i, (left, expr) in enumerate(zip(breakpoints, segments)):
+            expr = sympify(expr)
+            try:
+                rows.append([float(c) for c in Poly(expr, x).to_field().shift(Rational(left)).all_coeffs()])
+            except (PolynomialError, TypeError):
+                rows.append([0.0])
+                expressions[i] = expr
+        degree = max(len(row) for row in rows) - 1
+        coefficients = np.zeros((len(rows), degree + 1))
+        for i, row in enumerate(rows):
+            coefficients[i, degree + 1 - len(row):] = row
+        return cls(breakpoints, coefficients, expressions)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_compiled"] = {}
+        return state
+
+    def __call__(self, x_coords, side="right"):
+        """Evaluate the function at the given x-coordinates.
+
+        Parameters
+        ----------
+        x_coords : float or array-like
+            Points where the function is evaluated.
+        side : {'right', 'left'}
+            Which one-sided limit is returned for points lying exactly on an
+            interior breakpoint. The default, 'right', matches the convention
+            of the point loads (the jump is already applied at the load).
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Function values, with the same shape as `x_coords`.
+
+        """
+        scalar = np.ndim(x_coords) == 0
+        x_arr = np.atleast_1d(np.asarray(x_coords, dtype=float))
+        idx = self.segment_index(x_arr, side)
+        t = x_arr - self.breakpoints[idx]
+        y = np.zeros_like(t) + self.coefficients[idx, 0]
+        for k in range(1, self.coefficients.shape[1]):
+            y = y * t + self.coefficients[idx, k]
+        for i, expr in self.expressions.items():
+            mask = idx == i
+            if np.any(mask):
+                y[mask] = self._compiled_expression(i, expr)(x_arr[mask])
+        return float(y[0]) if scalar else y
+
+    def sample(self, n_points: int = 201):
+        """Sample the function on evenly spaced points and at its breakpoints.
+
+        Every interior breakpoint is included twice, first with the left-sided
+        and then with the right-sided limit of the function, so that jumps are
+        represented exactly by a vertical step.
+
+        Parameters
+        ----------
+        n_points : int
+            Number of evenly spaced points between both ends. The default value
+            is 201.
+
+        Returns
+        -------
+        x_vec, y_vec : (numpy.ndarray, numpy.ndarray)
+            Sorted sampling points and the corresponding function values.
+
+        """
+        inner = self.breakpoints[1:-1]
+        x_even = np.linspace(self.breakpoints[0], self.breakpoints[-1], n_points)
+        x_even = x_even[~np.isin(x_even, inner)]
+        x_vec = np.concatenate([x_even, inner, inner])
+        y_vec = np.concatenate([self(x_even), self(inner, side="left"), self(inner, side="right")])
+        order = np.argsort(x_vec, kind="stable")
+        return x_vec[order], y_vec[order]
+
+    def extrema(self):
+        """Exact global maximum and minimum of the function.
+
+        Candidates are the real roots of the derivative of every polynomial
+        interval, together with both one-sided limits at every breakpoint.
+        Non-polynomial intervals are searched on a fine grid instead.
+
+        Returns
+        -------
+        (x_max, y_max), (x_min, y_min) : tuple
+            Location and value of the maximum and of the minimum.
+
+        """
+        x_cand, y_cand = [], []
+        for i, (left, right) in enumerate(zip(self.breakpoints[:-1], self.breakpoints[1:])):
+            if i in self.expressions:
+                x_seg = np.linspace(left, right, 1025)
+            else:
+                roots = np.roots(np.polyder(self.coefficients[i])) if self.coefficients.shape[1] > 2 else []
+                roots = [r.real for r in roots if abs(r.imag) < 1e-12 and 0 < r.real < right - left]
+                x_seg = left + np.array([0.0, right - left] + roots)
+            x_cand.append(x_seg)
+            y_cand.append(self.evaluate_segment(i, x_seg))
+        x_cand, y_cand = np.concatenate(x_cand), np.concatenate(y_cand)
+        i_max, i_min = y_cand.argmax(), y_cand.argmin()
+        return (x_cand[i_max], y_cand[i_max]), (x_cand[i_min], y_cand[i_min])
+
+    def evaluate_segment(self, i: int, x_coords):
+        """Evaluate the expression of interval `i`, also outside of its bounds.
+
+        Evaluating at the bounds of the interval returns the one-sided limits
+        of the function from inside the interval.
+        """
+        x_arr = np.asarray(x_coords, dtype=float)
+        if i in self.expressions:
+            return self._compiled_expression(i, self.expressions[i])(x_arr)
+        return np.polyval(self.coefficients[i], x_arr - self.breakpoints[i])
+
+    def segment_index(self, x_coords, side="right"):
+        """Index of the interval containing each of the given x-coordinates."""
+        idx = np.searchsorted(self.breakpoints[1:-1], x_coords, side=side)
+        return np.asarray(idx)
+
+    def _compiled_expression(self, i, expr):
+        if i not in self._compiled:
+            func = lambdify(x, expr, "numpy", cse=True)
+            self._compiled[i] = lambda x_arr: np.broadcast_to(func(x_arr), x_arr.shape)
+        return self._compiled[i]
@@ -0,0 +1,214 @@
+"""Streaming time-history analysis of moving loads and rainflow cycle counting.
+
+A load history is a sequence of time steps, each with the positions and
+vertical forces of one or several moving point loads (e.g. the wheels of a
+crane). `section_moment_history` reads it in chunks (so memory-mapped arrays
+with ~10^8 steps are fine) and yields the bending moment at the chosen
+sections, computed from the influence lines of the beam. RainflowCounter
+objects count the stress cycles incrementally, chunk by chunk.
+
+Example
+-------
+>>> import numpy as np
+>>> from beambending import Beam
+>>> beam = Beam(10)
+>>> beam.pinned_support, beam.rolling_support = 0, 10
+>>> positions = np.tile([2.5, 5, 7.5, 5], 3)
+>>> counters = rainflow_history(beam, [5], positions, -10 * np.ones(12), range_bins=[0, 10, 20, 30])
+>>> counters[0].counts.tolist()
+[0.0, 5.5, 0.0]
+
+"""
+
+import numpy as np
+
+from .continuous import solver_for_layout
+from .uncertainty import _is_left_of, _lever_arm
+
+
+def moment_influence(beam, sections, positions):
+    """Bending moment at the given sections caused by unit vertical point loads.
+
+    Parameters
+    ----------
+    beam : Beam
+        Beam whose supports are used. Its own loads are ignored.
+    sections : array-like
+        x-coordinates of the sections.
+    positions : array-like
+        x-coordinates of the unit loads (any shape), within the beam span.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape positions.shape + (len(sections),), with the sign
+        convention of `Beam.get_bending_moment` for a PointLoadV(1, position).
+
+    """
+    sections = np.asarray(sections, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    coords = positions.ravel()
+    unit = solver_for_layout(beam._x0, beam._x1, beam.supports).unit_reactions(coords)  # (n_supports, 3, n)
+    support_coords = np.array([float(s.coord) for s in beam.supports])[:, None]
+    influence = -_lever_arm(sections, coords[:, None], "right") \
+        - unit[:, 1].T @ _lever_arm(sections, support_coords, "right") \
+        - unit[:, 2].T @ _is_left_of(sections, support_coords, "right")
+    return influence.reshape(positions.shape + sections.shape)
+
+
+def section_moment_history(beam, sections, positions, forces, chunk_size: int = 2**16):
+    """Generator of the bending moment history at the given sections.
+
+    Parameters
+    ----------
+    beam : Beam
+        Beam with its supports and its permanent loads, which are added to the
+        effect of the moving loads.
+    sections : float or array-like
+        x-coordinate(s) of the sections.
+    positions, forces : array-like
+        Arrays of shape (n_steps,) or (n_steps, n_loads) with the positions and
+        vertical forces (as in PointLoadV) of the moving loads at each time
+        step. Loads outside of the beam span are ignored. They may be numpy
+        memmaps, since only `chunk_size` steps are read at a time.
+    chunk_size : int
+        Number of time steps processed at once. The default value is 65536.
+
+    Yields
+    ------
+    numpy.ndarray
+        Bending moments of shape (n_chunk_steps, len(sections)), or
+        (n_chunk_steps,) for a single section given as a scalar.
+
+    """
+    scalar = np.ndim(sections) == 0
+    sections = np.atleast_1d(np.asarray(sections, dtype=float))
+    permanent = beam.get_bending_moment(sections)
+    for start in range(0, len(positions), chunk_size):
+        chunk_positions = np.asarray(positions[start:start + chunk_size], dtype=float)
+        chunk_forces = np.asarray(forces[start:start + chunk_size], dtype=float)
+        n_steps = len(chunk_positions)
+        chunk_positions = chunk_positions.reshape(n_steps, -1)
+        chunk_forces = np.broadcast_to(chunk_forces.reshape(n_steps, -1), chunk_positions.shape)
+        on_beam = (chunk_positions >= beam._x0) & (chunk_positions <= beam._x1)
+        influence = moment_influence(beam, sections, np.where(on_beam, chunk_positions, beam._x0))
+        moments = permanent + np.einsum("sl,sln->sn", np.where(on_beam, chunk_forces, 0.0), influence)
+        yield moments[:, 0] if scalar else moments
+
+
+def rainflow_history(beam, sections, positions, forces, range_bins, chunk_size: int = 2**16, out=None):
+    """Rainflow counts of the bending moment history at the given sections.
+
+    Parameters
+    ----------
+    beam, sections, positions, forces, chunk_size
+        See `section_moment_history`.
+    range_bins : array-like
+        Edges of the moment-range bins, passed to every RainflowCounter.
+    out : array-like, optional
+        Array of shape (n_steps, len(sections)), or (n_steps,) for a scalar
+        section, e.g. a numpy memmap, where the moment history is also
+        written.
+
+    Returns
+    -------
+    list of RainflowCounter or RainflowCounter
+        One finalized counter per section, or a single one for a scalar
+        section.
+
+    """
+    counters = [RainflowCounter(range_bins) for _ in np.atleast_1d(sections)]
+    start = 0
+    for moments in section_moment_history(beam, sections, positions, forces, chunk_size):
+        if out is not None:
+            out[start:start + len(moments)] = moments
+        start += len(moments)
+        for counter, history in zip(counters, np.reshape(moments, (len(moments), -1)).T):
+            counter.update(history)
+    for counter in counters:
+        counter.finalize()
+    return counters[0] if np.ndim(sections) == 0 else counters
+
+
+class RainflowCounter:
+    """
+    Incremental rainflow cycle counter (ASTM E1049 range counting).
+
+    Turning points are extracted from every chunk with numpy, and only the
+    (short) stack of unclosed reversals is kept between chunks, so arbitrarily
+    long histories can be counted in constant memory. Closed cycles are added
+    to a histogram of ranges.
+
+    Parameters
+    ----------
+    range_bins : array-like
+        Edges of the range bins. Ranges beyond the last edge are counted in
+        the last bin.
+
+    Attributes
+    ----------
+    counts : numpy.ndarray
+        Number of cycles in each range bin (half cycles count as 0.5).
+    max_range : float
+        Largest range counted so far.
+
+    """
+
+    def __init__(self, range_bins):
+        self.range_bins = np.asarray(range_bins, dtype=float)
+        self.counts = np.zeros(len(self.range_bins) - 1)
+        self.max_range = 0.0
+        self._stack = []
+        self._last = None
+        self._direction = 0
+
+    def update(self, values):
+        """Counts the cycles closed by the next chunk of the history."""
+        values = np.asarray(values, dtype=float)
+        if self._last is None:
+            if len(values) == 0:
+                return
+            self._last = float(values[0])
+            self._stack.append(self._last)  # the first point of the history is always a reversal
+            values = values[1:]
+        y = np.concatenate([[self._last], values])
+        y = y[np.concatenate([[True], np.diff(y) != 0])]  # drop plateaus
+        if len(y) < 2:
+            return
+        signs = np.sign(np.diff(y))
+        turning = np.flatnonzero(np.concatenate([[self._direction], signs[:-1]]) * signs < 0)
+        self._count(*self._close_cycles(y[turning].tolist()))
+        self._last, self._direction = float(y[-1]), signs[-1]
+
+    def finalize(self):
+        """Counts the cycles closed by the last point, then the residual reversals as half cycles."""
+        if self._last is not None and self._stack[-1] != self._last:
+            self._count(*self._close_cycles([self._last]))  # the last point may still close cycles
+        self._count(np.abs(np.diff(self._stack)), 0.5)
+        self._stack, self._last, self._direction = [], None, 0
+
+    def _close_cycles(self, reversals):
+        """Pushes reversals onto the stack, returning the ranges and counts of the closed cycles."""
+        stack, ranges, counts = self._stack, [], []
+        for value in reversals:
+            stack.append(value)
+            while len(stack) >= 3:
+                x_range, y_range = abs(stack[-1] - stack[-2]), abs(stack[-2] - stack[-3])
+                if x_range < y_range:
+                    break
+                ranges.append(y_range)
+                if len(stack) == 3:  # Y contains the starting point
+                    counts.append(0.5)
+                    del stack[0]
+                else:
+                    counts.append(1.0)
+                    del stack[-3:-1]
+        return ranges, counts
+
+    def _count(self, ranges, counts):
+        ranges = np.asarray(ranges, dtype=float)
+        if len(ranges) == 0:
+            return
+        index = np.clip(np.searchsorted(self.range_bins, ranges, side="right") - 1, 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, weights=np.broadcast_to(counts, ranges.shape), minlength=len(self.counts))
+        self.max_range = max(self.max_range, ranges.max())
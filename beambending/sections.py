@@ -0,0 +1,236 @@
+"""Vectorized checks of a catalog of cross-sections against solved beams.
+
+The demands of every beam (exact maximum absolute bending moment and shear
+force, and the deflection of the beam with unit bending stiffness EI) are
+computed once per beam. Since the reactions of the beams in this package do not
+depend on the cross-section, the utilization of every profile of a
+SectionCatalog then follows from a few array operations, for a single beam or
+for a whole sweep of beams at once.
+
+Units must be consistent with those of the beam, e.g. for lengths in m and
+forces in kN: section modulus in m^3, shear area in m^2, second moment of area
+in m^4, strengths and elastic modulus in kN/m^2.
+
+Example
+-------
+>>> from beambending import Beam, DistributedLoadV
+>>> beam = Beam(6)
+>>> beam.pinned_support, beam.rolling_support = 0, 6
+>>> beam.add_loads([DistributedLoadV(-10, (0, 6))])
+>>> catalog = SectionCatalog(["small", "medium", "large"], section_modulus=[1e-4, 2e-4, 4e-4],
+...                          shear_area=[1e-3, 2e-3, 3e-3], second_moment=[1e-5, 2e-5, 8e-5],
+...                          bending_strength=235e3, shear_strength=135e3, elastic_modulus=210e6,
+...                          mass=[20, 30, 45])
+>>> [catalog.names[i] for i in catalog.check(beam)]
+['large']
+
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .beam import FixedSupport
+from .evaluator import PiecewisePolynomial
+
+SectionDemands = namedtuple("SectionDemands", "moment, shear, unit_deflection, span")
+SectionDemands.__doc__ = """Maximum absolute bending moment, shear force and deflection (times EI) of beams, and
+the effective span of the region (between adjacent supports, or overhang) where the deflection governs."""
+
+
+class SectionCatalog:
+    """
+    Catalog of cross-section profiles, stored as one array per property.
+
+    Parameters
+    ----------
+    names : sequence of str
+        Profile names.
+    section_modulus : array-like
+        Elastic section modulus W of each profile.
+    shear_area : array-like
+        Shear area A_v of each profile.
+    second_moment : array-like
+        Second moment of area I of each profile.
+    bending_strength, shear_strength : array-like
+        Design bending and shear strengths (one value per profile, or a single
+        value shared by all of them).
+    elastic_modulus : array-like
+        Young's modulus E of the material of each profile.
+    mass : array-like, optional
+        Mass (or any cost) per unit length, used to rank the passing profiles.
+        When not given, profiles are ranked by section modulus.
+
+    """
+
+    def __init__(self, names, section_modulus, shear_area, second_moment, bending_strength, shear_strength,
+                 elastic_modulus, mass=None):
+        self.names = list(names)
+        n_profiles = len(self.names)
+        self.section_modulus, self.shear_area, self.second_moment, self.bending_strength, \
+            self.shear_strength, self.elastic_modulus = (
+                np.broadcast_to(np.asarray(a, dtype=float), (n_profiles,))
+                for a in (section_modulus, shear_area, second_moment, bending_strength, shear_strength,
+                          elastic_modulus))
+        self.mass = self.section_modulus if mass is None else np.broadcast_to(np.asarray(mass, dtype=float),
+                                                                             (n_profiles,))
+
+    def __len__(self):
+        return len(self.names)
+
+    def utilization(self, beams, deflection_ratio: float = 300):
+        """Utilization ratios of every profile for one beam or a sweep of beams.
+
+        Parameters
+        ----------
+        beams : Beam, sequence of Beam or SectionDemands
+            Solved beam(s), or their precomputed `section_demands`.
+        deflection_ratio : float
+            The deflection limit of every region of the beam is its effective
+            span divided by this ratio: the distance between adjacent supports,
+            or twice the length of an overhang (as for a cantilever). The
+            region with the largest deflection relative to its effective span
+            governs. The default value is 300.
+
+        Returns
+        -------
+        dict
+            Arrays of shape (n_profiles,) for a single beam, or (n_beams,
+            n_profiles) for a sweep, with the keys 'bending', 'shear',
+            'deflection' and 'max' (the governing one). A profile passes when
+            its utilization is at most 1.
+
+        """
+        demands = beams if isinstance(beams, SectionDemands) else section_demands(beams)
+        moment, shear, unit_deflection, span = (np.asarray(d, dtype=float)[..., None] for d in demands)
+        ratios = {"bending": moment / (self.section_modulus * self.bending_strength),
+                  "shear": shear / (self.shear_area * self.shear_strength),
+                  "deflection": unit_deflection * deflection_ratio / (span * self.elastic_modulus *
+                                                                      self.second_moment)}
+        ratios["max"] = np.maximum.reduce(list(ratios.values()))
+        return ratios
+
+    def check(self, beams, deflection_ratio: float = 300):
+        """Passing profiles, ranked from the lightest to the heaviest.
+
+        Parameters
+        ----------
+        beams : Beam, sequence of Beam or SectionDemands
+            See `utilization`.
+        deflection_ratio : float
+            See `utilization`.
+
+        Returns
+        -------
+        numpy.ndarray or list
+            Indices of the passing profiles for a single beam, or a list of such
+            arrays (one per beam) for a sweep.
+
+        """
+        passing = self.utilization(beams, deflection_ratio)["max"] <= 1
+        order = np.argsort(self.mass, kind="stable")
+        ranked = [order[row[order]] for row in np.atleast_2d(passing)]
+        return ranked if passing.ndim > 1 else ranked[0]
+
+    def lightest(self, beams, deflection_ratio: float = 300):
+        """Index of the lightest passing profile of every beam (-1 when none passes)."""
+        passing = self.utilization(beams, deflection_ratio)["max"] <= 1
+        masked = np.where(passing, self.mass, np.inf)
+        return np.where(passing.any(axis=-1), masked.argmin(axis=-1), -1)
+
+
+def section_demands(beams):
+    """Exact maximum absolute bending moment, shear force and unit-stiffness deflection.
+
+    The deflection is that of the governing region of the beam, as described
+    in `SectionCatalog.utilization`, and is reported together with the
+    effective span of that region.
+
+    Parameters
+    ----------
+    beams : Beam or sequence of Beam
+        Solved beam(s).
+
+    Returns
+    -------
+    SectionDemands
+        Named tuple of floats for a single beam, or of arrays for a sequence.
+
+    """
+    if not isinstance(beams, (list, tuple)):
+        return SectionDemands(*(float(d[0]) for d in section_demands([beams])))
+    demands = []
+    for beam in beams:
+        peaks = [max(abs(y_max), abs(y_min)) for (_, y_max), (_, y_min) in
+                 (beam.get_evaluator(name).extrema() for name in ("moment", "shear"))]
+        demands.append(peaks + list(_governing_deflection(beam, unit_deflection(beam))))
+    return SectionDemands(*np.array(demands, dtype=float).reshape(-1, 4).T)
+
+
+def _governing_deflection(beam, deflection):
+    """Maximum absolute deflection and effective span of the region where their ratio is largest."""
+    supports = sorted({float(support.coord) for support in beam.supports})
+    x0, x1 = float(beam._x0), float(beam._x1)
+    regions = [(a, b, b - a) for a, b in zip(supports[:-1], supports[1:])]
+    if supports[0] > x0:
+        regions.append((x0, supports[0], 2 * (supports[0] - x0)))
+    if supports[-1] < x1:
+        regions.append((supports[-1], x1, 2 * (x1 - supports[-1])))
+    breakpoints = deflection.breakpoints
+    candidates = []
+    for a, b, span in regions:
+        i0, i1 = np.searchsorted(breakpoints, a), np.searchsorted(breakpoints, b)
+        (_, w_max), (_, w_min) = PiecewisePolynomial(breakpoints[i0:i1 + 1], deflection.coefficients[i0:i1]).extrema()
+        candidates.append((max(abs(w_max), abs(w_min)), span))
+    return max(candidates, key=lambda candidate: candidate[0] / candidate[1])
+
+
+def unit_deflection(beam, fit_degree: int = 10):
+    """Deflection of a beam with unit bending stiffness (EI = 1), upwards positive.
+
+    The bending moment is integrated twice segment by segment, keeping the
+    slope and the deflection continuous, and the two integration constants are
+    fitted to the supports (no deflection at any support, and no rotation at
+    fixed supports). Segments whose moment is not a polynomial are replaced by
+    a least-squares polynomial of degree `fit_degree` first.
+
+    Returns
+    -------
+    `~beambending.evaluator.PiecewisePolynomial`
+
+    """
+    moment = beam.get_evaluator("moment")
+    breakpoints = moment.breakpoints
+    lengths = np.diff(breakpoints)
+    curvatures = []
+    for i, length in enumerate(lengths):
+        if i in moment.expressions:
+            t = length / 2 * (1 - np.cos(np.linspace(0, np.pi, 4 * fit_degree)))
+            coefficients = np.polyfit(t, moment.evaluate_segment(i, breakpoints[i] + t), fit_degree)
+        else:
+            coefficients = moment.coefficients[i]
+        curvatures.append(-coefficients)  # the plotted bending moment is positive when hogging
+    degree = max(len(c) for c in curvatures) + 1
+
+    rows, slope, deflection = [], 0.0, 0.0
+    for curvature, length in zip(curvatures, lengths):
+        theta = np.polyint(curvature, k=slope)
+        w = np.polyint(theta, k=deflection)
+        slope, deflection = np.polyval(theta, length), np.polyval(w, length)
+        rows.append(np.concatenate([np.zeros(degree + 1 - len(w)), w]))
+    particular = PiecewisePolynomial(breakpoints, rows)
+
+    # Rigid body motion c_0 + c_1 (x - x_0) fitted to the boundary conditions
+    matrix, rhs = [], []
+    for support in beam.supports:
+        coord = float(support.coord)
+        matrix.append([1.0, coord - breakpoints[0]])
+        rhs.append(-particular(coord))
+        if isinstance(support, FixedSupport):
+            i = int(particular.segment_index(coord))
+            matrix.append([0.0, 1.0])
+            rhs.append(-np.polyval(np.polyder(particular.coefficients[i]), coord - breakpoints[i]))
+    (c_0, c_1), *_ = np.linalg.lstsq(np.array(matrix), np.array(rhs), rcond=None)
+    coefficients = particular.coefficients.copy()
+    coefficients[:, -1] += c_0 + c_1 * (breakpoints[:-1] - breakpoints[0])
+    coefficients[:, -2] += c_1
+    return PiecewisePolynomial(breakpoints, coefficients)
@@ -0,0 +1,199 @@
+"""Exact sensitivities of a statically determinate beam to its loads and supports.
+
+The reactions of a beam on one pinned and one rolling support solve the 3x3
+equilibrium system of `Beam.get_reaction_forces`, A r = b, where b holds the
+force and moment resultants of the loads and A only depends on the support
+coordinates. Differentiating it gives A dr/dp = db/dp - dA/dp r for every
+parameter p, so all the reaction derivatives come from a single solve with
+one right-hand side per parameter. The section forces are sums of the
+contributions of the loads and of the reactions (acting as point loads), and
+their derivatives follow from those of every contribution. The derivatives of
+the extreme bending moments are those of the bending moment at the location
+of the extremum (envelope theorem), plus the slope of the diagram when the
+extremum sits on a kink that moves with the parameter (a point load, a point
+torque or a support). The integrals of the distributed loads are exact for
+polynomial loads, and computed by Gauss-Legendre quadrature otherwise, so no
+symbolic integration is needed.
+
+Example
+-------
+>>> from beambending import Beam, PointLoadV
+>>> beam = Beam(10)
+>>> beam.pinned_support, beam.rolling_support = 0, 10
+>>> beam.add_loads([PointLoadV(-10, 4)])
+>>> sensitivities = jacobian(beam)
+>>> sensitivities["parameters"]
+[(0, 'force'), (0, 'coord'), ('pinned_support', 'coord'), ('rolling_support', 'coord')]
+>>> sensitivities["reactions"][2].round(6).tolist()  # derivatives of F_By
+[-0.4, 1.0, -0.6, -0.4]
+
+"""
+
+import numpy as np
+from sympy import lambdify, sympify
+from sympy.abc import x
+
+from .beam import DistributedLoadH, DistributedLoadV, PointLoadH, PointLoadV, PointTorque
+from .evaluator import PiecewisePolynomial
+
+_SECTION_QUANTITIES = ("normal", "shear", "moment")
+_QUADRATURE_NODES = 64
+
+
+def jacobian(beam, x_coords=(), side: str = "right"):
+    """Derivatives of the reactions, section forces and extreme bending moments.
+
+    Parameters
+    ----------
+    beam : Beam
+        Solved beam, resting on exactly one pinned and one rolling support.
+    x_coords : array-like, optional
+        x-coordinates of the sections where the derivatives of the normal
+        force, shear force and bending moment are computed.
+    side : {'right', 'left'}
+        At sections lying exactly on a load or support, whether the loads
+        located there are included ('right', as in `Beam.get_evaluator`) or
+        not. The derivatives of the jumps themselves (e.g. of the shear force
+        with respect to the coordinate of a point load located at the
+        section) are not defined, and are not included.
+
+    Returns
+    -------
+    dict
+        With the keys:
+
+        * 'parameters': list of (load index, field) tuples, one per column of
+          the other arrays, where field is 'force' or 'torque' and 'coord'
+          for point loads, and 'scale' (a factor multiplying the expression),
+          'start' and 'end' (the span bounds) for distributed loads. They are
+          followed by ('pinned_support', 'coord') and ('rolling_support',
+          'coord').
+        * 'reactions': array of shape (3, n_parameters), with the derivatives
+          of (F_Ax, F_Ay, F_By), as returned by `Beam.get_reaction_forces`.
+        * 'normal', 'shear', 'moment': arrays of shape (len(x_coords),
+          n_parameters), with the sign conventions of the diagrams.
+        * 'moment_max', 'moment_min': arrays of shape (n_parameters,), with
+          the derivatives of the largest and smallest bending moment.
+
+    Raises
+    ------
+    ValueError
+        If the beam does not rest on exactly one pinned and one rolling
+        support.
+
+    """
+    if not beam._is_statically_determinate():
+        raise ValueError("Sensitivities are only available for beams with exactly one pinned and one rolling "
+                         "support.")
+    x_vec = np.atleast_1d(np.asarray(x_coords, dtype=float))
+    x_a, x_b = float(beam.pinned_support), float(beam.rolling_support)
+    f_ax, f_ay, f_by = beam.get_reaction_forces()
+    parameters, rhs, kink_coords, contributions = _parameters(beam)
+    parameters += [("pinned_support", "coord"), ("rolling_support", "coord")]
+    rhs = np.column_stack(rhs + [(0, 0, f_ay), (0, 0, f_by)])  # d(b)/dp - d(A)/dp r
+    kink_coords = np.array(kink_coords + [x_a, x_b])
+    supports = [lambda x_sec, step: (0, 0, f_ay * step(x_a)), lambda x_sec, step: (0, 0, f_by * step(x_b))]
+    contributions += supports
+
+    matrix = np.array([[-1, 0, 0], [0, -1, -1], [0, -x_a, -x_b]], dtype=float)
+    reactions = np.linalg.solve(matrix, rhs)
+
+    def sections(x_sec, side):
+        """Derivatives of (N, V, M) at the sections, of shape (3, len(x_sec), n_parameters)."""
+        def step(coord):
+            return (x_sec >= coord if side == "right" else x_sec > coord).astype(float)
+        zeros = np.zeros_like(x_sec)
+        direct = np.stack([np.stack([zeros + np.asarray(c, dtype=float) for c in f(x_sec, step)])
+                           for f in contributions], -1)
+        unit_reactions = np.stack([np.stack([-step(x_a), zeros, zeros]),
+                                   np.stack([zeros, -step(x_a), -(x_sec - x_a) * step(x_a)]),
+                                   np.stack([zeros, -step(x_b), -(x_sec - x_b) * step(x_b)])], -1)
+        return direct + np.einsum("qxr,rp->qxp", unit_reactions, reactions)
+
+    result = {"parameters": parameters, "reactions": reactions}
+    result.update(zip(_SECTION_QUANTITIES, sections(x_vec, side)))
+    moment, shear = beam.get_evaluator("moment"), beam.get_evaluator("shear")
+    for key, (x_peak, y_peak) in zip(("moment_max", "moment_min"), moment.extrema()):
+        peak_side = min(("left", "right"), key=lambda s: abs(moment(x_peak, side=s) - y_peak))
+        slope = shear(x_peak, side=peak_side)  # dM/dx, if the peak moves along with its kink
+        result[key] = sections(np.array([x_peak]), peak_side)[2, 0] + slope * (kink_coords == x_peak)
+    return result
+
+
+def _parameters(beam):
+    """Labels, right-hand sides d(F_Rx, F_Ry, M_R)/dp, coordinates of the moment kinks (NaN if
+    none) and direct section contributions (N, V, M) of the load parameters."""
+    parameters, rhs, kink_coords, contributions = [], [], [], []
+
+    def add(label, column, kink, contribution):
+        parameters.append(label)
+        rhs.append(column)
+        kink_coords.append(kink)
+        contributions.append(contribution)
+
+    for i, load in enumerate(beam._loads):
+        if isinstance(load, PointLoadV):
+            force, coord = float(load.force), float(load.coord)
+            add((i, "force"), (0, 1, coord), np.nan,
+                lambda x_sec, step, c=coord: (0, -step(c), -(x_sec - c) * step(c)))
+            add((i, "coord"), (0, 0, force), coord, lambda x_sec, step, f=force, c=coord: (0, 0, f * step(c)))
+        elif isinstance(load, PointLoadH):
+            coord = float(load.coord)
+            add((i, "force"), (1, 0, 0), np.nan, lambda x_sec, step, c=coord: (-step(c), 0, 0))
+            add((i, "coord"), (0, 0, 0), np.nan, lambda x_sec, step: (0, 0, 0))
+        elif isinstance(load, PointTorque):
+            coord = float(load.coord)
+            add((i, "torque"), (0, 0, -1), np.nan, lambda x_sec, step, c=coord: (0, 0, -step(c)))
+            add((i, "coord"), (0, 0, 0), coord, lambda x_sec, step: (0, 0, 0))
+        elif isinstance(load, (DistributedLoadH, DistributedLoadV)):
+            force, moment_z, integrals = _distributed_integrals(load, float(beam._x0), float(beam._x1))
+            start, end = (float(c) for c in load.span)
+            q_start, q_end = (float(sympify(load.expr).subs(x, c)) for c in (start, end))
+            if isinstance(load, DistributedLoadH):
+                add((i, "scale"), (force, 0, 0), np.nan, lambda x_sec, step, f=integrals: (-f(x_sec)[0], 0, 0))
+                add((i, "start"), (-q_start, 0, 0), np.nan,
+                    lambda x_sec, step, q=q_start, c=start: (q * step(c), 0, 0))
+                add((i, "end"), (q_end, 0, 0), np.nan, lambda x_sec, step, q=q_end, c=end: (-q * step(c), 0, 0))
+            else:
+                add((i, "scale"), (0, force, moment_z), np.nan,
+                    lambda x_sec, step, f=integrals: (0,) + tuple(-value for value in f(x_sec)))
+                add((i, "start"), (0, -q_start, -start * q_start), np.nan,
+                    lambda x_sec, step, q=q_start, c=start: (0, q * step(c), q * (x_sec - c) * step(c)))
+                add((i, "end"), (0, q_end, end * q_end), np.nan,
+                    lambda x_sec, step, q=q_end, c=end: (0, -q * step(c), -q * (x_sec - c) * step(c)))
+    return parameters, rhs, kink_coords, contributions
+
+
+def _distributed_integrals(load, x0, x1):
+    """Force and moment (about x=0) resultants of the part of a distributed load within the beam,
+    and a function of the section coordinates returning the integral of the load up to them and
+    its moment about them.
+
+    They are exact for polynomial loads, and found by Gauss-Legendre quadrature otherwise, without
+    any symbolic integration.
+    """
+    expr = sympify(load.expr)
+    a, b = max(float(load.span[0]), x0), min(float(load.span[1]), x1)
+    if b <= a:
+        return 0.0, 0.0, lambda x_sec: (np.zeros_like(x_sec), np.zeros_like(x_sec))
+    fit = PiecewisePolynomial.from_segments([a, b], [expr])
+    if not fit.expressions:
+        first = np.polyint(fit.coefficients[0])  # antiderivatives vanishing at x = a
+        second = np.polyint(first)
+
+        def integrals(x_sec):
+            t = np.clip(x_sec, a, b) - a
+            integral = np.polyval(first, t)
+            return integral, (x_sec - a - t) * integral + np.polyval(second, t)
+    else:
+        func = lambdify(x, expr, "numpy")
+        nodes, weights = np.polynomial.legendre.leggauss(_QUADRATURE_NODES)
+
+        def integrals(x_sec):
+            x_sec = np.asarray(x_sec, dtype=float)[..., None]
+            half = (np.minimum(np.maximum(x_sec, a), b) - a) / 2
+            s = a + half * (nodes + 1)
+            q = np.broadcast_to(np.asarray(func(s), dtype=float), s.shape) * weights * half
+            return q.sum(-1), (q * (x_sec - s)).sum(-1)
+    force, moment = integrals(np.array(b))
+    return float(force), float(b * force - moment), integrals
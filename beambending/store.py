@@ -0,0 +1,181 @@
+"""Memory-mapped storage of results for large parameter sweeps.
+
+A ResultStore is a directory of preallocated ``.npy`` files (one per column)
+plus a small ``metadata.json`` file. Sampled diagrams, reaction forces and
+extreme values are written into row ``i`` as soon as beam ``i`` is solved.
+Several worker processes can open the same store and fill disjoint rows
+without sending any arrays through pickles, and the results can later be read
+slice by slice without loading the whole store into memory.
+
+Example
+-------
+>>> import tempfile
+>>> from beambending import Beam, PointLoadV
+>>> store = ResultStore.create(tempfile.mkdtemp(), n_beams=2, n_points=11)
+>>> beam = Beam(10)
+>>> beam.add_loads([PointLoadV(-10, 5)])
+>>> store.write(0, beam)
+>>> store.solved.tolist()
+[True, False]
+
+"""
+
+import json
+import os
+import numpy as np
+
+_METADATA_FILE = "metadata.json"
+_DIAGRAMS = ("normal", "shear", "moment")
+_EXTREMES = ("normal_max", "normal_min", "shear_max", "shear_min", "moment_max", "moment_min")
+_REACTIONS = ("F_x", "F_y", "M")
+
+
+class ResultStore:
+    """
+    Columnar, memory-mapped results of many solved Beam objects.
+
+    The store exposes the following arrays (all of them numpy memmaps, so
+    slicing only reads the requested rows from disk):
+
+    * ``x``, ``normal``, ``shear``, ``moment``: shape (n_beams, n_points),
+      diagrams sampled at evenly spaced points along each beam.
+    * ``reactions``: shape (n_beams, n_supports, 3), the horizontal force,
+      vertical force and clockwise torque at each support, as returned by
+      `Beam.get_support_reactions`.
+    * ``extremes``: shape (n_beams, 6), maximum and minimum values of the
+      normal force, shear force and bending moment.
+    * ``solved``: shape (n_beams,), True for the rows that have been written.
+
+    Use `ResultStore.create` to allocate a new store, and ``ResultStore(path)``
+    to open an existing one (read-only by default; pass ``mode="r+"`` in worker
+    processes that write results).
+
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        """Opens an existing result store.
+
+        Parameters
+        ----------
+        path : str
+            Directory containing the store.
+        mode : {'r', 'r+'}
+            Memory-map mode: read-only, or read and write.
+
+        """
+        self.path = path
+        with open(os.path.join(path, _METADATA_FILE)) as f:
+            self.metadata = json.load(f)
+        for name in self.metadata["columns"]:
+            setattr(self, name, np.load(self._column_path(name), mmap_mode=mode))
+
+    @classmethod
+    def create(cls, path: str, n_beams: int, n_points: int = 201, n_supports: int = 2, dtype: str = "float64"):
+        """Allocates a new, empty result store on disk.
+
+        Parameters
+        ----------
+        path : str
+            Directory where the store is created. It may already exist, but
+            must not contain another store.
+        n_beams : int
+            Number of beams (rows) in the sweep.
+        n_points : int
+            Number of sampling points per diagram. The default value is 201.
+        n_supports : int
+            Number of supports of every beam in the sweep. The default value
+            is 2 (one pinned and one rolling support).
+        dtype : str
+            Floating point type of the stored values. The default is 'float64'.
+
+        Returns
+        -------
+        ResultStore
+            The new store, opened in 'r+' mode.
+
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, _METADATA_FILE)):
+            raise FileExistsError("A result store already exists at {0}".format(path))
+        shapes = {"x": (n_beams, n_points), "reactions": (n_beams, n_supports, len(_REACTIONS)),
+                  "extremes": (n_beams, len(_EXTREMES))}
+        shapes.update((name, (n_beams, n_points)) for name in _DIAGRAMS)
+        for name, shape in shapes.items():
+            np.lib.format.open_memmap(os.path.join(path, name + ".npy"), mode="w+", dtype=dtype, shape=shape)
+        np.lib.format.open_memmap(os.path.join(path, "solved.npy"), mode="w+", dtype=bool, shape=(n_beams,))
+        metadata = {"n_beams": n_beams, "n_points": n_points, "n_supports": n_supports,
+                    "columns": list(shapes) + ["solved"],
+                    "reactions": ["{}_{}".format(name, i) for i in range(n_supports) for name in _REACTIONS],
+                    "extremes": list(_EXTREMES)}
+        with open(os.path.join(path, _METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+        return cls(path, mode="r+")
+
+    def __len__(self):
+        return self.metadata["n_beams"]
+
+    def write(self, index: int, beam):
+        """Samples a solved beam and stores its results in row `index`.
+
+        Parameters
+        ----------
+        index : int
+            Row of the store assigned to this beam.
+        beam : Beam
+            Beam object with all its loads already applied.
+
+        """
+        x_vec = np.linspace(beam._x0, beam._x1, self.metadata["n_points"])
+        self.x[index] = x_vec
+        extremes = []
+        for name in _DIAGRAMS:
+            func = beam.get_evaluator(name)
+            getattr(self, name)[index] = func(x_vec)
+            (_, y_max), (_, y_min) = func.extrema()
+            extremes.extend((y_max, y_min))
+        self.extremes[index] = extremes
+        self.reactions[index] = beam.get_support_reactions()
+        self.solved[index] = True
+
+    def flush(self):
+        """Writes any pending changes of this process to disk."""
+        for name in self.metadata["columns"]:
+            column = getattr(self, name)
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def export_csv(self, path: str, chunk_size: int = 10000, diagrams: bool = False):
+        """Exports the store to a CSV file, reading it chunk by chunk.
+
+        Parameters
+        ----------
+        path : str
+            Name of the CSV file to be written.
+        chunk_size : int
+            Number of beams read from the store at a time. Memory usage is
+            bounded by this number, not by the size of the store.
+        diagrams : bool
+            When False (default), one row per beam is written with its
+            reactions and extreme values. When True, one row per sampling point
+            is written with the columns (beam, x, normal, shear, moment).
+
+        """
+        n_points = self.metadata["n_points"]
+        if diagrams:
+            header = ["beam", "x"] + list(_DIAGRAMS)
+        else:
+            header = ["beam"] + self.metadata["reactions"] + self.metadata["extremes"]
+        with open(path, "w") as f:
+            f.write(",".join(header) + "\n")
+            for start in range(0, len(self), chunk_size):
+                rows = np.arange(start, min(start + chunk_size, len(self)))
+                rows = rows[self.solved[rows]]
+                if diagrams:
+                    columns = [np.repeat(rows, n_points)] + \
+                              [getattr(self, name)[rows].ravel() for name in ("x",) + _DIAGRAMS]
+                else:
+                    columns = [rows, self.reactions[rows].reshape(len(rows), -1), self.extremes[rows]]
+                np.savetxt(f, np.column_stack(columns), delimiter=",", fmt="%.10g")
+
+    def _column_path(self, name):
+        return os.path.join(self.path, name + ".npy")
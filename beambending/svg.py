@@ -0,0 +1,224 @@
+"""Lightweight SVG rendering of beam diagrams, without matplotlib.
+
+The function `beam_to_svg` draws the same four panels as `Beam.plot` (loaded
+beam schematic, normal force, shear force and bending moment diagrams) and
+returns them as a compact SVG string. Only numpy is used, so it can be called
+from web services that never import matplotlib.
+
+Example
+-------
+>>> from beambending import Beam, PointLoadV
+>>> beam = Beam(9)
+>>> beam.add_loads([PointLoadV(-20, 3)])
+>>> svg = beam_to_svg(beam)
+>>> svg.startswith("<svg")
+True
+
+"""
+
+from xml.sax.saxutils import escape
+import numpy as np
+
+from .beam import _support_outlines, PointLoadH, PointLoadV, PointTorque
+
+_PANELS = (
+    ("load", "Beam loads", "kN / m", "#008000"),
+    ("normal", "Normal force", "kN", "#0000ff"),
+    ("shear", "Shear force", "kN", "#ff0000"),
+    ("moment", "Bending moment", "kN·m", "#bfbf00"),
+)
+_LOAD_COLOR = "#006400"
+_MARGINS = (70, 80, 30, 30)  # left, right, top, bottom (pixels)
+
+
+class _Panel:
+    """Affine mapping from data coordinates to the pixels of one panel."""
+
+    def __init__(self, xlim, ylim, left, top, width, height):
+        self.xlim, self.ylim = xlim, ylim
+        self.left, self.top, self.width, self.height = left, top, width, height
+
+    def px(self, x_data):
+        return self.left + (np.asarray(x_data) - self.xlim[0]) / (self.xlim[1] - self.xlim[0]) * self.width
+
+    def py(self, y_data):
+        return self.top + (self.ylim[1] - np.asarray(y_data)) / (self.ylim[1] - self.ylim[0]) * self.height
+
+    def points(self, x_data, y_data):
+        return " ".join("{:.1f},{:.1f}".format(a, b) for a, b in zip(self.px(x_data), self.py(y_data)))
+
+
+def beam_to_svg(beam, width: int = 480, height: int = 800, n_points: int = 201):
+    """Renders the loaded beam and its diagrams as an SVG document.
+
+    Parameters
+    ----------
+    beam : Beam
+        Beam object with all its loads already applied.
+    width, height : int
+        Size of the SVG image in pixels. The defaults match the proportions of
+        the figure returned by `Beam.plot`.
+    n_points : int
+        Approximate number of points per diagram, see `Beam.get_diagram_data`.
+        The default value is 201.
+
+    Returns
+    -------
+    str
+        SVG document with the four stacked panels.
+
+    """
+    left, right, top, bottom = _MARGINS
+    panel_height = height / len(_PANELS)
+    length = beam._x1 - beam._x0
+    xlim = (beam._x0 - 0.01 * length, beam._x1 + 0.01 * length)
+
+    elements = []
+    for i, (quantity, ylabel, yunits, color) in enumerate(_PANELS):
+        x_vec, y_vec = beam.get_diagram_data(quantity, n_points)
+        inverted = quantity == "load"
+        if inverted:
+            y_vec = -y_vec
+        ylim = _padded_limits(y_vec, minimum=(-5, 5) if inverted else None)
+        panel = _Panel(xlim, ylim, left, i * panel_height + top, width - left - right,
+                       panel_height - top - bottom)
+        if inverted:
+            elements.append(_text(width / 2, panel.top - 10, "Loaded beam diagram", anchor="middle", size=13))
+        elements.extend(_diagram(panel, x_vec, y_vec, color, yunits, inverted))
+        elements.extend(_axes(panel, "{} [{}]".format(ylabel, yunits), show_y=not inverted))
+        if inverted:
+            elements.extend(_schematic(panel, beam))
+    elements.append(_text(left + (width - left - right) / 2, height - 4, "Beam axis [m]", anchor="middle"))
+
+    return ('<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" viewBox="0 0 {0} {1}" '
+            'font-family="sans-serif" font-size="11">{2}</svg>').format(width, height, "".join(elements))
+
+
+def _padded_limits(y_vec, minimum=None, pad=0.05):
+    lo, hi = min(y_vec.min(), 0), max(y_vec.max(), 0)
+    if minimum is not None:
+        lo, hi = min(lo, minimum[0]), max(hi, minimum[1])
+    if hi - lo < 1e-12:
+        lo, hi = lo - 1, hi + 1
+    span = hi - lo
+    return lo - pad * span, hi + pad * span
+
+
+def _format_value(value):
+    return "{:0.1f}".format(value).rstrip('0').rstrip('.')
+
+
+def _text(x_px, y_px, content, anchor="start", size=None, rotate=None):
+    attrs = ' text-anchor="{}"'.format(anchor) if anchor != "start" else ""
+    if size:
+        attrs += ' font-size="{}"'.format(size)
+    if rotate is not None:
+        attrs += ' transform="rotate({} {:.1f} {:.1f})"'.format(rotate, x_px, y_px)
+    return '<text x="{:.1f}" y="{:.1f}"{}>{}</text>'.format(x_px, y_px, attrs, escape(content))
+
+
+def _diagram(panel, x_vec, y_vec, color, yunits, inverted, tol=1e-3):
+    """Filled diagram with dashed lines and labels at its extreme values."""
+    x_poly = np.concatenate([[x_vec[0]], x_vec, [x_vec[-1]]])
+    y_poly = np.concatenate([[0], y_vec, [0]])
+    elements = ['<polygon points="{}" fill="{}" fill-opacity="0.4" stroke="#808080"/>'.format(
+        panel.points(x_poly, y_poly), color)]
+    for idx in (y_vec.argmax(), y_vec.argmin()):
+        if abs(y_vec[idx]) > tol:
+            y_px = panel.py(y_vec[idx])
+            elements.append('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="#008000" '
+                            'stroke-opacity="0.5" stroke-dasharray="5,3"/>'.format(
+                                panel.left, y_px, panel.left + panel.width, y_px))
+            label = "{} {}".format(_format_value(y_vec[idx] * (1 - 2 * inverted)), yunits)
+            elements.append(_text(panel.px(x_vec[idx]) + 8, y_px + 4, label, size=12))
+    return elements
+
+
+def _axes(panel, ylabel, show_y=True):
+    """Bottom and left spines, x-axis ticks and y-axis label of a panel."""
+    bottom = panel.top + panel.height
+    elements = ['<path d="M{0:.1f},{1:.1f}H{2:.1f}" stroke="black"/>'.format(
+        panel.left, bottom, panel.left + panel.width)]
+    for tick in _ticks(*panel.xlim):
+        x_px = panel.px(tick)
+        elements.append('<path d="M{0:.1f},{1:.1f}v4" stroke="black"/>'.format(x_px, bottom))
+        elements.append(_text(x_px, bottom + 15, _format_value(tick), anchor="middle"))
+    if show_y:
+        elements.append('<path d="M{0:.1f},{1:.1f}V{2:.1f}" stroke="black"/>'.format(
+            panel.left, panel.top, bottom))
+        zero = panel.py(0)
+        elements.append('<path d="M{0:.1f},{1:.1f}H{2:.1f}" stroke="#808080" stroke-width="0.5"/>'.format(
+            panel.left, zero, panel.left + panel.width))
+    elements.append(_text(panel.left - 15, panel.top + panel.height / 2, ylabel, anchor="middle", rotate=-90))
+    return elements
+
+
+def _ticks(lo, hi, n_max=8):
+    """Evenly spaced 'round' tick positions between lo and hi."""
+    raw_step = (hi - lo) / n_max
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    return np.arange(np.ceil(lo / step), np.floor(hi / step) + 1) * step
+
+
+def _schematic(panel, beam):
+    """Beam body, supports and point load glyphs, as in `Beam._draw_beam_schematic`."""
+    xspan = panel.xlim[1] - panel.xlim[0]
+    yspan = panel.ylim[1] - panel.ylim[0]
+    beam_height = yspan * 0.06
+    beam_bottom = -0.75 * beam_height
+    beam_top = beam_bottom + beam_height
+    y_mid = (beam_top + beam_bottom) / 2.0
+
+    body = _polygon(panel, [beam._x0, beam._x1, beam._x1, beam._x0],
+                    [beam_bottom, beam_bottom, beam_top, beam_top], 'fill="#a52a2a" fill-opacity="0.7"')
+    elements = [body]
+
+    for support in beam.supports:
+        for x_data, y_data in _support_outlines(support, xspan, yspan, beam_bottom, beam_top):
+            elements.append(_polygon(panel, x_data, y_data, 'fill="black"'))
+
+    for load in beam._loads:
+        if isinstance(load, PointLoadV):
+            if load.force < 0:
+                tip, tail = beam_top, beam_top + 0.17 * yspan
+            else:
+                tip, tail = beam_bottom, beam_bottom - 0.17 * yspan
+            elements.append(_arrow(panel.px(load.coord), panel.py(tail), panel.px(load.coord), panel.py(tip)))
+        elif isinstance(load, PointLoadH):
+            tail = load.coord + xspan * 0.05 * (1 if load.force < 0 else -1)
+            elements.append(_arrow(panel.px(tail), panel.py(y_mid), panel.px(load.coord), panel.py(y_mid)))
+        elif isinstance(load, PointTorque):
+            elements.append(_torque(panel, load, y_mid, xspan * 0.025, yspan * 0.085))
+    return elements
+
+
+def _polygon(panel, x_data, y_data, style):
+    return '<polygon points="{}" {}/>'.format(panel.points(x_data, y_data), style)
+
+
+def _arrow(x_tail, y_tail, x_tip, y_tip, head=9.0):
+    """Straight arrow between two points given in pixels."""
+    direction = np.array([x_tip - x_tail, y_tip - y_tail])
+    direction /= np.hypot(*direction)
+    normal = np.array([-direction[1], direction[0]])
+    base = np.array([x_tip, y_tip]) - head * direction
+    corners = [base + 0.5 * head * normal, (x_tip, y_tip), base - 0.5 * head * normal]
+    return ('<path d="M{:.1f},{:.1f}L{:.1f},{:.1f}" stroke="{c}" stroke-width="2.5"/>'
+            '<polygon points="{}" fill="{c}"/>').format(
+        x_tail, y_tail, base[0], base[1], " ".join("{:.1f},{:.1f}".format(*p) for p in corners), c=_LOAD_COLOR)
+
+
+def _torque(panel, load, y_mid, rx, ry, head=8.0):
+    """Half-ellipse arrow around a point torque (clockwise when positive)."""
+    xc = panel.px(load.coord)
+    rx_px = abs(panel.px(load.coord + rx) - xc)
+    ry_px = abs(panel.py(y_mid + ry) - panel.py(y_mid))
+    y_top, y_bottom = panel.py(y_mid) - ry_px, panel.py(y_mid) + ry_px
+    clockwise = load.torque >= 0
+    tip_dx = -head if clockwise else head
+    return ('<path d="M{0:.1f},{1:.1f}A{2:.1f},{3:.1f} 0 0 {4} {0:.1f},{5:.1f}" fill="none" stroke="{c}" '
+            'stroke-width="2.5" stroke-linecap="round"/>'
+            '<polygon points="{6:.1f},{7:.1f} {0:.1f},{8:.1f} {0:.1f},{9:.1f}" fill="{c}"/>').format(
+        xc, y_top, rx_px, ry_px, int(clockwise), y_bottom,
+        xc + tip_dx, y_bottom, y_bottom - head / 2, y_bottom + head / 2, c=_LOAD_COLOR)
@@ -0,0 +1,238 @@
+"""Monte Carlo analysis of beams with uncertain load magnitudes and positions.
+
+Reactions and diagrams are linear in the load magnitudes, so a beam is split
+into its deterministic part (solved once), its uncertain distributed loads
+(solved once each and scaled by the sampled factors) and its uncertain point
+loads, whose effect is computed for a whole chunk of samples at once from the
+influence lines of the support reactions. Results are accumulated chunk by
+chunk into StreamingStatistics objects, so memory usage does not grow with the
+number of samples.
+
+Example
+-------
+>>> from beambending import Beam, PointLoadV
+>>> beam = Beam(10)
+>>> beam.pinned_support, beam.rolling_support = 0, 10
+>>> beam.add_loads([PointLoadV(-10, 5)])
+>>> stats = beam.monte_carlo({0: {"coord": lambda rng, n: rng.uniform(4, 6, n)}}, n_samples=1000, seed=0)
+>>> round(float(stats["moment_min"].min), 1)
+-25.0
+
+"""
+
+import numpy as np
+
+from .beam import PointLoadH, PointLoadV, PointTorque
+from .continuous import solver_for_layout
+
+_POINT_DIRECTIONS = {PointLoadH: "x", PointLoadV: "y", PointTorque: "torque"}
+
+
+class StreamingStatistics:
+    """
+    Summary statistics of a stream of (possibly array-valued) samples.
+
+    The mean and variance are merged chunk by chunk with the parallel
+    algorithm of Chan et al. Quantiles are estimated from a logarithmic
+    histogram with a bounded relative error (as in DDSketch), and the
+    probabilities of exceeding the given thresholds are counted exactly.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of a single sample. The default, (), is for scalar samples.
+    thresholds : sequence of float, optional
+        Values whose exceedance probability is tracked exactly.
+    relative_accuracy : float
+        Relative accuracy of the quantile estimates. The default value is 0.01.
+    value_range : (float, float)
+        Smallest and largest absolute values resolved by the quantile sketch.
+        Smaller values are counted as zero, larger ones are clipped.
+
+    """
+
+    def __init__(self, shape=(), thresholds=(), relative_accuracy: float = 0.01, value_range=(1e-9, 1e15)):
+        self.shape = tuple(shape)
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.count = 0
+        self.mean = np.zeros(self.shape)
+        self.min = np.full(self.shape, np.inf)
+        self.max = np.full(self.shape, -np.inf)
+        self._m2 = np.zeros(self.shape)
+        self._exceedances = np.zeros(self.thresholds.shape + self.shape, dtype=np.int64)
+        self._min_value = value_range[0]
+        self._log_gamma = np.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._offset = int(np.ceil(np.log(value_range[0]) / self._log_gamma))
+        self._n_bins = int(np.ceil(np.log(value_range[1]) / self._log_gamma)) - self._offset + 1
+        # Bins sorted by value: negative keys (decreasing magnitude), zero, positive keys (increasing magnitude)
+        self._bins = np.zeros(self.shape + (2 * self._n_bins + 1,), dtype=np.int64)
+
+    def update(self, samples):
+        """Adds a chunk of samples, given as an array of shape (n_samples,) + shape."""
+        samples = np.asarray(samples, dtype=float).reshape((-1,) + self.shape)
+        n = len(samples)
+        if n == 0:
+            return
+        mean = samples.mean(axis=0)
+        m2 = ((samples - mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = np.minimum(self.min, samples.min(axis=0))
+        self.max = np.maximum(self.max, samples.max(axis=0))
+        self._exceedances += (samples > self.thresholds.reshape((-1, 1) + (1,) * len(self.shape))).sum(axis=1)
+
+        positions = self._bin_positions(samples).reshape(n, -1)
+        n_positions = self._bins.shape[-1]
+        flat = positions + n_positions * np.arange(positions.shape[1])
+        self._bins += np.bincount(flat.ravel(), minlength=self._bins.size).reshape(self._bins.shape)
+
+    @property
+    def variance(self):
+        """Unbiased sample variance."""
+        return self._m2 / max(self.count - 1, 1)
+
+    @property
+    def std(self):
+        """Unbiased sample standard deviation."""
+        return np.sqrt(self.variance)
+
+    def quantile(self, q: float):
+        """Estimated q-quantile (0 <= q <= 1) of every component of the samples."""
+        cumulative = np.cumsum(self._bins, axis=-1)
+        rank = q * (self.count - 1)
+        positions = (cumulative <= rank).sum(axis=-1)
+        return np.clip(self._bin_values(positions), self.min, self.max)
+
+    def exceedance(self, threshold: float):
+        """Probability that a sample is larger than `threshold`.
+
+        The result is exact for the thresholds given to the constructor, and
+        estimated from the quantile sketch otherwise.
+        """
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        tracked = np.flatnonzero(self.thresholds == threshold)
+        if len(tracked):
+            return self._exceedances[tracked[0]] / self.count
+        above = self._bin_values(np.arange(self._bins.shape[-1])) > threshold
+        return (self._bins * above).sum(axis=-1) / self.count
+
+    def _bin_positions(self, values):
+        magnitude = np.abs(values)
+        keys = np.ceil(np.log(np.maximum(magnitude, self._min_value)) / self._log_gamma).astype(np.int64)
+        keys = np.clip(keys - self._offset, 0, self._n_bins - 1)
+        return np.where(magnitude < self._min_value, self._n_bins,
+                        np.where(values > 0, self._n_bins + 1 + keys, self._n_bins - 1 - keys))
+
+    def _bin_values(self, positions):
+        keys = np.where(positions > self._n_bins, positions - self._n_bins - 1, self._n_bins - 1 - positions)
+        magnitude = 2 * np.exp((keys + self._offset) * self._log_gamma) / (1 + np.exp(self._log_gamma))
+        return np.sign(positions - self._n_bins) * magnitude
+
+
+def monte_carlo(beam, distributions: dict, n_samples: int, chunk_size: int = 4096, n_points: int = 201,
+                thresholds: dict = None, seed=None):
+    """Statistics of the reactions and peak bending moments of a beam with random loads.
+
+    See `Beam.monte_carlo` for a description of the parameters.
+    """
+    rng = np.random.default_rng(seed)
+    thresholds = thresholds or {}
+    n_supports = len(beam.supports)
+    stats = {"reactions": StreamingStatistics((n_supports, 3), thresholds.get("reactions", ()))}
+    stats.update((name, StreamingStatistics((), thresholds.get(name, ())))
+                 for name in ("moment_max", "moment_min", "moment_peak"))
+
+    random_point, random_distributed, fixed = [], [], []
+    for index, load in enumerate(beam._loads):
+        samplers = distributions.get(index)
+        if not samplers:
+            fixed.append(load)
+            continue
+        unknown = set(samplers) - set(load._fields)
+        if unknown or "span" in samplers:
+            raise ValueError("Cannot sample {} of load {}.".format(sorted(unknown) or ["span"], load))
+        if type(load) in _POINT_DIRECTIONS:
+            random_point.append((load, samplers))
+        else:
+            # The magnitude of a distributed load is sampled as a factor of its expression
+            random_distributed.append((_only(beam, load), samplers["expr"]))
+    deterministic = _only(beam, *fixed)
+    solver = solver_for_layout(beam._x0, beam._x1, beam.supports) if random_point else None
+    support_coords = np.array([float(s.coord) for s in beam.supports])
+    breakpoints = np.array(beam._breakpoints, dtype=float)
+    x_grid = np.union1d(np.linspace(beam._x0, beam._x1, n_points), breakpoints)
+    kinks = breakpoints[1:-1]
+
+    for start in range(0, n_samples, chunk_size):
+        n = min(chunk_size, n_samples - start)
+        factors = [sampler(rng, n) for _, sampler in random_distributed]
+        points = []
+        point_reactions = np.zeros((n, n_supports, 3))
+        for load, samplers in random_point:
+            force = samplers[load._fields[0]](rng, n) if load._fields[0] in samplers else np.full(n, float(load[0]))
+            coord = samplers["coord"](rng, n) if "coord" in samplers else np.full(n, float(load.coord))
+            unit = solver.unit_reactions(coord, _POINT_DIRECTIONS[type(load)])  # (n_supports, 3, n)
+            point_reactions += np.moveaxis(unit * force, -1, 0)
+            points.append((type(load), force, coord))
+        reactions = np.array(deterministic.get_support_reactions()) + point_reactions
+        for (sub_beam, _), factor in zip(random_distributed, factors):
+            reactions += factor[:, None, None] * np.array(sub_beam.get_support_reactions())
+
+        # Bending moment at evenly spaced sections (shared by all samples), and both one-sided
+        # limits at every breakpoint and sampled load position
+        random_coords = np.column_stack([coord for _, _, coord in points] + [np.empty((n, 0))])
+        moments = np.hstack([
+            np.broadcast_to(_moment(x_eval, side, deterministic, random_distributed, factors, points,
+                                    point_reactions, support_coords), (n, x_eval.shape[-1]))
+            for x_eval, side in ((x_grid, "right"), (kinks, "left"),
+                                 (random_coords, "right"), (random_coords, "left"))])
+
+        stats["reactions"].update(reactions)
+        stats["moment_max"].update(moments.max(axis=1))
+        stats["moment_min"].update(moments.min(axis=1))
+        stats["moment_peak"].update(np.abs(moments).max(axis=1))
+    return stats
+
+
+def _only(beam, *loads):
+    """Variant of the beam carrying only the given loads."""
+    variant = beam._variant()
+    variant._loads = list(loads)
+    variant._update_loads()
+    return variant
+
+
+def _moment(x_eval, side, deterministic, random_distributed, factors, points, point_reactions, support_coords):
+    """Bending moment of every sample of a chunk at the sections x_eval.
+
+    The sections are either shared by all the samples (1-D array) or given per
+    sample (array of shape (n_samples, n_sections)).
+    """
+    moment = deterministic.get_evaluator("moment")(x_eval, side=side)
+    for (sub_beam, _), factor in zip(random_distributed, factors):
+        moment = moment + factor[:, None] * sub_beam.get_evaluator("moment")(x_eval, side=side)
+    for load_type, force, coord in points:
+        if load_type is PointLoadV:
+            moment = moment - force[:, None] * _lever_arm(x_eval, coord[:, None], side)
+        elif load_type is PointTorque:
+            moment = moment - force[:, None] * _is_left_of(x_eval, coord[:, None], side)
+    if points:
+        # Reactions to the random point loads, acting at the supports
+        x_sections = x_eval[..., None, :]
+        coords = support_coords[:, None]
+        moment = moment - (np.matmul(point_reactions[:, None, :, 1], _lever_arm(x_sections, coords, side)) +
+                           np.matmul(point_reactions[:, None, :, 2], _is_left_of(x_sections, coords, side)))[:, 0]
+    return moment
+
+
+def _is_left_of(x_eval, coord, side):
+    """1 where a load at `coord` acts on the part of the beam to the left of the section x_eval."""
+    return (x_eval >= coord) if side == "right" else (x_eval > coord)
+
+
+def _lever_arm(x_eval, coord, side):
+    return (x_eval - coord) * _is_left_of(x_eval, coord, side)
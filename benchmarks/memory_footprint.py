@@ -0,0 +1,53 @@
+"""Memory footprint of many solved beams, with and without the slim mode.
+
+Usage: python benchmarks/memory_footprint.py [n_beams]
+
+Every beam is solved (reactions and diagram evaluators) and kept alive, and
+the memory they hold is measured with tracemalloc. Tracing slows sympy down
+considerably, so the default number of beams is small.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from beambending import Beam, DistributedLoadV, PointLoadH, PointLoadV, PointTorque  # noqa: E402
+
+
+def solved_beams(n_beams, slim):
+    beams = []
+    for i in range(n_beams):
+        beam = Beam(9, slim=slim)
+        beam.pinned_support = 2
+        beam.rolling_support = 7
+        beam.add_loads([PointLoadH(10, 3), PointLoadV(-20 - i % 7, 3 + (i % 5) / 10),
+                        DistributedLoadV(-10, (3, 9)), DistributedLoadV("-20 + x**2", (0, 2)),
+                        PointTorque(5 + i % 3, 8)])
+        beams.append(beam)
+    return beams
+
+
+def footprint(n_beams, slim):
+    """Average number of bytes per solved beam, freed when the beams are deleted.
+
+    Memory held by global caches (e.g. the sympy cache), which survives the
+    beams, is not counted.
+    """
+    tracemalloc.start()
+    beams = solved_beams(n_beams, slim)
+    gc.collect()
+    alive = tracemalloc.get_traced_memory()[0]
+    del beams
+    gc.collect()
+    freed = alive - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return freed / n_beams
+
+
+if __name__ == "__main__":
+    n_beams = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    for slim in (False, True):
+        print("slim={!s:<5}  {:>10.0f} bytes per beam".format(slim, footprint(n_beams, slim)))
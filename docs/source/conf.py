@@ -14,7 +14,7 @@
 #
 import os
 import sys
-sys.path.insert(0, os.path.join(os.path.abspath('.'), '..', '..', 'beambending'))
+sys.path.insert(0, os.path.join(os.path.abspath('.'), '..', '..'))
 
 
 # -- Project information -----------------------------------------------------
@@ -4,6 +4,7 @@ from numpy.testing import assert_allclose
 import pytest
 from sympy import lambdify
 
+import beambending.beam
 from beambending import Beam, DistributedLoadH, DistributedLoadV, PointLoadH, PointLoadV, PointTorque, x
 
 
@@ -114,3 +115,167 @@ def test_beam_point_moments_work_correctly():
         expected = [0, 0, 0, 0, 0, -3, -6, -9, 18, 15, 12, 9, 6, 3, 0, 0, 0, 0, 0]
         assert_allclose(bending_moment_sample, expected)
 
+
+
+def test_beam_diagrams_are_consolidated_into_flat_piecewise():
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        assert the_beam._breakpoints == [0, 2, 3, 5, 7, 9]
+        for name, terms in [("normal", the_beam._normal_forces),
+                            ("shear", the_beam._shear_forces),
+                            ("moment", the_beam._bending_moments)]:
+            assert len(the_beam._segments[name]) == len(the_beam._breakpoints) - 1
+            flat = the_beam._diagrams[name]
+            sign = 1 if name == "normal" else -1
+            expected = lambdify(x, sign * sum(terms), "numpy")
+            assert_allclose([lambdify(x, flat, "numpy")(t) for t in x_vec],
+                            [expected(t) for t in x_vec])
+
+
+def test_slim_beams_drop_symbolic_expressions_until_needed():
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        slim = Beam(9, slim=True)
+        slim.pinned_support = 2
+        slim.rolling_support = 7
+        slim.add_loads(the_beam._loads)
+        assert slim._symbolic is None and not slim._term_cache
+        assert slim.get_support_reactions() == the_beam.get_support_reactions()
+        assert slim.get_reaction_forces() == the_beam.get_reaction_forces()
+        assert not slim._term_cache  # answered from the stored reactions
+        assert_allclose(slim.get_bending_moment(x_vec), the_beam.get_bending_moment(x_vec))
+        assert slim._diagrams["shear"] == the_beam._diagrams["shear"]  # rebuilt on demand
+        assert not hasattr(slim._loads[0], "__dict__")
+
+
+def test_evaluators_are_summed_without_symbolic_expressions():
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        beam = Beam(9)
+        beam.pinned_support = 2
+        beam.rolling_support = 7
+        beam.add_loads(the_beam._loads + [DistributedLoadV("sin(x)", (1, 8))])
+        assert beam._symbolic is None  # the diagrams were summed numerically
+        converted = len(beam._polynomial_cache)
+        variant = beam.with_loads([PointLoadV(-3, 4.5)])
+        assert variant._symbolic is None
+        assert len(beam._polynomial_cache) == converted + 3  # only the new load (normal, shear and moment)
+        for name in ("normal", "shear", "moment"):
+            assert_allclose(variant.get_evaluator(name)(x_vec), lambdify(x, variant._diagrams[name], "numpy")(x_vec),
+                            atol=1e-12)
+
+
+def test_diagram_data_is_decimated_keeping_extrema_and_jumps():
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        the_beam.add_loads([DistributedLoadV("x**2", (4.1, 6.3))])
+        x_dec, y_dec = the_beam.get_diagram_data("moment", n_points=60)
+        assert len(x_dec) < 80
+        assert np.all(np.diff(x_dec) >= 0)
+
+        func = the_beam.get_evaluator("moment")
+        (x_max, y_max), (x_min, y_min) = func.extrema()
+        assert y_dec.max() == y_max and y_dec.min() == y_min
+        assert_allclose(y_dec, func(x_dec), atol=1e-9)
+
+        x_dec, y_dec = the_beam.get_diagram_data("shear", n_points=60)
+        for b in the_beam._breakpoints[1:-1]:
+            at_b = y_dec[x_dec == b]
+            assert_allclose(at_b, [func_value for func_value in
+                                   (the_beam.get_evaluator("shear")(b, side="left"),
+                                    the_beam.get_evaluator("shear")(b))])
+
+
+def test_plot_annotations_are_drawn_on_the_given_axes():
+    import matplotlib.pyplot as plt
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        fig = plt.figure()
+        ax1, ax2 = fig.add_subplot(2, 1, 1), fig.add_subplot(2, 1, 2)  # ax2 is pyplot's current axes
+        the_beam.plot_shear_force(ax1)
+        assert len(ax1.texts) == 2
+        assert len(ax2.texts) == 0
+        plt.close(fig)
+
+
+def test_point_load_glyphs_are_batched_into_collections():
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.patches import Arc, RegularPolygon
+    rng = np.random.default_rng(0)
+    beam = Beam(20)
+    beam.pinned_support, beam.rolling_support = 0, 20
+    beam.add_loads([PointLoadV(f, c) for f, c in zip(rng.uniform(-10, 5, 60), rng.uniform(0, 20, 60))] +
+                   [PointLoadH(3, 5), PointLoadH(-3, 12), PointTorque(10, 4), PointTorque(-10, 15)])
+
+    def glyph_counts(ax):
+        assert len(ax.texts) == 0
+        assert not [p for p in ax.patches if isinstance(p, (Arc, RegularPolygon))]
+        (shafts,) = [c for c in ax.collections if isinstance(c, LineCollection)]
+        (heads,) = [c for c in ax.collections if isinstance(c, PolyCollection) and c is not shafts]
+        return len(shafts.get_paths()), len(heads.get_paths())
+
+    assert glyph_counts(beam.plot_beam_diagram().axes[0]) == (64, 64)
+    n_shafts, n_heads = glyph_counts(beam.plot_beam_diagram(max_arrows=10).axes[0])
+    assert 4 < n_heads <= 2 * 10 + 4
+    assert n_shafts > n_heads  # bars spanning the aggregated loads
+
+    forces, coords = np.array([[l.force, l.coord] for l in beam._loads[:60]]).T
+    totals, centroids, lo, hi = beambending.beam._aggregate_point_loads(forces, coords, 10, 0, 20)
+    assert totals.sum() == pytest.approx(forces.sum())
+    assert (totals * centroids).sum() == pytest.approx((forces * coords).sum())
+    assert np.all((lo <= centroids) & (centroids <= hi))
+
+
+def test_beams_can_be_plotted_concurrently_without_pyplot():
+    from concurrent.futures import ThreadPoolExecutor
+    import io
+    import matplotlib.pyplot as plt
+
+    def render(point_load_coord):
+        beam = Beam(9)
+        beam.add_loads([PointLoadV(-20, point_load_coord), PointTorque(10, 5)])
+        fig = beam.plot()
+        fig.savefig(io.BytesIO(), format="png")
+        return fig
+
+    figures_before = plt.get_fignums()
+    with ThreadPoolExecutor(4) as pool:
+        figures = list(pool.map(render, [1, 3, 4, 6, 7, 8]))
+    assert plt.get_fignums() == figures_before
+    for fig in figures:
+        assert len(fig.axes[1].texts) == 0  # no normal forces
+        assert all(len(ax.texts) > 0 for ax in fig.axes[2:])
+
+
+def test_pyplot_figures_on_request():
+    import matplotlib.pyplot as plt
+    beam = Beam(9)
+    beam.add_loads([PointLoadV(-20, 3)])
+    figures_before = plt.get_fignums()
+    fig = beam.plot(pyplot=True)
+    shear = beam.plot_shear_force(pyplot=True)
+    try:
+        assert plt.get_fignums() == figures_before + [fig.number, shear.number]
+        assert len(fig.axes) == 4
+    finally:
+        plt.close(fig)
+        plt.close(shear)
+
+
+def test_chunked_diagram_data_matches_the_evaluators():
+    with defined_canonical_beam() as (the_beam, x, x_vec):
+        the_beam.add_loads([PointLoadV(-4, 1.5), PointTorque(3, 6)])
+        bounds = the_beam._breakpoints
+        chunks = list(the_beam.iter_diagram_data(1001, chunk_size=64))
+        for x_chunk, *values in chunks:
+            assert 0 < len(x_chunk) <= 64
+            i = np.searchsorted(bounds, x_chunk[0], side="right") - 1
+            assert bounds[i] <= x_chunk[0] and x_chunk[-1] <= bounds[i + 1]  # within a single interval
+        x_all, normal, shear, moment = (np.concatenate(column) for column in zip(*chunks))
+        assert np.all(np.diff(x_all) >= 0)
+        inner = np.asarray(bounds[1:-1], dtype=float)
+        assert len(x_all) == 1001 - np.count_nonzero(np.isin(inner, np.linspace(0, 9, 1001))) + 2 * len(inner)
+        assert np.all(np.count_nonzero(x_all[:, None] == inner, axis=0) == 2)
+
+        at_bound = np.isin(x_all, inner)
+        for quantity, y_all in (("normal", normal), ("shear", shear), ("moment", moment)):
+            func = the_beam.get_evaluator(quantity)
+            assert_allclose(y_all[~at_bound], func(x_all[~at_bound]), atol=1e-9)
+            pairs = y_all[at_bound].reshape(-1, 2)
+            assert_allclose(pairs[:, 0], func(inner, side="left"), atol=1e-9)
+            assert_allclose(pairs[:, 1], func(inner, side="right"), atol=1e-9)
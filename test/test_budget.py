@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import time
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+from sympy import lambdify
+
+import beambending.beam
+from beambending import Beam, DistributedLoadH, DistributedLoadV, FixedSupport, PointLoadV, RollingSupport, x
+
+LOADS = [DistributedLoadV("-10 - sin(x)", (0, 4)), DistributedLoadV("-x**2/3", (2, 9)),
+         DistributedLoadH("exp(-x)", (1, 6)), PointLoadV(-20, 3), DistributedLoadV(-5, (5, 8))]
+SLOW = "-x**3*sin(x)**9*exp(-x)"  # its symbolic integration takes far longer than the budgets below
+
+
+def loaded_beam(supports=(), **kwargs):
+    beam = Beam(9, **kwargs)
+    beam.pinned_support, beam.rolling_support = 2, 7
+    beam.add_supports(supports)
+    beam.add_loads(LOADS)
+    return beam
+
+
+@pytest.mark.parametrize("supports", [(), (RollingSupport(9), FixedSupport(0))])
+def test_numeric_fallback_matches_symbolic_integration(supports):
+    symbolic = loaded_beam(supports)
+    numeric = loaded_beam(supports, load_time_budget=0)
+    assert [record.method for record in numeric.get_integration_log()] == ["numeric"] * 3 + ["symbolic", "numeric"]
+    assert [record.load for record in numeric.get_integration_log()] == LOADS
+    assert_allclose(numeric.get_support_reactions(), symbolic.get_support_reactions(), atol=1e-9)
+    x_vec = np.linspace(0, 9, 91)
+    for quantity in ("load", "normal", "shear", "moment"):
+        assert_allclose(numeric.get_evaluator(quantity)(x_vec), symbolic.get_evaluator(quantity)(x_vec), atol=1e-9)
+
+
+def test_numeric_fallback_refines_oscillating_loads():
+    load = DistributedLoadV("-sin(5*x)", (0, 9))
+    symbolic, numeric = Beam(9), Beam(9, load_time_budget=0)
+    for beam in (symbolic, numeric):
+        beam.pinned_support, beam.rolling_support = 2, 7
+        beam.add_loads([load])
+    (record,) = numeric.get_integration_log()
+    assert record.method == "numeric" and 0 < record.residual < 1e-9
+    assert len(numeric._breakpoints) > len(symbolic._breakpoints)
+    assert_allclose(numeric.get_reaction_forces(), symbolic.get_reaction_forces(), atol=1e-9)
+    x_vec = np.linspace(0, 9, 181)
+    for quantity in ("load", "shear", "moment"):
+        assert_allclose(numeric.get_evaluator(quantity)(x_vec), symbolic.get_evaluator(quantity)(x_vec), atol=1e-9)
+
+
+def test_numeric_fallback_rejects_singular_loads():
+    beam = Beam(9, load_time_budget=0)
+    with pytest.raises(ValueError):
+        beam.add_loads([DistributedLoadV("-1/(x-4.5)**2 - 1", (0, 9))])
+
+
+def test_slim_beams_rebuild_numeric_terms_numerically():
+    beam = loaded_beam(load_time_budget=0, slim=True)
+    reference = loaded_beam(load_time_budget=0)
+    assert beam._symbolic is None and not beam._term_cache
+    assert beam._diagrams["moment"] == reference._diagrams["moment"]  # not integrated symbolically this time
+    assert [record.method for record in beam.get_integration_log()] == ["numeric"] * 3 + ["symbolic", "numeric"]
+
+
+def test_generous_budget_integrates_symbolically():
+    beam = loaded_beam(time_budget=600, load_time_budget=300)
+    log = beam.get_integration_log()
+    assert [record.method for record in log] == ["symbolic"] * len(LOADS)
+    assert all(record.seconds > 0 for record in log)
+    assert_allclose(beam.get_reaction_forces(), loaded_beam().get_reaction_forces())
+    assert beam._diagrams["moment"] == loaded_beam()._diagrams["moment"]
+
+
+def test_spent_beam_budget_degrades_every_remaining_load():
+    beam = loaded_beam(time_budget=0)
+    assert [record.method for record in beam.get_integration_log()] == ["numeric"] * 3 + ["symbolic", "numeric"]
+    variant = beam.with_loads([DistributedLoadV("-1", (0, 1))])
+    assert variant.get_integration_log()[:-1] == beam.get_integration_log()
+    assert variant.get_integration_log()[-1].method == "numeric"
+
+
+@pytest.fixture(params=["fork", "spawn"])
+def start_method(request, monkeypatch):
+    if request.param not in multiprocessing.get_all_start_methods():
+        pytest.skip("start method not available")
+    monkeypatch.setattr(beambending.beam, "_BUDGET_START_METHOD", request.param)
+    return request.param
+
+
+def quadrature_reactions(expr, span, x_a, x_b):
+    """(F_Ay, F_By) of a vertical distributed load, by Gauss-Legendre quadrature."""
+    nodes, weights = np.polynomial.legendre.leggauss(80)
+    s = (span[0] + span[1]) / 2 + (span[1] - span[0]) / 2 * nodes
+    q = weights * (span[1] - span[0]) / 2 * lambdify(x, expr, "numpy")(s)
+    f_b = -(q * (s - x_a)).sum() / (x_b - x_a)
+    return -q.sum() - f_b, f_b
+
+
+def idle_processes():
+    return {worker.process for workers in beambending.beam._idle_budget_workers.values() for worker in workers}
+
+
+def test_slow_integration_is_abandoned(start_method):
+    start = time.perf_counter()
+    beam = Beam(6, load_time_budget=0.5)
+    beam.pinned_support, beam.rolling_support = 0, 6
+    beam.add_loads([DistributedLoadV(SLOW, (0, 6))])
+    assert time.perf_counter() - start < 15
+    (record,) = beam.get_integration_log()
+    assert record.method == "numeric"
+    assert 0.5 <= record.seconds < 5  # the start-up of the worker is not charged
+    assert set(multiprocessing.active_children()) == idle_processes()  # the worker was terminated
+    assert all(process.is_alive() for process in idle_processes())
+    assert_allclose(beam.get_reaction_forces()[1:], quadrature_reactions(SLOW, (0, 6), 0, 6), atol=1e-9)
+
+
+def test_budget_workers_are_reused_and_run_concurrently(start_method, monkeypatch):
+    warm_up = Beam(9, processes=2, load_time_budget=60)
+    warm_up.add_loads([DistributedLoadV("-1", (0, 9)), DistributedLoadV("-x", (0, 9))])
+    assert len(idle_processes()) >= 2
+
+    started = []
+    start_worker = beambending.beam._BudgetWorker.__init__
+    monkeypatch.setattr(beambending.beam._BudgetWorker, "__init__", lambda self: started.append(self) or
+                        start_worker(self))
+    start = time.perf_counter()
+    beam = Beam(9, processes=2, load_time_budget=3)
+    beam.pinned_support, beam.rolling_support = 2, 7
+    beam.add_loads([DistributedLoadV("-1", (0, 9)), DistributedLoadV(SLOW, (0, 4)), DistributedLoadV(SLOW, (4, 9))])
+    assert time.perf_counter() - start < 5.5  # both slow loads time out together, not one after the other
+    assert [record.method for record in beam.get_integration_log()] == ["symbolic", "numeric", "numeric"]
+    assert not started  # the slow load after the quick one reused its worker
+    expected = np.sum([quadrature_reactions(expr, span, 2, 7) for expr, span in
+                       [("-1 + 0*x", (0, 9)), (SLOW, (0, 4)), (SLOW, (4, 9))]], axis=0)
+    assert_allclose(beam.get_reaction_forces()[1:], expected, atol=1e-9)
+
+
+def test_time_budgets_reject_executors():
+    with ProcessPoolExecutor(1) as pool:
+        with pytest.raises(ValueError):
+            Beam(9, processes=pool, time_budget=1)
@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+import beambending.beam
+from beambending import Beam, DistributedLoadV, FixedSupport, PointLoadV, SolutionCache, x
+
+
+def catalog_beam(cache, force=-20):
+    beam = Beam(9, cache=cache)
+    beam.pinned_support = 2
+    beam.rolling_support = 7
+    beam.add_loads([DistributedLoadV("-10", (3, 9)), PointLoadV(force, 3), DistributedLoadV(x**2, (0, 2))])
+    return beam
+
+
+def test_warm_cache_answers_without_symbolic_integration(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path))
+    cold = catalog_beam(cache)
+
+    def no_integration(*args, **kwargs):
+        raise AssertionError("symbolic integration on a cached beam")
+    monkeypatch.setattr(beambending.beam, "integrate", no_integration)
+    warm = catalog_beam(cache)
+    x_vec = np.linspace(0, 9, 37)
+    assert_allclose(warm.get_support_reactions(), cold.get_support_reactions())
+    assert warm.get_reaction_forces() == cold.get_reaction_forces()
+    assert_allclose(warm.get_bending_moment(x_vec), cold.get_bending_moment(x_vec))
+    assert warm.get_diagram_data("shear", 50)[1].max() == cold.get_diagram_data("shear", 50)[1].max()
+
+    monkeypatch.undo()
+    assert float(warm._diagrams["moment"].subs(x, 4.5)) == pytest.approx(float(cold._diagrams["moment"].subs(x, 4.5)))
+
+
+def test_cache_keys_are_canonical():
+    beam_a, beam_b = Beam(6), Beam(6.0)
+    beam_a.add_loads([DistributedLoadV("-10", (0, 6)), PointLoadV(-5, 3)])
+    beam_b.add_loads([DistributedLoadV(-10.0, (0.0, 6)), PointLoadV(-5.0, 3.0)])
+    assert SolutionCache.key(beam_a) == SolutionCache.key(beam_b)
+    beam_b.add_loads([DistributedLoadV("-1", [1, 2])])
+    assert SolutionCache.key(beam_b) == SolutionCache.key(beam_a.with_loads([DistributedLoadV(-1, (1.0, 2.0))]))
+    assert SolutionCache.key(beam_a) != SolutionCache.key(beam_a.with_loads([PointLoadV(-1, 1)]))
+    assert SolutionCache.key(beam_a) != SolutionCache.key(beam_a.with_supports([FixedSupport(0)]))
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    catalog_beam(cache, force=-1)
+    entry_size = sum(e.stat().st_size for e in os.scandir(str(tmp_path)))
+    cache.max_bytes = 3 * entry_size
+    for force in range(-2, -8, -1):
+        catalog_beam(cache, force=force)
+    assert len(os.listdir(str(tmp_path))) <= 3
+    assert cache.get(SolutionCache.key(catalog_beam(None, force=-7))) is not None
+    assert cache.get(SolutionCache.key(catalog_beam(None, force=-1))) is None
+    cache.clear()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def _solve_catalog_beam(directory):
+    return catalog_beam(SolutionCache(directory)).get_support_reactions()
+
+
+def test_cache_is_shared_by_concurrent_processes(tmp_path):
+    with ProcessPoolExecutor(3) as pool:
+        results = list(pool.map(_solve_catalog_beam, [str(tmp_path)] * 6))
+    for reactions in results:
+        assert reactions == pytest.approx(results[0])
+    assert [name.endswith(".npz") for name in os.listdir(str(tmp_path))] == [True]
+
+
+def test_tampered_entries_are_misses(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    beam = catalog_beam(cache)
+    beam.add_loads([DistributedLoadV("sin(x)", (0, 9))])
+    key = SolutionCache.key(beam)
+    with np.load(cache._path(key)) as data:
+        arrays = dict(data)
+    assert cache.get(key) is not None
+    arrays["moment_expressions"] = np.array('{"0": "Symbol(__import__(\'os\').getcwd())"}')
+    with open(cache._path(key), "wb") as f:
+        np.savez(f, **arrays)
+    assert cache.get(key) is None
+
+
+def test_malicious_entries_are_misses_without_running_code(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache"))
+    beam = catalog_beam(cache)
+    beam.add_loads([DistributedLoadV("sin(x)", (0, 9))])
+    key = SolutionCache.key(beam)
+    with np.load(cache._path(key)) as data:
+        arrays = dict(data)
+    marker = tmp_path / "pwned"
+    payload = "__import__('pathlib').Path({!r}).touch() or x".format(str(marker))
+    for expression in ["Poly({!r})".format(payload), "Add({!r})".format(payload), "Symbol('x', real={!r})".format(payload)]:
+        arrays["moment_expressions"] = np.array(json.dumps({"0": expression}))
+        with open(cache._path(key), "wb") as f:
+            np.savez(f, **arrays)
+        assert cache.get(key) is None
+        warm = catalog_beam(cache)
+        warm.add_loads([DistributedLoadV("sin(x)", (0, 9))])
+        assert warm.get_support_reactions() == pytest.approx(beam.get_support_reactions())
+        assert not marker.exists()
+
+
+def test_numeric_fallbacks_are_not_stored(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    budgeted = Beam(9, cache=cache, load_time_budget=0)
+    budgeted.pinned_support, budgeted.rolling_support = 2, 7
+    budgeted.add_loads([DistributedLoadV("-sin(x)", (0, 9))])
+    assert budgeted.get_integration_log()[0].method == "numeric"
+    assert os.listdir(str(tmp_path)) == []
+    exact = Beam(9, cache=cache)
+    exact.pinned_support, exact.rolling_support = 2, 7
+    exact.add_loads([DistributedLoadV("-sin(x)", (0, 9))])
+    assert exact.get_integration_log()[0].method == "symbolic"
+    assert exact._breakpoints == [0, 2, 7, 9]
@@ -0,0 +1,85 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from beambending import (Beam, DistributedLoadH, DistributedLoadV, FixedSupport, PinnedSupport, PointLoadH,
+                         PointLoadV, PointTorque, RollingSupport)
+from beambending.continuous import solver_for_layout
+
+
+def continuous_beam(supports, loads, span=12):
+    beam = Beam(span)
+    beam.pinned_support = None
+    beam.rolling_support = None
+    beam.add_supports(supports)
+    beam.add_loads(loads)
+    return beam
+
+
+def test_two_equal_spans_under_uniform_load():
+    beam = continuous_beam([PinnedSupport(0), RollingSupport(6), RollingSupport(12)],
+                           [DistributedLoadV(-10, (0, 12))])
+    reactions = np.array(beam.get_support_reactions())
+    assert_allclose(reactions[:, 1], [22.5, 75, 22.5])  # 3/8 qL, 10/8 qL, 3/8 qL
+    assert beam.get_bending_moment(6) == pytest.approx(45)  # qL^2/8 over the middle support
+
+
+def test_fixed_fixed_beam_under_uniform_load():
+    beam = continuous_beam([FixedSupport(0), FixedSupport(6)], [DistributedLoadV("-10", (0, 6))], span=6)
+    reactions = np.array(beam.get_support_reactions())
+    assert_allclose(reactions[:, 1], [30, 30])
+    assert_allclose(reactions[:, 2], [-30, 30])  # qL^2/12, clockwise torque on the beam
+    assert_allclose(beam.get_bending_moment([0, 3, 6]), [30, -15, 30], atol=1e-9)
+
+
+def test_cantilever_with_point_loads_and_torque():
+    beam = continuous_beam([FixedSupport(0)], [PointLoadV(-5, 4), PointLoadH(3, 2), PointTorque(7, 1)], span=4)
+    assert_allclose(beam.get_support_reactions(), [(-3, 5, -27)])
+    assert_allclose(beam.get_bending_moment([0.5, 4]), [24.5, 0], atol=1e-9)
+    assert_allclose(beam.get_normal_force([1, 3]), [3, 0], atol=1e-12)
+
+
+def test_stiffness_solver_matches_statically_determinate_beam():
+    loads = [DistributedLoadV("-10", (3, 9)), PointLoadV(-20, 3), DistributedLoadV("x**2", (0, 2)),
+             PointLoadH(15, 5), DistributedLoadH("-2", (7, 9)), PointTorque(10, 4)]
+    reference = Beam(9)
+    reference.pinned_support = 2
+    reference.rolling_support = 7
+    reference.add_loads(loads)
+    beam = continuous_beam([PinnedSupport(2), RollingSupport(7)], loads, span=9)
+    assert_allclose(beam.get_support_reactions(), reference.get_support_reactions(), atol=1e-9)
+
+    with pytest.raises(ValueError):
+        beam.get_reaction_forces()
+
+
+@pytest.mark.parametrize("supports", [[PinnedSupport(0), RollingSupport(4.5), RollingSupport(9)],
+                                      [FixedSupport(0)]])
+def test_non_polynomial_loads_keep_equilibrium(supports):
+    beam = continuous_beam(supports, [DistributedLoadV("-sin(5*x)", (0, 9)), DistributedLoadH("exp(-x)", (1, 6))],
+                           span=9)
+    reactions = np.array(beam.get_support_reactions())
+    assert reactions[:, 1].sum() == pytest.approx((1 - np.cos(45)) / 5, abs=1e-12)
+    assert reactions[:, 0].sum() == pytest.approx(np.exp(-6) - np.exp(-1), abs=1e-12)
+    assert_allclose(beam.get_bending_moment([9.0]), [0], atol=1e-12)  # free or simply supported end
+
+
+def test_solver_is_shared_and_solves_several_load_cases():
+    supports = [PinnedSupport(0)] + [RollingSupport(x) for x in range(5, 55, 5)]
+    solver = solver_for_layout(0, 50, supports)
+    assert solver_for_layout(0, 50, list(supports)) is solver
+    assert solver._k_bending.shape == (4, 22) and solver._k_axial.shape == (2, 11)  # banded, never dense
+    forces = np.array([[-1, -2, -3]])
+    reactions = solver.solve(point_loads_y=(forces, [12.5]))
+    assert reactions.shape == (11, 3, 3)
+    assert_allclose(reactions[:, 1].sum(axis=0), [1, 2, 3])
+    assert_allclose(reactions[:, 1, 1], 2 * reactions[:, 1, 0])
+
+
+def test_unstable_support_layouts_are_rejected():
+    with pytest.raises(ValueError):
+        continuous_beam([RollingSupport(0), RollingSupport(6)], [PointLoadV(-1, 3)])
+    with pytest.raises(TypeError):
+        Beam(5).add_supports([2.5])
+    with pytest.raises(ValueError):
+        Beam(5).add_supports([PinnedSupport(6)])
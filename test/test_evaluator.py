@@ -0,0 +1,60 @@
+import pickle
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+from sympy import exp, lambdify
+
+from beambending import Beam, DistributedLoadV, PiecewisePolynomial, PointLoadV, x
+
+
+def test_piecewise_polynomial_matches_segment_expressions():
+    segments = [2*x**2 - 1, 3*x + 4, exp(-x) + x]
+    func = PiecewisePolynomial.from_segments([0, 1, 2.5, 4], segments)
+    assert set(func.expressions) == {2}
+
+    x_vec = np.linspace(0, 4, 33)
+    expected = [lambdify(x, segments[np.searchsorted([1, 2.5], t, side="right")])(t) for t in x_vec]
+    assert_allclose(func(x_vec), expected)
+    assert func(1) == pytest.approx(7)
+    assert func(1, side="left") == pytest.approx(1)
+
+
+def test_piecewise_polynomial_is_picklable():
+    func = PiecewisePolynomial.from_segments([0, 1, 2], [x**2, exp(x)])
+    func(np.linspace(0, 2, 5))
+    clone = pickle.loads(pickle.dumps(func))
+    assert_allclose(clone(np.linspace(0, 2, 5)), func(np.linspace(0, 2, 5)))
+
+
+def test_beam_queries_use_evaluators():
+    beam = Beam(9)
+    beam.pinned_support = 2
+    beam.rolling_support = 7
+    beam.add_loads([PointLoadV(-20, 3), DistributedLoadV(-20, (0, 2))])
+    x_vec = np.linspace(0, 9, 19)
+    shear = lambdify(x, -1 * sum(beam._shear_forces), "numpy")
+    moment = lambdify(x, -1 * sum(beam._bending_moments), "numpy")
+    assert_allclose(beam.get_shear_force(x_vec), [shear(t) for t in x_vec])
+    assert_allclose(beam.get_bending_moment(x_vec), [moment(t) for t in x_vec], atol=1e-12)
+    assert beam.get_evaluator("shear") is beam._evaluators["shear"]
+    with pytest.raises(ValueError):
+        beam.get_evaluator("torsion")
+
+
+def test_piecewise_polynomial_extrema_are_exact():
+    func = PiecewisePolynomial.from_segments([0, 2, 3, 6], [x*(2 - x), 5 + 0*x, -(x - 4)**2])
+    (x_max, y_max), (x_min, y_min) = func.extrema()
+    assert (x_max, y_max) == pytest.approx((2, 5))  # one-sided limit at a jump
+    assert (x_min, y_min) == pytest.approx((6, -4))
+    func = PiecewisePolynomial.from_segments([0.5, 3.5], [x**3 - 6*x**2 + 9*x])
+    assert func.extrema()[0] == pytest.approx((1, 4))
+    assert func.extrema()[1] == pytest.approx((3, 0))
+
+
+def test_non_polynomial_segments_accept_scalar_coordinates():
+    beam = Beam(9)
+    beam.add_loads([DistributedLoadV("-exp(x/3)", (0, 4))])
+    shear = beam.get_shear_force(1.0)
+    assert isinstance(shear, float)
+    assert shear == pytest.approx(beam.get_shear_force([1.0])[0])
+    assert shear == pytest.approx(float(beam._diagrams["shear"].subs(x, 1.0)))
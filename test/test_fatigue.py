@@ -0,0 +1,126 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from beambending import Beam, DistributedLoadV, PinnedSupport, PointLoadV, RollingSupport
+from beambending.fatigue import moment_influence, rainflow_history, RainflowCounter, section_moment_history
+
+
+def crane_runway():
+    beam = Beam(12)
+    beam.pinned_support = beam.rolling_support = None
+    beam.add_supports([PinnedSupport(0), RollingSupport(5), RollingSupport(12)])
+    beam.add_loads([DistributedLoadV(-2, (0, 12))])
+    return beam
+
+
+def test_rainflow_counter_matches_astm_example():
+    counter = RainflowCounter(np.arange(11))
+    counter.update([-2, 1, -3, 5, -1, 3, -4, 4, -2])
+    counter.finalize()
+    assert counter.counts.tolist() == [0, 0, 0, 0.5, 1.5, 0, 0.5, 0, 1.0, 0.5]
+    assert counter.max_range == 9
+
+
+def astm_rainflow(history):
+    """Textbook ASTM E1049 range counting, as a list of (range, count)."""
+    y = [v for i, v in enumerate(history) if i == 0 or v != history[i - 1]]
+    reversals = [v for i, v in enumerate(y) if i in (0, len(y) - 1) or (v - y[i - 1]) * (y[i + 1] - v) < 0]
+    stack, cycles = [], []
+    for value in reversals:
+        stack.append(value)
+        while len(stack) >= 3 and abs(stack[-1] - stack[-2]) >= abs(stack[-2] - stack[-3]):
+            if len(stack) == 3:
+                cycles.append((abs(stack[1] - stack[0]), 0.5))
+                del stack[0]
+            else:
+                cycles.append((abs(stack[-2] - stack[-3]), 1.0))
+                del stack[-3:-1]
+    return cycles + [(abs(b - a), 0.5) for a, b in zip(stack[:-1], stack[1:])]
+
+
+def test_rainflow_counts_cycles_closed_by_the_last_point():
+    counter = RainflowCounter(np.arange(17))
+    counter.update([0, 10, 2, 8, -5])
+    counter.finalize()
+    assert dict(zip(np.flatnonzero(counter.counts).tolist(), counter.counts[counter.counts > 0].tolist())) == {
+        6: 1.0, 10: 0.5, 15: 0.5}
+
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        history = rng.integers(-10, 11, size=rng.integers(2, 12)).tolist()
+        counter = RainflowCounter(np.arange(22))
+        counter.update(history)
+        counter.finalize()
+        expected = np.zeros(21)
+        for value, count in astm_rainflow(history):
+            expected[int(value)] += count
+        assert counter.counts.tolist() == expected.tolist(), history
+
+
+def test_rainflow_counts_do_not_depend_on_chunks():
+    history = np.cumsum(np.random.default_rng(0).normal(size=5000))
+    history[100:110] = history[99]  # plateau
+    whole = RainflowCounter(np.linspace(0, 20, 41))
+    whole.update(history)
+    whole.finalize()
+    chunked = RainflowCounter(np.linspace(0, 20, 41))
+    for chunk in np.split(history, [1, 2, 105, 777, 778, 4000]):
+        chunked.update(chunk)
+    chunked.finalize()
+    assert_allclose(chunked.counts, whole.counts)
+    assert whole.counts.sum() > 100
+
+
+def test_moment_influence_matches_solved_beams():
+    beam = crane_runway()
+    sections = np.array([2.5, 5, 8.5])
+    positions = np.array([0, 1.2, 5, 7.7, 12])
+    influence = moment_influence(beam, sections, positions)
+    assert influence.shape == (5, 3)
+    for position, row in zip(positions, influence):
+        unit = Beam(12)
+        unit.pinned_support = unit.rolling_support = None
+        unit.add_supports(beam.supports)
+        unit.add_loads([PointLoadV(1, position)])
+        assert_allclose(row, unit.get_bending_moment(sections), atol=1e-9)
+
+
+def test_streaming_history_from_memory_mapped_files(tmp_path):
+    beam = crane_runway()
+    n_steps = 1000
+    t = np.arange(n_steps)
+    positions = np.lib.format.open_memmap(str(tmp_path / "positions.npy"), mode="w+", shape=(n_steps, 2))
+    positions[:, 0] = 14 * np.abs(np.sin(t / 50)) - 1  # leaves the beam at both ends
+    positions[:, 1] = positions[:, 0] + 2.5
+    forces = np.lib.format.open_memmap(str(tmp_path / "forces.npy"), mode="w+", shape=(n_steps, 2))
+    forces[:] = -30 - 5 * np.cos(t / 7)[:, None]
+    out = np.lib.format.open_memmap(str(tmp_path / "moments.npy"), mode="w+", shape=(n_steps, 2))
+
+    counters = rainflow_history(beam, [2.5, 5], positions, forces, np.linspace(0, 200, 21), chunk_size=97, out=out)
+    history = np.concatenate(list(section_moment_history(beam, [2.5, 5], positions, forces, chunk_size=300)))
+    assert_allclose(out, history)
+
+    for step in (0, 123, 499, 999):
+        loaded = crane_runway()
+        loaded.add_loads([PointLoadV(f, x) for f, x in zip(forces[step], positions[step]) if 0 <= x <= 12])
+        assert_allclose(history[step], loaded.get_bending_moment([2.5, 5]), atol=1e-9)
+
+    reference = RainflowCounter(np.linspace(0, 200, 21))
+    reference.update(history[:, 1])
+    reference.finalize()
+    assert_allclose(counters[1].counts, reference.counts)
+    assert counters[1].max_range == pytest.approx(np.ptp(history[:, 1]))
+
+
+def test_scalar_section():
+    beam = crane_runway()
+    positions = np.linspace(-1, 13, 301)
+    forces = np.full_like(positions, -30)
+    (history,) = section_moment_history(beam, 2.5, positions, forces)
+    (histories,) = section_moment_history(beam, [2.5, 8], positions, forces)
+    assert history.shape == (301,)
+    assert_allclose(history, histories[:, 0])
+    counter = rainflow_history(beam, 2.5, positions, forces, np.linspace(0, 100, 21))
+    assert isinstance(counter, RainflowCounter)
+    assert_allclose(counter.counts, rainflow_history(beam, [2.5], positions, forces, np.linspace(0, 100, 21))[0].counts)
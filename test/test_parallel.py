@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import multiprocessing
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+import beambending.beam
+from beambending import Beam, DistributedLoadH, DistributedLoadV, FixedSupport, PointLoadV, RollingSupport, x
+
+LOADS = [DistributedLoadV("-10 - sin(x)", (0, 4)), DistributedLoadV(-x**2 / 3, (2, 9)),
+         DistributedLoadH("exp(-x)", (1, 6)), PointLoadV(-20, 3), DistributedLoadV(-5, [5, 8])]
+
+
+def loaded_beam(processes=None):
+    beam = Beam(9, processes=processes)
+    beam.pinned_support = 2
+    beam.rolling_support = None
+    beam.add_supports([RollingSupport(7), FixedSupport(9)])
+    beam.add_loads(LOADS)
+    return beam
+
+
+def test_parallel_integration_matches_serial_results():
+    serial = loaded_beam()
+    parallel = loaded_beam(processes=2)
+    x_vec = np.linspace(0, 9, 55)
+    assert_allclose(parallel.get_support_reactions(), serial.get_support_reactions())
+    for quantity in ("load", "normal", "shear", "moment"):
+        assert_allclose(parallel.get_evaluator(quantity)(x_vec), serial.get_evaluator(quantity)(x_vec))
+    assert (parallel._diagrams["moment"] - serial._diagrams["moment"]).subs(x, 4.5) == 0
+
+
+def test_shared_executor_integrates_every_distributed_load(monkeypatch):
+    serial = loaded_beam()
+
+    def no_integration(*args, **kwargs):
+        raise AssertionError("distributed load integrated in the main process")
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        monkeypatch.setattr(beambending.beam.Beam, "_create_distributed_force", no_integration)
+        beam = loaded_beam(processes=pool)
+        beam._diagrams  # point loads and reactions are integrated in this process
+        variant = beam.with_loads([DistributedLoadV("-cos(x)", (0, 9)), DistributedLoadV("-1", (0, 1))])
+        monkeypatch.undo()
+    assert_allclose(beam.get_support_reactions(), serial.get_support_reactions())
+    assert variant.get_support_reactions() != beam.get_support_reactions()
+
+
+def test_process_pool_is_started_once_and_shared_with_variants(monkeypatch):
+    pools, shut_down = [], []
+
+    class CountingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+        def shutdown(self, *args, **kwargs):
+            shut_down.append(self)
+            super().shutdown(*args, **kwargs)
+    monkeypatch.setattr(beambending.beam, "ProcessPoolExecutor", CountingPool)
+    beam = Beam(9, processes=2)
+    beam.add_loads([PointLoadV(-20, 3), PointLoadV(-5, 4)])
+    assert not pools  # nothing worth sending to the pool yet
+    beam.add_loads(LOADS[:2])
+    variant = beam.with_loads([DistributedLoadV("-cos(x)", (0, 9)), DistributedLoadV("-1", (0, 1))])
+    assert len(pools) == 1
+    assert variant._executor is beam._executor
+    del beam, variant
+    gc.collect()
+    assert shut_down == pools
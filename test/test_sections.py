@@ -0,0 +1,91 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from beambending import (Beam, DistributedLoadV, FixedSupport, PinnedSupport, PointLoadV, RollingSupport,
+                         SectionCatalog)
+from beambending.sections import section_demands, unit_deflection
+
+
+def beam_on(supports, loads, span):
+    beam = Beam(span)
+    beam.pinned_support = beam.rolling_support = None
+    beam.add_supports(supports)
+    beam.add_loads(loads)
+    return beam
+
+
+def random_catalog(n_profiles=500, seed=0):
+    rng = np.random.default_rng(seed)
+    second_moment = rng.uniform(1e-6, 2e-4, n_profiles)
+    return SectionCatalog(["P{}".format(i) for i in range(n_profiles)],
+                          section_modulus=second_moment / rng.uniform(0.05, 0.3, n_profiles),
+                          shear_area=rng.uniform(5e-4, 5e-3, n_profiles), second_moment=second_moment,
+                          bending_strength=rng.choice([24e3, 235e3, 355e3], n_profiles),
+                          shear_strength=rng.choice([2.5e3, 135e3, 205e3], n_profiles),
+                          elastic_modulus=rng.choice([11e6, 210e6], n_profiles),
+                          mass=rng.uniform(5, 150, n_profiles))
+
+
+def test_unit_deflection_matches_closed_form_solutions():
+    simply_supported = beam_on([PinnedSupport(0), RollingSupport(6)], [DistributedLoadV(-10, (0, 6))], 6)
+    (_, _), (x_min, w_min) = unit_deflection(simply_supported).extrema()
+    assert x_min == pytest.approx(3)
+    assert w_min == pytest.approx(-5 * 10 * 6 ** 4 / 384)  # 5 q L^4 / 384
+
+    cantilever = beam_on([FixedSupport(0)], [PointLoadV(-5, 4)], 4)
+    assert_allclose(unit_deflection(cantilever)([0, 4]), [0, -5 * 4 ** 3 / 3], atol=1e-9)  # P L^3 / 3
+
+    continuous = beam_on([PinnedSupport(0), RollingSupport(6), RollingSupport(12)],
+                         [DistributedLoadV("-10 - x**3/100", (0, 12))], 12)
+    assert_allclose(unit_deflection(continuous)([0, 6, 12]), 0, atol=1e-9)
+
+
+def test_vectorized_check_matches_per_profile_loop():
+    catalog = random_catalog()
+    beams = [beam_on([PinnedSupport(0), RollingSupport(span)], [DistributedLoadV(-8, (0, span)), PointLoadV(-20, 2)],
+                     span) for span in (4, 6, 8)]
+    utilization = catalog.utilization(beams)
+    assert utilization["max"].shape == (3, len(catalog))
+
+    for row, beam in enumerate(beams):
+        moment, shear, deflection, span = section_demands(beam)
+        for i in range(0, len(catalog), 37):
+            expected = max(moment / (catalog.section_modulus[i] * catalog.bending_strength[i]),
+                           shear / (catalog.shear_area[i] * catalog.shear_strength[i]),
+                           deflection / (catalog.elastic_modulus[i] * catalog.second_moment[i]) / (span / 300))
+            assert utilization["max"][row, i] == pytest.approx(expected)
+
+    ranked = catalog.check(beams)
+    lightest = catalog.lightest(beams)
+    for row, passing in enumerate(ranked):
+        assert np.all(utilization["max"][row, passing] <= 1)
+        assert np.count_nonzero(utilization["max"][row] <= 1) == len(passing)
+        assert np.all(np.diff(catalog.mass[passing]) >= 0)
+        assert lightest[row] == (passing[0] if len(passing) else -1)
+    assert_allclose(catalog.utilization(beams[0])["max"], utilization["max"][0])
+
+
+def test_no_passing_profile():
+    catalog = SectionCatalog(["tiny"], 1e-7, 1e-6, 1e-9, 235e3, 135e3, 210e6)
+    beam = beam_on([PinnedSupport(0), RollingSupport(5)], [PointLoadV(-10, 2.5)], 5)
+    assert len(catalog.check(beam)) == 0
+    assert catalog.lightest(beam) == -1
+
+
+def test_deflection_limit_uses_the_governing_span():
+    cantilever = beam_on([FixedSupport(0)], [PointLoadV(-5, 4)], 4)
+    assert_allclose(section_demands(cantilever)[2:], (5 * 4 ** 3 / 3, 8))  # twice the overhang
+
+    continuous = beam_on([PinnedSupport(0), RollingSupport(2), RollingSupport(8)], [DistributedLoadV(-10, (0, 8))], 8)
+    deflection = unit_deflection(continuous)
+    x_vec = np.linspace(2, 8, 601)
+    moment, shear, w_peak, span = section_demands(continuous)
+    assert span == 6
+    assert w_peak == pytest.approx(np.abs(deflection(x_vec)).max(), rel=1e-6)
+
+    overhang = beam_on([PinnedSupport(0), RollingSupport(6)], [PointLoadV(-10, 9)], 9)
+    w_tip = abs(unit_deflection(overhang)(9))
+    assert_allclose(section_demands(overhang)[2:], (w_tip, 6))
+    assert SectionCatalog(["P"], 1, 1, 1, 1, 1, 1).utilization(overhang)["deflection"] == \
+        pytest.approx(w_tip * 300 / 6)
@@ -0,0 +1,96 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from beambending import (Beam, DistributedLoadH, DistributedLoadV, FixedSupport, PointLoadH, PointLoadV,
+                         PointTorque)
+
+LOADS = [PointLoadV(-20, 3), DistributedLoadV("-10 - x/2", (1, 6)), PointLoadH(15, 5), PointTorque(8, 7.5),
+         DistributedLoadH("-2*x", (7, 9)), PointLoadV(6, 8.5)]
+SECTIONS = [0.5, 2.5, 4.5, 7.25, 9.5]
+
+
+def solved_beam(loads=LOADS, pinned=2, rolling=8):
+    beam = Beam(10)
+    beam.pinned_support, beam.rolling_support = pinned, rolling
+    beam.add_loads(loads)
+    return beam
+
+
+def perturbed(label, delta):
+    """Beam with one parameter of `jacobian` shifted by `delta`."""
+    index, field = label
+    if index in ("pinned_support", "rolling_support"):
+        supports = {"pinned": 2, "rolling": 8}
+        supports[index.split("_")[0]] += delta
+        return solved_beam(pinned=supports["pinned"], rolling=supports["rolling"])
+    loads = list(LOADS)
+    load = loads[index]
+    if field == "scale":
+        load = load._replace(expr="({})*{}".format(load.expr, 1 + delta))
+    elif field in ("start", "end"):
+        start, end = load.span
+        load = load._replace(span=(start + delta, end) if field == "start" else (start, end + delta))
+    else:
+        load = load._replace(**{field: getattr(load, field) + delta})
+    loads[index] = load
+    return solved_beam(loads)
+
+
+def outputs(beam):
+    (_, y_max), (_, y_min) = beam.get_evaluator("moment").extrema()
+    return np.concatenate([beam.get_reaction_forces(), beam.get_normal_force(SECTIONS),
+                           beam.get_shear_force(SECTIONS), beam.get_bending_moment(SECTIONS), [y_max, y_min]])
+
+
+def test_jacobian_matches_central_finite_differences():
+    sensitivities = solved_beam().jacobian(SECTIONS)
+    assert len(sensitivities["parameters"]) == 2 * 4 + 3 * 2 + 2
+    exact = np.vstack([sensitivities["reactions"], sensitivities["normal"], sensitivities["shear"],
+                       sensitivities["moment"], sensitivities["moment_max"], sensitivities["moment_min"]])
+    delta = 1e-4
+    for column, label in enumerate(sensitivities["parameters"]):
+        finite = (outputs(perturbed(label, delta)) - outputs(perturbed(label, -delta))) / (2 * delta)
+        assert_allclose(exact[:, column], finite, atol=1e-5, err_msg=str(label))
+
+
+def test_peak_on_a_point_load_moves_with_it():
+    beam = solved_beam([PointLoadV(-10, 4)], pinned=0, rolling=10)
+    sensitivities = beam.jacobian()
+    (_, _), (x_min, _) = beam.get_evaluator("moment").extrema()
+    assert x_min == 4
+    # M_min = F (c - x_A) (x_B - c) / (x_B - x_A), for F = -10 and c = 4
+    assert_allclose(sensitivities["moment_min"], [4 * 6 / 10, -10 * (6 - 4) / 10, 10 * 6 ** 2 / 10 ** 2,
+                                                  -10 * 4 ** 2 / 10 ** 2])
+
+
+def test_only_determinate_layouts_are_supported():
+    beam = solved_beam()
+    beam.add_supports([FixedSupport(10)])
+    with pytest.raises(ValueError):
+        beam.jacobian()
+
+
+def test_distributed_loads_need_no_symbolic_integration(monkeypatch):
+    import beambending.beam
+    from sympy import lambdify
+    from sympy.abc import x
+    loads = LOADS + [DistributedLoadV("-exp(-x/4)", (0, 12))]  # partly beyond the end of the beam
+    beam = solved_beam(loads)
+
+    def no_integration(*args, **kwargs):
+        raise AssertionError("symbolic integration in jacobian")
+    monkeypatch.setattr(beambending.beam, "integrate", no_integration)
+    result = beam.jacobian(SECTIONS)
+    monkeypatch.undo()
+
+    terms = beam._load_terms(loads[-1])
+    column = result["parameters"].index((len(loads) - 1, "scale"))
+    d_reactions = np.linalg.solve([[-1, 0, 0], [0, -1, -1], [0, -2, -8]], [0, float(terms.force_y), float(terms.moment_z)])
+    assert_allclose(result["reactions"][:, column], d_reactions)
+    x_vec = np.array(SECTIONS)
+    shear, moment = (lambdify(x, term, "numpy")(x_vec) for term in (terms.shear, terms.moment))
+    d_ay, d_by = d_reactions[1:]
+    assert_allclose(result["shear"][:, column], -shear - d_ay * (x_vec >= 2) - d_by * (x_vec >= 8), atol=1e-12)
+    assert_allclose(result["moment"][:, column],
+                    -moment - d_ay * (x_vec - 2) * (x_vec >= 2) - d_by * (x_vec - 8) * (x_vec >= 8), atol=1e-12)
@@ -0,0 +1,98 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+import beambending.beam
+
+from beambending import (Beam, BeamSolution, DistributedLoadV, FixedSupport, PinnedSupport, PointLoadV,
+                         RollingSupport)
+
+
+def base_beam():
+    beam = Beam(9)
+    beam.pinned_support = 2
+    beam.rolling_support = 7
+    beam.add_loads([DistributedLoadV("-10", (3, 9)), PointLoadV(-20, 3), DistributedLoadV("x**2", (0, 2))])
+    return beam
+
+
+def test_solution_is_immutable_and_hashable():
+    beam = base_beam()
+    solution = beam.solve()
+    assert isinstance(solution, BeamSolution)
+    assert beam.solve() is solution
+    with pytest.raises(AttributeError):
+        solution.reactions = ()
+    with pytest.raises(ValueError):
+        solution.get_evaluator("moment").coefficients[0, 0] = 1
+
+    beam.add_loads([PointLoadV(-5, 8)])
+    assert beam.solve() != solution
+    assert base_beam().solve() == solution
+    assert len({solution, base_beam().solve(), beam.solve()}) == 2
+    assert_allclose(solution.get_bending_moment(2), base_beam().get_bending_moment(2))
+
+
+def test_variants_share_symbolic_work_with_parent():
+    parent = base_beam()
+    variant = parent.with_loads([PointLoadV(-5, 8)])
+    assert len(parent._loads) == 3 and len(variant._loads) == 4
+    for name in ("_distributed_forces_y", "_bending_moments"):
+        assert any(term is parent_term for term in getattr(variant, name)
+                   for parent_term in getattr(parent, name))
+
+    reference = base_beam()
+    reference.add_loads([PointLoadV(-5, 8)])
+    x_vec = np.linspace(0, 9, 37)
+    assert_allclose(variant.get_bending_moment(x_vec), reference.get_bending_moment(x_vec), atol=1e-9)
+    assert variant.solve() == reference.solve()
+
+
+def test_support_variants():
+    parent = base_beam()
+    variant = parent.with_supports([RollingSupport(8), PinnedSupport(1)])
+    assert (parent.pinned_support, parent.rolling_support) == (2, 7)
+    assert (variant.pinned_support, variant.rolling_support) == (1, 8)
+    assert variant._distributed_forces_y[0] is parent._distributed_forces_y[0]
+
+    clamped = parent.with_supports([FixedSupport(0)])
+    assert clamped.supports == (FixedSupport(0),)
+    assert clamped.get_bending_moment(9) == pytest.approx(0, abs=1e-9)
+    with pytest.raises(ValueError):
+        parent.with_supports([PinnedSupport(10), RollingSupport(3)])
+
+
+def test_equal_definitions_written_differently():
+    beam = base_beam()
+    same = Beam(9.0)
+    same.pinned_support, same.rolling_support = 2.0, 7.0
+    same.add_loads([DistributedLoadV("-10", [3, 9]), PointLoadV(-20.0, 3.0), DistributedLoadV("x**2", (0.0, 2))])
+    assert same.solve() == beam.solve()
+    assert hash(same.solve()) == hash(beam.solve())
+
+
+def test_variants_only_flatten_new_loads(monkeypatch):
+    parent = base_beam()
+    parent._diagrams["moment"]
+    calls = []
+    active_expression = beambending.beam._active_expression
+    monkeypatch.setattr(beambending.beam, "_active_expression", lambda *args: calls.append(args) or
+                        active_expression(*args))
+    variant = parent.with_loads([PointLoadV(-5, 8)])
+    variant._diagrams["moment"]
+    n_parent = len(calls)
+    base_beam()._diagrams["moment"]
+    assert n_parent < len(calls) - n_parent
+
+
+def test_terms_follow_span_changes():
+    beam = base_beam()
+    beam.add_loads([DistributedLoadV("-2", (8, 12))])  # partly beyond the end of the beam
+    beam.length = 12
+    beam.add_loads([PointLoadV(-5, 11)])
+    reference = Beam(12)
+    reference.pinned_support, reference.rolling_support = 2, 7
+    reference.add_loads(beam._loads)
+    assert_allclose(beam.get_reaction_forces(), reference.get_reaction_forces())
+    x_vec = np.linspace(0, 12, 49)
+    assert_allclose(beam.get_bending_moment(x_vec), reference.get_bending_moment(x_vec), atol=1e-9)
@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from beambending import Beam, PointLoadV, ResultStore
+
+
+def _solve_rows(path, rows):
+    store = ResultStore(path, mode="r+")
+    for i in rows:
+        beam = Beam(10)
+        beam.add_loads([PointLoadV(-10, 1 + i)])
+        store.write(i, beam)
+    store.flush()
+
+
+def test_result_store_is_filled_by_several_processes(tmp_path):
+    path = str(tmp_path / "sweep")
+    ResultStore.create(path, n_beams=6, n_points=21)
+    with ProcessPoolExecutor(2) as pool:
+        list(pool.map(_solve_rows, [path, path], [range(0, 3), range(3, 6)]))
+
+    store = ResultStore(path)
+    assert store.solved.all()
+    assert_allclose(store.reactions[:, :, 1].sum(axis=1), 10)
+    assert_allclose(store.x[4], np.linspace(0, 10, 21))
+    assert_allclose(store.extremes[2, 2:4], [store.shear[2].max(), store.shear[2].min()])
+    with pytest.raises(FileExistsError):
+        ResultStore.create(path, n_beams=1)
+
+
+def test_result_store_exports_csv_in_chunks(tmp_path):
+    store = ResultStore.create(str(tmp_path / "sweep"), n_beams=5, n_points=3)
+    for i in (0, 3, 4):
+        beam = Beam(10)
+        beam.add_loads([PointLoadV(-10, 5)])
+        store.write(i, beam)
+
+    summary = tmp_path / "summary.csv"
+    store.export_csv(str(summary), chunk_size=2)
+    data = np.loadtxt(summary, delimiter=",", skiprows=1)
+    assert data[:, 0].tolist() == [0, 3, 4]
+    assert_allclose(data[:, 1:7], [[0, 5, 0, 0, 5, 0]] * 3)
+
+    diagrams = tmp_path / "diagrams.csv"
+    store.export_csv(str(diagrams), chunk_size=2, diagrams=True)
+    data = np.loadtxt(diagrams, delimiter=",", skiprows=1)
+    assert data.shape == (9, 5)
+    assert_allclose(data[:3, 1], [0, 5, 10])
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from xml.etree import ElementTree
+
+from beambending import Beam, beam_to_svg, DistributedLoadV, PointLoadH, PointLoadV, PointTorque
+
+
+def test_svg_contains_all_diagrams_and_load_glyphs():
+    beam = Beam(9)
+    beam.pinned_support = 2
+    beam.rolling_support = 7
+    beam.add_loads([PointLoadV(-20, 3), PointLoadH(15, 5), PointTorque(30, 4), DistributedLoadV(-20, (0, 2))])
+    svg = beam_to_svg(beam, n_points=51)
+
+    root = ElementTree.fromstring(svg)
+    texts = [t.text for t in root.iter("{http://www.w3.org/2000/svg}text")]
+    for label in ("Beam loads [kN / m]", "Normal force [kN]", "Shear force [kN]", "Bending moment [kN·m]"):
+        assert label in texts
+    assert "40 kN·m" in texts  # maximum bending moment annotation
+    polygons = list(root.iter("{http://www.w3.org/2000/svg}polygon"))
+    # 4 diagrams + beam body + 3 support parts + 2 arrow heads + 1 torque arrow head
+    assert len(polygons) == 11
+
+
+def test_svg_rendering_does_not_import_matplotlib():
+    code = ("import sys; from beambending import Beam, PointLoadV, beam_to_svg; b = Beam(5); "
+            "b.add_loads([PointLoadV(-1, 3)]); beam_to_svg(b); assert 'matplotlib' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,107 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+from sympy import sympify
+
+from beambending import (Beam, DistributedLoadV, FixedSupport, PinnedSupport, PointLoadH, PointLoadV, PointTorque,
+                         RollingSupport, StreamingStatistics)
+from beambending.continuous import solver_for_layout
+
+
+def recording(sampler, record):
+    def wrapped(rng, n):
+        samples = sampler(rng, n)
+        record.append(samples)
+        return samples
+    return wrapped
+
+
+def test_streaming_statistics_match_numpy():
+    rng = np.random.default_rng(1)
+    samples = rng.normal(3, 2, size=(10000, 2))
+    stats = StreamingStatistics((2,), thresholds=[5.0])
+    for chunk in np.array_split(samples, 7):
+        stats.update(chunk)
+    assert stats.count == 10000
+    assert_allclose(stats.mean, samples.mean(axis=0))
+    assert_allclose(stats.variance, samples.var(axis=0, ddof=1))
+    assert_allclose(stats.min, samples.min(axis=0))
+    assert_allclose(stats.exceedance(5.0), (samples > 5).mean(axis=0))
+    assert_allclose(stats.exceedance(4.0), (samples > 4).mean(axis=0), atol=0.01)
+    for q in (0.01, 0.5, 0.99):
+        assert_allclose(stats.quantile(q), np.quantile(samples, q, axis=0), rtol=0.03)
+
+
+def test_random_point_load_on_simply_supported_beam():
+    beam = Beam(10)
+    beam.pinned_support, beam.rolling_support = 0, 10
+    beam.add_loads([PointLoadV(-10, 5), DistributedLoadV(-2, (0, 10))])
+    forces, coords = [], []
+    distributions = {0: {"force": recording(lambda rng, n: rng.normal(-10, 1, n), forces),
+                         "coord": recording(lambda rng, n: rng.uniform(2, 8, n), coords)}}
+    stats = beam.monte_carlo(distributions, n_samples=5000, chunk_size=999, seed=3)
+    forces, coords = np.concatenate(forces), np.concatenate(coords)
+
+    r_left = 10 - forces * (10 - coords) / 10
+    assert stats["reactions"].count == 5000
+    assert_allclose(stats["reactions"].mean[:, 1], [r_left.mean(), (20 - forces - r_left).mean()])
+    assert_allclose(stats["reactions"].std[0, 1], r_left.std(ddof=1))
+    x_vec = np.concatenate([np.broadcast_to(np.linspace(0, 10, 201), (5000, 201)), coords[:, None]], axis=1)
+    moments = -r_left[:, None] * x_vec + x_vec ** 2 - forces[:, None] * (x_vec - coords[:, None]) * (x_vec >= coords[:, None])
+    peak = moments.min(axis=1)
+    assert stats["moment_min"].min == pytest.approx(peak.min())
+    assert stats["moment_min"].mean == pytest.approx(peak.mean(), rel=1e-3)
+    assert stats["moment_max"].max == pytest.approx(0, abs=1e-9)
+
+
+def test_monte_carlo_matches_individually_solved_beams():
+    supports = [FixedSupport(0), RollingSupport(6), PinnedSupport(12)]
+    loads = [PointLoadV(-10, 3), PointTorque(4, 9), DistributedLoadV("-2 - x/6", (0, 12)), PointLoadH(5, 7)]
+    beam = Beam(12)
+    beam.pinned_support = beam.rolling_support = None
+    beam.add_supports(supports)
+    beam.add_loads(loads)
+    record = {"coord": [], "torque": [], "factor": [], "force_h": []}
+    distributions = {0: {"coord": recording(lambda rng, n: rng.uniform(0.5, 11.5, n), record["coord"])},
+                     1: {"torque": recording(lambda rng, n: rng.normal(4, 2, n), record["torque"])},
+                     2: {"expr": recording(lambda rng, n: rng.uniform(0.5, 1.5, n), record["factor"])},
+                     3: {"force": recording(lambda rng, n: rng.normal(5, 1, n), record["force_h"])}}
+    stats = beam.monte_carlo(distributions, n_samples=12, chunk_size=5, n_points=401, seed=0)
+    samples = {name: np.concatenate(values) for name, values in record.items()}
+
+    reactions, moment_max, moment_min = [], [], []
+    for i in range(12):
+        sample = Beam(12)
+        sample.pinned_support = sample.rolling_support = None
+        sample.add_supports(supports)
+        sample.add_loads([PointLoadV(-10, samples["coord"][i]), PointTorque(samples["torque"][i], 9),
+                          DistributedLoadV(samples["factor"][i] * sympify("-2 - x/6"), (0, 12)),
+                          PointLoadH(samples["force_h"][i], 7)])
+        reactions.append(sample.get_support_reactions())
+        (_, y_max), (_, y_min) = sample.get_evaluator("moment").extrema()
+        moment_max.append(y_max)
+        moment_min.append(y_min)
+    reactions = np.array(reactions)
+    assert_allclose(stats["reactions"].mean, reactions.mean(axis=0), atol=1e-9)
+    assert_allclose(stats["reactions"].max, reactions.max(axis=0), atol=1e-9)
+    assert stats["moment_max"].mean == pytest.approx(np.mean(moment_max), rel=1e-3)
+    assert stats["moment_min"].min == pytest.approx(np.min(moment_min), rel=1e-3)
+
+
+def test_unit_reactions_are_influence_lines():
+    solver = solver_for_layout(0, 12, (PinnedSupport(0), RollingSupport(6), RollingSupport(12)))
+    coords = np.array([1.5, 6, 8.25])
+    unit = solver.unit_reactions(coords)
+    for j, coord in enumerate(coords):
+        assert_allclose(unit[:, :, j], solver.solve(point_loads_y=([1], [coord])), atol=1e-12)
+    with pytest.raises(ValueError):
+        solver.unit_reactions(coords, "z")
+
+
+def test_invalid_distributions_are_rejected():
+    beam = Beam(10)
+    beam.add_loads([DistributedLoadV(-1, (0, 5))])
+    with pytest.raises(ValueError):
+        beam.monte_carlo({0: {"span": lambda rng, n: rng.uniform(0, 5, n)}}, 10)
+    with pytest.raises(ValueError):
+        beam.monte_carlo({0: {"magnitude": lambda rng, n: rng.uniform(0, 5, n)}}, 10)